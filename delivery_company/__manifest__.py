@@ -1,17 +1,20 @@
 {
     'name': 'Delivery Company',
-    'version': '1.9',
+    'version': '1.11',
     'summary': 'Manage Delivery Company Configurations',
     'description': """
         This module allows you to manage delivery company credentials and API details.
         Supports Barid Al-Maghrib (Amana) and other delivery providers.
+        Provider calls can be queued as background jobs run by a scheduler.
     """,
     'category': 'Operations/Inventory',
     'author': 'Odoo Developer',
     'depends': ['base', 'sale', 'stock', 'account'],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron.xml',
         'views/delivery_company_views.xml',
+        'views/delivery_job_views.xml',
         'views/res_partner_views.xml',
         'views/sale_order_views.xml',
         'views/stock_picking_views.xml',
@@ -97,52 +97,51 @@ class DeliveryCompany(models.Model):
     # API Actions
     # ==========================================================================
     def action_test_connection(self):
-        """Test the connection to the delivery provider API."""
+        """Queue a test of the connection to the delivery provider API."""
+        self.ensure_one()
+        job = self.env['delivery.job']._enqueue(
+            self, 'test_connection', name=_("Test connection of %s", self.name),
+            max_attempts=1)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Connection Test'),
+                'message': _("The connection test is queued as job %s, its result "
+                             "is shown in Delivery Jobs.", job.id),
+                'type': 'info',
+                'sticky': False,
+            }
+        }
+
+    def test_connection(self):
+        """
+        Test the connection to the delivery provider API.
+
+        Returns:
+            dict: Provider test result, with a summary of the tested APIs in
+                'message', or 'error' when the test failed
+        """
         self.ensure_one()
-        
         provider = self._get_provider()
         result = provider.test_connection()
         
+        messages = []
         if result.get('success'):
             # Build success message
-            messages = []
             if 'tracking_api' in result:
                 messages.append(f"Tracking API: {result['tracking_api'].get('message', 'OK')}")
             if 'ecom_api' in result:
                 messages.append(f"E-Commerce API: {result['ecom_api'].get('message', 'OK')}")
-            
-            message = '\n'.join(messages) if messages else 'Connection successful!'
-            
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'title': _('Connection Test'),
-                    'message': message,
-                    'type': 'success',
-                    'sticky': False,
-                }
-            }
+            result['message'] = '\n'.join(messages) if messages else 'Connection successful!'
         else:
             # Build error message
-            messages = []
             if 'tracking_api' in result and not result['tracking_api'].get('success'):
                 messages.append(f"Tracking API: {result['tracking_api'].get('message', 'Failed')}")
             if 'ecom_api' in result and not result['ecom_api'].get('success'):
                 messages.append(f"E-Commerce API: {result['ecom_api'].get('message', 'Failed')}")
-            
-            error_msg = '\n'.join(messages) if messages else 'Connection failed!'
-            
-            return {
-                'type': 'ir.actions.client',
-                'tag': 'display_notification',
-                'params': {
-                    'title': _('Connection Test Failed'),
-                    'message': error_msg,
-                    'type': 'danger',
-                    'sticky': True,
-                }
-            }
+            result['error'] = '\n'.join(messages) if messages else 'Connection failed!'
+        return result
     
     def action_refresh_token(self):
         """Manually refresh the E-Commerce API token."""
@@ -184,6 +183,38 @@ class DeliveryCompany(models.Model):
         self.ensure_one()
         provider = self._get_provider()
         return provider.track_package(tracking_number)
+
+    def track_package_queued(self, tracking_number):
+        """
+        Queue the tracking of a package, see track_package.
+
+        Returns:
+            delivery.job record, its result is the tracking result
+        """
+        self.ensure_one()
+        return self.env['delivery.job']._enqueue(
+            self, 'track_package', args=[tracking_number],
+            name=_("Track package %s", tracking_number))
+    
+    def track_shipments(self, shipments):
+        """
+        Track a batch of shipments using the configured provider, then write
+        the results back to the shipments at once.
+        
+        Args:
+            shipments: recordset implementing _get_tracking_number()
+                and _write_tracking_results(results)
+            
+        Returns:
+            dict: {shipment id: tracking result from the provider}
+        """
+        self.ensure_one()
+        provider = self._get_provider()
+        results = provider.track_packages({
+            shipment.id: shipment._get_tracking_number() for shipment in shipments
+        })
+        shipments._write_tracking_results(results)
+        return results
     
     def create_shipment(self, shipment_data):
         """
@@ -199,6 +230,26 @@ class DeliveryCompany(models.Model):
         provider = self._get_provider()
         return provider.create_shipment(shipment_data)
     
+    def create_shipments(self, shipments):
+        """
+        Submit a batch of shipments using the configured provider, then write
+        the results back to the shipments at once.
+        
+        Args:
+            shipments: recordset implementing _get_provider_shipment_data()
+                and _write_provider_results(results)
+            
+        Returns:
+            dict: {shipment id: creation result from the provider}
+        """
+        self.ensure_one()
+        provider = self._get_provider()
+        results = provider.create_shipments({
+            shipment.id: shipment._get_provider_shipment_data() for shipment in shipments
+        })
+        shipments._write_provider_results(results)
+        return results
+    
     def get_shipping_label(self, tracking_number):
         """
         Get shipping label for a package.
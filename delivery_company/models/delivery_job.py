@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+# Fields describing the call of a job, they cannot change once the job is queued
+JOB_CALL_FIELDS = {'res_model', 'res_ids', 'method', 'args', 'kwargs', 'user_id'}
+
+
+class DeliveryJob(models.Model):
+    """
+    Queued delivery provider call, run later by the job runner cron so carrier
+    latency or outages never hold a web worker.
+
+    A job calls `method` on the `res_model` records `res_ids` with `args` and
+    `kwargs`. Failed jobs, including provider results with success False, are
+    retried with exponential backoff until `max_attempts` is reached.
+    """
+    _name = 'delivery.job'
+    _description = 'Delivery Provider Job'
+    _order = 'id desc'
+
+    name = fields.Char(string='Description', required=True)
+
+    delivery_company_id = fields.Many2one(
+        'delivery.company',
+        string='Delivery Company',
+        required=True,
+        index=True,
+        ondelete='cascade',
+    )
+
+    provider_type = fields.Selection(
+        related='delivery_company_id.provider_type',
+        store=True,
+        index=True,
+    )
+
+    user_id = fields.Many2one('res.users', string='Queued By', default=lambda self: self.env.user,
+                              help="The job runs with the access rights of this user")
+    res_model = fields.Char(string='Model', required=True)
+    res_ids = fields.Char(string='Record IDs', default='[]', help="JSON list of record ids")
+    method = fields.Char(string='Method', required=True)
+    args = fields.Text(string='Arguments', default='[]', help="JSON list of arguments")
+    kwargs = fields.Text(string='Keyword Arguments', default='{}',
+                         help="JSON dict of keyword arguments")
+
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('started', 'Started'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ], string='Status', default='pending', required=True, index=True)
+
+    priority = fields.Integer(string='Priority', default=10,
+                              help="Lower priority jobs run first")
+    eta = fields.Datetime(string='Run After', index=True,
+                          help="The job is not run before this date")
+    attempts = fields.Integer(string='Attempts', default=0)
+    max_attempts = fields.Integer(string='Max Attempts', default=5)
+    date_started = fields.Datetime(string='Started On')
+    date_done = fields.Datetime(string='Done On')
+    result = fields.Text(string='Result', help="JSON result of the call")
+    error = fields.Text(string='Error')
+
+    @api.model
+    def _get_job_methods(self):
+        """
+        Methods a job may call, per model. Modules queuing their own calls extend it.
+
+        Returns:
+            dict {model name: set of method names}
+        """
+        return {
+            'delivery.company': {'test_connection', 'create_shipment', 'create_shipments',
+                                 'track_package', 'track_shipments', 'get_shipping_label',
+                                 'cancel_shipment'},
+        }
+
+    def _check_job_method(self, model_name, method):
+        """Raise unless method of model_name is an allowed job entry point."""
+        if method not in self._get_job_methods().get(model_name, set()):
+            raise UserError(_("%(model)s.%(method)s cannot be run as a delivery job.",
+                              model=model_name, method=method))
+
+    def write(self, vals):
+        """Prevent changing the call of a queued job."""
+        if JOB_CALL_FIELDS.intersection(vals):
+            raise UserError(_("The call of a delivery job cannot be modified."))
+        return super().write(vals)
+
+    @api.model
+    def _enqueue(self, records, method, args=None, kwargs=None, delivery_company=None,
+                 name=None, priority=10, max_attempts=5):
+        """
+        Queue a call of records.method(*args, **kwargs) and wake up the runner.
+
+        Args:
+            records: Recordset the method is called on
+            method: Method name, one of _get_job_methods
+            args, kwargs: JSON serializable arguments
+            delivery_company: delivery.company whose provider is called,
+                records themselves when they are delivery companies
+
+        Returns:
+            delivery.job record
+        """
+        if delivery_company is None and records._name == 'delivery.company':
+            delivery_company = records
+        delivery_company.ensure_one()
+        self._check_job_method(records._name, method)
+        if not callable(getattr(records, method, None)):
+            raise UserError(_("Unknown method %(method)s on %(model)s.",
+                              method=method, model=records._name))
+        job = self.sudo().create({
+            'name': name or f"{records._name}.{method}",
+            'user_id': self.env.uid,
+            'delivery_company_id': delivery_company.id,
+            'res_model': records._name,
+            'res_ids': json.dumps(records.ids),
+            'method': method,
+            'args': json.dumps(list(args or [])),
+            'kwargs': json.dumps(dict(kwargs or {})),
+            'priority': priority,
+            'max_attempts': max_attempts,
+        })
+        self._get_runner_crons(delivery_company.provider_type)._trigger()
+        return job
+
+    # ==========================================================================
+    # Runner
+    # ==========================================================================
+    @api.model
+    def _get_concurrency(self):
+        """Number of jobs of one provider that may run at once."""
+        return max(int(self.env['ir.config_parameter'].sudo().get_param(
+            'delivery_company.job_concurrency') or 2), 1)
+
+    @api.model
+    def _get_runner_crons(self, provider_type):
+        """
+        Runner schedulers of a provider, one per job it may run at once, created
+        on first use. Each provider has its own runners, so a slow or failing
+        carrier never holds the jobs of the others.
+
+        Returns:
+            ir.cron records
+        """
+        code = f"model._cron_run_jobs({provider_type!r})"
+        Cron = self.env['ir.cron'].sudo().with_context(active_test=False)
+        crons = Cron.search([('model_id.model', '=', self._name), ('code', '=', code)])
+        provider_name = dict(self.env['delivery.company']._fields['provider_type']
+                             ._description_selection(self.env)).get(provider_type, provider_type)
+        for slot in range(len(crons) + 1, self._get_concurrency() + 1):
+            crons |= Cron.create({
+                'name': f"Delivery Jobs: {provider_name} Runner {slot}",
+                'model_id': self.env['ir.model']._get_id(self._name),
+                'state': 'code',
+                'code': code,
+                'user_id': self.env.ref('base.user_root').id,
+                'interval_number': 1,
+                'interval_type': 'days',
+            })
+        return crons.filtered('active')
+
+    @api.model
+    def _cron_run_jobs(self, provider_type=None):
+        """
+        Scheduler: run due jobs of a provider until none is left or the time
+        budget is spent. Each provider runs at most 'delivery_company.job_concurrency'
+        jobs at once, on as many runners of its own; jobs are claimed with
+        SKIP LOCKED, so the runners share the queue.
+
+        Without provider, put back stale jobs and wake up the runners of the
+        providers having due jobs, e.g. jobs retried after a backoff.
+        """
+        param = self.env['ir.config_parameter'].sudo()
+        if not provider_type:
+            stale_minutes = int(param.get_param('delivery_company.job_stale_minutes') or 30)
+            self._requeue_stale_jobs(stale_minutes)
+            for provider_type, in self._read_group(self._get_due_domain(), ['provider_type']):
+                self._get_runner_crons(provider_type)._trigger()
+            return
+
+        slot = self._acquire_runner_slot(provider_type)
+        if slot is None:
+            # The provider already runs its jobs on other runners
+            return
+        time_budget = int(param.get_param('delivery_company.job_time_budget') or 240)
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        deadline = time.monotonic() + time_budget
+        try:
+            while time.monotonic() < deadline:
+                job = self._claim_job(provider_type)
+                if not job:
+                    break
+                if auto_commit:
+                    self.env.cr.commit()
+                job._run()
+                if auto_commit:
+                    self.env.cr.commit()
+            else:
+                # Time budget spent, continue in a new run
+                self._get_runner_crons(provider_type)._trigger()
+        finally:
+            self.env.cr.execute("SELECT pg_advisory_unlock(hashtext(%s), %s)",
+                                [f'delivery_job_{provider_type}', slot])
+
+    @api.model
+    def _acquire_runner_slot(self, provider_type):
+        """
+        Take one of the 'delivery_company.job_concurrency' runner slots of a
+        provider, a session advisory lock kept across the runner commits and
+        released by the runner, or by PostgreSQL when its connection is lost.
+
+        Returns:
+            int slot number, None when all slots are taken
+        """
+        for slot in range(self._get_concurrency()):
+            self.env.cr.execute("SELECT pg_try_advisory_lock(hashtext(%s), %s)",
+                                [f'delivery_job_{provider_type}', slot])
+            if self.env.cr.fetchone()[0]:
+                return slot
+        return None
+
+    @api.model
+    def _get_due_domain(self):
+        """Domain of the jobs waiting to run."""
+        return [
+            ('state', '=', 'pending'),
+            '|', ('eta', '=', False), ('eta', '<=', fields.Datetime.now()),
+        ]
+
+    @api.model
+    def _requeue_stale_jobs(self, stale_minutes):
+        """Put back jobs left started by a crashed or killed runner."""
+        self.search([
+            ('state', '=', 'started'),
+            ('date_started', '<', fields.Datetime.now() - timedelta(minutes=stale_minutes)),
+        ]).write({'state': 'pending', 'eta': False})
+
+    @api.model
+    def _claim_job(self, provider_type):
+        """
+        Lock and start the next due job of a provider, unless it already has
+        'delivery_company.job_concurrency' started jobs, e.g. jobs of a killed
+        runner not put back yet. Runners hold a slot of the provider while
+        claiming, see _acquire_runner_slot, so they cannot pass the limit together.
+
+        Returns:
+            delivery.job record, empty when no job can run
+        """
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT COUNT(*)
+              FROM delivery_job
+             WHERE state = 'started'
+               AND provider_type = %s
+        """, [provider_type])
+        if self.env.cr.fetchone()[0] >= self._get_concurrency():
+            return self.browse()
+        self.env.cr.execute("""
+            SELECT job.id
+              FROM delivery_job job
+             WHERE job.state = 'pending'
+               AND job.provider_type = %s
+               AND (job.eta IS NULL OR job.eta <= (now() at time zone 'UTC'))
+          ORDER BY job.priority, job.eta NULLS FIRST, job.id
+             LIMIT 1
+               FOR UPDATE SKIP LOCKED
+        """, [provider_type])
+        row = self.env.cr.fetchone()
+        if not row:
+            return self.browse()
+        job = self.browse(row[0])
+        job.write({
+            'state': 'started',
+            'date_started': fields.Datetime.now(),
+            'attempts': job.attempts + 1,
+        })
+        return job
+
+    def _run(self):
+        """Run a started job, retrying it later with exponential backoff on failure."""
+        self.ensure_one()
+        if self.method not in self._get_job_methods().get(self.res_model, set()):
+            _logger.warning("Delivery job %s calls %s.%s, which is not a job entry point",
+                            self.id, self.res_model, self.method)
+            self.write({
+                'state': 'failed',
+                'date_done': fields.Datetime.now(),
+                'error': _("%(model)s.%(method)s cannot be run as a delivery job.",
+                           model=self.res_model, method=self.method),
+            })
+            return
+        try:
+            with self.env.cr.savepoint():
+                env = self.env(user=self.user_id.id or self.env.uid)
+                records = env[self.res_model].browse(json.loads(self.res_ids)).exists()
+                result = getattr(records, self.method)(*json.loads(self.args or '[]'),
+                                                       **json.loads(self.kwargs or '{}'))
+                if isinstance(result, dict) and result.get('success') is False:
+                    raise UserError(result.get('error') or result.get('message')
+                                    or _("Provider call failed"))
+        except Exception as e:
+            _logger.warning("Delivery job %s (%s) failed, attempt %s/%s",
+                            self.id, self.name, self.attempts, self.max_attempts,
+                            exc_info=True)
+            vals = {'error': str(e)}
+            if self.attempts < self.max_attempts:
+                base_delay = int(self.env['ir.config_parameter'].sudo().get_param(
+                    'delivery_company.job_retry_delay') or 60)
+                vals.update({
+                    'state': 'pending',
+                    'eta': fields.Datetime.now() + timedelta(
+                        seconds=base_delay * 2 ** (self.attempts - 1)),
+                })
+            else:
+                vals.update({'state': 'failed', 'date_done': fields.Datetime.now()})
+            self.write(vals)
+            return
+        self.write({
+            'state': 'done',
+            'date_done': fields.Datetime.now(),
+            'result': json.dumps(result, default=str, indent=1),
+            'error': False,
+        })
+
+    # ==========================================================================
+    # Actions
+    # ==========================================================================
+    def action_requeue(self):
+        """Run failed or cancelled jobs again."""
+        jobs = self.filtered(lambda job: job.state in ('failed', 'cancelled'))
+        jobs.sudo().write({
+            'state': 'pending',
+            'eta': False,
+            'attempts': 0,
+            'error': False,
+        })
+        for provider_type in set(jobs.mapped('provider_type')):
+            self._get_runner_crons(provider_type)._trigger()
+
+    def action_cancel(self):
+        """Cancel pending jobs."""
+        self.filtered(lambda job: job.state == 'pending').sudo().write({'state': 'cancelled'})
@@ -15,18 +15,27 @@ class StockPicking(models.Model):
     def _get_sale_order(self):
         """Get the sale order linked to this picking."""
         self.ensure_one()
-        
-        if self.sale_id:
-            return self.sale_id
-        
-        if self.group_id and self.group_id.sale_id:
-            return self.group_id.sale_id
-        
-        if self.origin:
-            sale_order = self.env['sale.order'].search([('name', '=', self.origin)], limit=1)
-            if sale_order:
-                return sale_order
-        return False
+        return self._get_sale_orders()[self]
+
+    def _get_sale_orders(self):
+        """
+        Get the sale orders linked to the pickings. Pickings only linked by their
+        origin are resolved with one search for the whole recordset.
+        :return: {picking: sale order or False}
+        """
+        sale_orders = {}
+        for picking in self:
+            sale_orders[picking] = picking.sale_id or picking.group_id.sale_id or False
+        origins = {picking.origin for picking, order in sale_orders.items()
+                   if not order and picking.origin}
+        if origins:
+            by_name = {}
+            for order in self.env['sale.order'].search([('name', 'in', list(origins))]):
+                by_name.setdefault(order.name, order)
+            for picking, order in sale_orders.items():
+                if not order:
+                    sale_orders[picking] = by_name.get(picking.origin, False)
+        return sale_orders
 
     def write(self, vals):
         """When delivery company changes on OUT, update related documents of the day."""
@@ -36,63 +45,69 @@ class StockPicking(models.Model):
             return res
         
         if 'delivery_company_id' in vals:
-            for picking in self:
-                if picking.picking_type_code == 'outgoing':
-                    picking._propagate_delivery_company_changes()
+            self.filtered(
+                lambda p: p.picking_type_code == 'outgoing'
+            )._propagate_delivery_company_changes()
         return res
 
     def _propagate_delivery_company_changes(self):
-        """Propagate delivery company changes to related documents created today."""
-        self.ensure_one()
+        """
+        Propagate delivery company changes to related documents: sale orders of
+        the day, sibling pickings of the same procurement group created today and
+        draft invoices. Related documents of the whole recordset are collected
+        first, then written with one write per model and delivery company.
+        """
+        if not self:
+            return
         today = date.today()
-        
-        sale_order = self._get_sale_order()
-        if sale_order and sale_order.date_order.date() == today:
-            sale_order.write({
-                'delivery_company_id': self.delivery_company_id.id,
-            })
-        
+        sale_orders = self._get_sale_orders()
+        siblings = self.env['stock.picking']
         if self.group_id:
-            related_pickings = self.env['stock.picking'].search([
-                ('group_id', '=', self.group_id.id),
-                ('id', '!=', self.id),
+            siblings = self.env['stock.picking'].search([
+                ('group_id', 'in', self.group_id.ids),
+                ('id', 'not in', self.ids),
                 ('create_date', '>=', fields.Datetime.to_string(today)),
             ])
-            for pick in related_pickings:
-                pick.with_context(skip_propagation=True).write({
-                    'delivery_company_id': self.delivery_company_id.id,
-                })
-    
-        if sale_order:
-            invoices = sale_order.invoice_ids.filtered(
-                lambda inv: inv.state == 'draft'
-            )
-            invoices.write({
-                'delivery_company_id': self.delivery_company_id.id,
-            })
+        siblings_by_group = siblings.grouped('group_id')
+
+        for company, pickings in self.grouped('delivery_company_id').items():
+            vals = {'delivery_company_id': company.id}
+            orders = self.env['sale.order'].union(
+                *[sale_orders[picking] for picking in pickings if sale_orders[picking]])
+            orders.filtered(lambda so: so.date_order.date() == today).write(vals)
+
+            related_pickings = self.env['stock.picking'].union(
+                *[siblings_by_group[group] for group in pickings.group_id
+                  if group in siblings_by_group])
+            related_pickings.with_context(skip_propagation=True).write(vals)
+
+            orders.invoice_ids.filtered(lambda inv: inv.state == 'draft').write(vals)
 
     @api.model_create_multi
     def create(self, vals_list):
         """Fill delivery company from sale order on creation."""
         pickings = super().create(vals_list)
-        for picking in pickings:
-            sale_order = picking._get_sale_order()
-            if sale_order and not picking.delivery_company_id and sale_order.delivery_company_id:
-                picking.with_context(skip_propagation=True).write({
-                    'delivery_company_id': sale_order.delivery_company_id.id,
-                })
+        sale_orders = pickings.filtered(lambda p: not p.delivery_company_id)._get_sale_orders()
+        to_fill = {}
+        for picking, sale_order in sale_orders.items():
+            if sale_order and sale_order.delivery_company_id:
+                to_fill.setdefault(sale_order.delivery_company_id, []).append(picking.id)
+        for company, picking_ids in to_fill.items():
+            self.browse(picking_ids).with_context(skip_propagation=True).write({
+                'delivery_company_id': company.id,
+            })
         return pickings
 
     def _action_done(self):
         """Propagate delivery company to next pickings in the chain when validated."""
         res = super()._action_done()
-        for picking in self:
-            next_pickings = picking.move_ids.move_dest_ids.picking_id.filtered(lambda p: p)
-            for next_picking in next_pickings:
-                if not next_picking.delivery_company_id and picking.delivery_company_id:
-                    next_picking.with_context(skip_propagation=True).write({
-                        'delivery_company_id': picking.delivery_company_id.id,
-                    })
+        for company, pickings in self.filtered('delivery_company_id').grouped(
+                'delivery_company_id').items():
+            next_pickings = pickings.move_ids.move_dest_ids.picking_id.filtered(
+                lambda p: not p.delivery_company_id)
+            next_pickings.with_context(skip_propagation=True).write({
+                'delivery_company_id': company.id,
+            })
         return res
 
 
@@ -102,10 +117,11 @@ class SaleOrder(models.Model):
     def _action_confirm(self):
         """Pass delivery company to pickings when confirming sale order."""
         res = super()._action_confirm()
-        for order in self:
-            for picking in order.picking_ids:
-                if not picking.delivery_company_id and order.delivery_company_id:
-                    picking.with_context(skip_propagation=True).write({
-                        'delivery_company_id': order.delivery_company_id.id,
-                    })
+        for company, orders in self.filtered('delivery_company_id').grouped(
+                'delivery_company_id').items():
+            orders.picking_ids.filtered(
+                lambda p: not p.delivery_company_id
+            ).with_context(skip_propagation=True).write({
+                'delivery_company_id': company.id,
+            })
         return res
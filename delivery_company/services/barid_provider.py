@@ -5,15 +5,27 @@ Supports two APIs:
 1. Tracking API: For package tracking via ApiTracking.asmx
 2. E-Commerce API: For shipment creation via /api/Package/Insert
 """
+import json
 import logging
+import re
+import threading
+import unicodedata
+import psycopg2
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from xml.etree import ElementTree
 from odoo import fields as odoo_fields
 
 from .base_provider import BaseDeliveryProvider
 
 _logger = logging.getLogger(__name__)
 
+# In-process cache of E-Commerce tokens: {(dbname, company id): (token, expiry)}
+_TOKEN_CACHE = {}
+_TOKEN_LOCKS = {}
+_TOKEN_LOCKS_GUARD = threading.Lock()
+
 
 class BaridProvider(BaseDeliveryProvider):
     """
@@ -36,10 +48,40 @@ class BaridProvider(BaseDeliveryProvider):
     ECOM_BASE_URL = "https://apicom.barid.ma/api"
     
     # Timeouts (seconds)
-    TIMEOUT = 60  # Increased timeout for slow connections
+    READ_TIMEOUT = 60  # Increased timeout for slow connections
+    SHIPMENT_READ_TIMEOUT = 30
     
     # Token validity duration (in hours) - adjust based on actual API behavior
     TOKEN_VALIDITY_HOURS = 23
+    # Advisory lock namespace of token refreshes (pg_advisory_xact_lock classid)
+    TOKEN_LOCK_NAMESPACE = 872301
+    
+    # Tracking events parsing: keys holding the event label and location,
+    # accepted date formats and label patterns of final statuses
+    EVENT_STATUS_KEYS = ('libelle', 'statut', 'status', 'etat', 'evenement', 'event')
+    EVENT_LOCATION_KEYS = ('lieu', 'bureau', 'site', 'location', 'ville')
+    EVENT_DATE_FORMATS = (
+        '%d/%m/%Y %H:%M:%S',
+        '%d/%m/%Y %H:%M',
+        '%d/%m/%Y',
+        '%Y-%m-%dT%H:%M:%S',
+        '%Y-%m-%d %H:%M:%S',
+        '%Y-%m-%d',
+    )
+    # Patterns match labels lowercased and without accents. A delivered label
+    # must start with the delivery phrase and hold no negation or failed
+    # attempt ("Non livré", "Tentative de livraison ... non livré"), since a
+    # delivered shipment is no longer tracked.
+    STATUS_PATTERNS = (
+        ('returned', re.compile(
+            r"\b(retour(ne|nee)? (a|vers) l'?expediteur|retourne|returned|return to sender"
+            r"|renvoye)\b")),
+        ('delivered', re.compile(
+            r"^(colis |envoi )?(livre|distribue|delivered|remis (au|a la) destinataire)\b")),
+    )
+    STATUS_NEGATION = re.compile(
+        r"\b(non|pas|not|undelivered|echec|echoue|failed|tentative|attempt|impossible"
+        r"|refuse)\b")
     
     @property
     def provider_code(self):
@@ -68,34 +110,128 @@ class BaridProvider(BaseDeliveryProvider):
         
         return {'success': len(errors) == 0, 'errors': errors}
     
-    def _get_ecom_token(self, force_refresh=False):
+    def _get_ecom_token(self, force_refresh=False, stale_token=None):
         """
         Get a valid E-Commerce API token.
-        Uses cached token if still valid, otherwise fetches a new one.
+        Uses the in-process cached token if still valid, otherwise refreshes it.
+        Refreshes are single-flight within a worker: its threads wait on a lock,
+        so one GetToken call is made per expiry and the others reuse its token.
+        Workers reuse a token another worker already saved on the company.
         
         Args:
             force_refresh: If True, always fetch a new token
+            stale_token: Token rejected by the API; refreshed unless another
+                thread or worker already replaced it
             
         Returns:
             dict: {'success': bool, 'token': str or None, 'error': str or None}
         """
-        # Check if we have a valid cached token
-        if not force_refresh and self.company.ecom_token and self.company.ecom_token_expiry:
-             
-            now = odoo_fields.Datetime.now()
-            if now < self.company.ecom_token_expiry:
+        key = (self.company.env.cr.dbname, self.company.id)
+        if not force_refresh:
+            token = self._get_cached_token(key)
+            if token and token != stale_token:
                 return {
                     'success': True,
-                    'token': self.company.ecom_token
+                    'token': token
                 }
         
-        # Fetch new token
+        with self._get_token_lock(key):
+            # Another thread may have refreshed the token while we waited
+            if not force_refresh:
+                token = self._get_cached_token(key)
+                if token and token != stale_token:
+                    return {
+                        'success': True,
+                        'token': token
+                    }
+            return self._refresh_ecom_token(key, force_refresh, stale_token)
+    
+    def _get_cached_token(self, key):
+        """Token of the in-process cache, False when missing or expired."""
+        token, expiry = _TOKEN_CACHE.get(key, (False, False))
+        if token and odoo_fields.Datetime.now() < expiry:
+            return token
+        return False
+    
+    def _get_token_lock(self, key):
+        """Lock serializing token refreshes of a company in this worker."""
+        with _TOKEN_LOCKS_GUARD:
+            return _TOKEN_LOCKS.setdefault(key, threading.Lock())
+    
+    def _refresh_ecom_token(self, key, force_refresh=False, stale_token=None):
+        """
+        Refresh the token outside of the running transaction. The token row is
+        re-checked under an advisory lock of the company in a short transaction,
+        so a token refreshed by another worker is reused, and the lock is
+        released before calling GetToken: no lock or transaction is held during
+        the network call.
+        """
+        with self.company.env.registry.cursor() as cr:
+            cr.execute("SELECT pg_advisory_xact_lock(%s, %s)",
+                       [self.TOKEN_LOCK_NAMESPACE, self.company.id])
+            cr.execute("""
+                SELECT ecom_token, ecom_token_expiry
+                  FROM delivery_company
+                 WHERE id = %s
+            """, [self.company.id])
+            token, expiry = cr.fetchone() or (False, False)
+        if (not force_refresh and token and expiry and token != stale_token
+                and odoo_fields.Datetime.now() < expiry):
+            # Refreshed by another worker
+            _TOKEN_CACHE[key] = (token, expiry)
+            return {
+                'success': True,
+                'token': token
+            }
+
+        result = self._fetch_ecom_token(self.company.ecom_password)
+        if result['success']:
+            _TOKEN_CACHE[key] = (result['token'], result['expiry'])
+            self._store_ecom_token(result['token'], result['expiry'])
+        return result
+
+    def _store_ecom_token(self, token, expiry):
+        """
+        Save the token on the company in a separate short transaction, never in
+        the running one. The row is locked with NOWAIT: when it is locked, e.g.
+        by the running transaction which wrote the company, waiting could never
+        end, so the token is only kept in the in-process cache and saved by the
+        next refresh.
+        """
+        try:
+            with self.company.env.registry.cursor() as cr:
+                cr.execute("""
+                    SELECT id
+                      FROM delivery_company
+                     WHERE id = %s
+                       FOR UPDATE NOWAIT
+                """, [self.company.id], log_exceptions=False)
+                cr.execute("""
+                    UPDATE delivery_company
+                       SET ecom_token = %s,
+                           ecom_token_expiry = %s,
+                           write_date = (now() at time zone 'UTC')
+                     WHERE id = %s
+                """, [token, expiry, self.company.id])
+        except psycopg2.errors.LockNotAvailable:
+            _logger.info("Delivery company %s is locked, Barid token kept in cache only",
+                         self.company.id)
+            return
+        self.company.invalidate_recordset(['ecom_token', 'ecom_token_expiry'])
+    
+    def _fetch_ecom_token(self, password):
+        """
+        Call GetToken.
+        
+        Returns:
+            dict: {'success': bool, 'token': str, 'expiry': datetime, 'error': str}
+        """
         try:
             url = f"{self.ECOM_BASE_URL}/Account/GetToken"
-            params = {'password': self.company.ecom_password}
+            params = {'password': password}
             
             _logger.info(f"Fetching new Barid E-Commerce token from {url}...")
-            response = requests.get(url, params=params, timeout=self.TIMEOUT, verify=True)
+            response = self._request('GET', url, params=params)
             
             if response.status_code == 200:
                 token = response.text.strip()
@@ -106,16 +242,11 @@ class BaridProvider(BaseDeliveryProvider):
                     # Calculate expiry time using Odoo's datetime
                     expiry = odoo_fields.Datetime.now() + timedelta(hours=self.TOKEN_VALIDITY_HOURS)
                     
-                    # Save token to database
-                    self.company.sudo().write({
-                        'ecom_token': token,
-                        'ecom_token_expiry': expiry
-                    })
-                    
                     _logger.info("Barid E-Commerce token obtained successfully")
                     return {
                         'success': True,
-                        'token': token
+                        'token': token,
+                        'expiry': expiry
                     }
                 else:
                     return {
@@ -156,16 +287,15 @@ class BaridProvider(BaseDeliveryProvider):
         # Test Tracking API with a dummy request
         try:
             _logger.info(f"Testing Tracking API at {self.TRACKING_URL}")
-            response = requests.post(
+            response = self._request(
+                'POST',
                 self.TRACKING_URL,
                 data={
                     'CodeBordereau': 'ANP03920060MA',  # Use test tracking number
                     'codecontrat': self.company.code_contrat or '',
                     'SecretKey': self.company.secret_key or ''
                 },
-                headers={'Content-Type': 'application/x-www-form-urlencoded'},
-                timeout=self.TIMEOUT,
-                verify=True
+                headers={'Content-Type': 'application/x-www-form-urlencoded'}
             )
             _logger.info(f"Tracking API response: {response.status_code} - {response.text[:500] if response.text else 'empty'}")
             # Even if the tracking returns error for invalid code, 
@@ -211,34 +341,78 @@ class BaridProvider(BaseDeliveryProvider):
             tracking_number: The CodeBordereau (tracking number)
             
         Returns:
-            dict: Tracking information or error
+            dict: Tracking information or error, with the parsed 'events'
+                and the shipment 'status' they lead to
         """
         if not self.company.code_contrat or not self.company.secret_key:
             return {
                 'success': False,
                 'error': 'Tracking credentials not configured'
             }
+        return self._post_tracking(tracking_number, self.company.code_contrat,
+                                   self.company.secret_key)
+    
+    def track_packages(self, tracking_numbers):
+        """
+        Track a batch of packages concurrently, on at most MAX_WORKERS threads
+        and within RATE_LIMIT calls per second. Credentials are read here, as
+        worker threads must not use the Odoo cursor.
+        
+        Args:
+            tracking_numbers: {key: tracking number} dict, key identifying the shipment
+            
+        Returns:
+            dict: {key: track_package result}
+        """
+        if not tracking_numbers:
+            return {}
+        code_contrat = self.company.code_contrat
+        secret_key = self.company.secret_key
+        if not code_contrat or not secret_key:
+            error = {
+                'success': False,
+                'error': 'Tracking credentials not configured'
+            }
+            return {key: error for key in tracking_numbers}
+        # Build the shared session before fanning out
+        self._get_session()
         
+        workers = min(self.MAX_WORKERS, len(tracking_numbers))
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix='barid_tracking') as executor:
+            futures = {
+                key: executor.submit(self._post_tracking, tracking_number, code_contrat,
+                                     secret_key)
+                for key, tracking_number in tracking_numbers.items()
+            }
+            return {key: future.result() for key, future in futures.items()}
+    
+    def _post_tracking(self, tracking_number, code_contrat, secret_key):
+        """
+        Call SuiviBordereau for one package. Only does HTTP, so it can run
+        outside of the request thread.
+        """
         try:
             _logger.info(f"Tracking Barid package: {tracking_number}")
             
-            response = requests.post(
+            response = self._request(
+                'POST',
                 self.TRACKING_URL,
                 data={
                     'CodeBordereau': tracking_number,
-                    'codecontrat': self.company.code_contrat,
-                    'SecretKey': self.company.secret_key
+                    'codecontrat': code_contrat,
+                    'SecretKey': secret_key
                 },
-                headers={'Content-Type': 'application/x-www-form-urlencoded'},
-                timeout=self.TIMEOUT,
-                verify=True
+                headers={'Content-Type': 'application/x-www-form-urlencoded'}
             )
             
             if response.status_code == 200:
-                # Parse the response (adjust based on actual API response format)
+                events = self._parse_tracking_response(response.text)
                 return {
                     'success': True,
                     'tracking_number': tracking_number,
+                    'status': self._get_tracking_status(events),
+                    'events': events,
                     'data': response.text
                 }
             else:
@@ -259,6 +433,105 @@ class BaridProvider(BaseDeliveryProvider):
                 'error': str(e)
             }
     
+    def _parse_tracking_response(self, text):
+        """
+        Parse a SuiviBordereau response into tracking events, oldest first.
+        The ASMX service answers XML, either listing the events as elements
+        or wrapping a JSON payload in a <string> element; both are read.
+        
+        Args:
+            text: Raw response body
+            
+        Returns:
+            list: [{'date': datetime or False, 'status': str, 'location': str}]
+        """
+        raw_events = []
+        payload = (text or '').strip()
+        try:
+            root = ElementTree.fromstring(payload)
+        except ElementTree.ParseError:
+            root = None
+        if root is not None:
+            if len(root):
+                # Leaf parents are the events: <Event><Date/><Libelle/>...</Event>
+                for node in root.iter():
+                    if len(node) and all(not len(child) for child in node):
+                        raw_events.append({
+                            child.tag.rsplit('}', 1)[-1].lower(): (child.text or '').strip()
+                            for child in node
+                        })
+                payload = ''
+            else:
+                payload = (root.text or '').strip()
+        if payload:
+            try:
+                data = json.loads(payload)
+            except ValueError:
+                data = []
+            if isinstance(data, dict):
+                # Events list under any key, or a single event
+                data = next((value for value in data.values() if isinstance(value, list)),
+                            [data])
+            raw_events = [
+                {str(key).lower(): value for key, value in event.items()}
+                for event in data if isinstance(event, dict)
+            ]
+        
+        events = []
+        for raw in raw_events:
+            status = self._get_event_value(raw, self.EVENT_STATUS_KEYS)
+            if not status:
+                continue
+            events.append({
+                'date': self._parse_event_date(
+                    self._get_event_value(raw, ('date',), exclude=())),
+                'status': status,
+                'location': self._get_event_value(raw, self.EVENT_LOCATION_KEYS),
+            })
+        events.sort(key=lambda event: event['date'] or datetime.min)
+        return events
+    
+    def _get_event_value(self, raw_event, keys, exclude=('date',)):
+        """First non empty value of raw_event whose key contains one of keys."""
+        for name, value in raw_event.items():
+            if (value and any(key in name for key in keys)
+                    and not any(key in name for key in exclude)):
+                return str(value).strip()
+        return ''
+    
+    def _parse_event_date(self, value):
+        """Parse a tracking event date, False when unknown."""
+        for date_format in self.EVENT_DATE_FORMATS:
+            try:
+                return datetime.strptime(value, date_format)
+            except (TypeError, ValueError):
+                continue
+        return False
+    
+    def _get_tracking_status(self, events):
+        """
+        Map the last tracking event to a delivery.shipment state.
+        
+        Returns:
+            str: 'delivered', 'returned', 'in_transit' or False without events
+        """
+        if not events:
+            return False
+        label = self._normalize_status_label(events[-1]['status'])
+        for status, pattern in self.STATUS_PATTERNS:
+            if pattern.search(label):
+                if status == 'delivered' and self.STATUS_NEGATION.search(label):
+                    break
+                return status
+        return 'in_transit'
+    
+    @staticmethod
+    def _normalize_status_label(label):
+        """Lowercase a status label, without accents nor extra spaces."""
+        label = unicodedata.normalize('NFKD', label or '')
+        label = ''.join(char for char in label if not unicodedata.combining(char))
+        return ' '.join(label.lower().replace('’', "'").split())
+    
     def create_shipment(self, shipment_data):
         """
         Create a new shipment using the Barid E-Commerce API.
@@ -282,65 +555,102 @@ class BaridProvider(BaseDeliveryProvider):
         if not token_result['success']:
             return token_result
         
-        token = token_result['token']
+        _logger.info("Creating Barid shipment...")
+        result = self._post_shipment(token_result['token'], shipment_data)
+        if result.get('status_code') == 401:
+            # Token expired, try once more with fresh token
+            _logger.warning("Token expired, refreshing...")
+            token_result = self._get_ecom_token(stale_token=token_result['token'])
+            if token_result['success']:
+                result = self._post_shipment(token_result['token'], shipment_data)
+            if not result['success']:
+                return {
+                    'success': False,
+                    'error': 'Authentication failed even after token refresh'
+                }
+        result.pop('status_code', None)
+        return result
+    
+    def create_shipments(self, shipments_data):
+        """
+        Create a batch of shipments concurrently, on at most MAX_WORKERS threads
+        and within RATE_LIMIT calls per second.
+        The token is fetched (and refreshed on 401) here, as worker threads
+        must not use the Odoo cursor; they only send the HTTP requests.
         
-        try:
-            _logger.info("Creating Barid shipment...")
+        Args:
+            shipments_data: {key: shipment_data} dict, key identifying the shipment
             
-            headers = {
-                'Authorization': f'Bearer {token}',
-                'Content-Type': 'application/json'
+        Returns:
+            dict: {key: shipment creation result}
+        """
+        if not shipments_data:
+            return {}
+        token_result = self._get_ecom_token()
+        if not token_result['success']:
+            return {key: token_result for key in shipments_data}
+        # Build the shared session before fanning out
+        self._get_session()
+        
+        _logger.info("Creating %s Barid shipments...", len(shipments_data))
+        results = self._post_shipments(token_result['token'], shipments_data)
+        expired = {key: shipments_data[key] for key, result in results.items()
+                   if result.get('status_code') == 401}
+        if expired:
+            _logger.warning("Token expired, refreshing...")
+            token_result = self._get_ecom_token(stale_token=token_result['token'])
+            if token_result['success']:
+                results.update(self._post_shipments(token_result['token'], expired))
+            for key in expired:
+                if not results[key]['success']:
+                    results[key] = {
+                        'success': False,
+                        'error': 'Authentication failed even after token refresh'
+                    }
+        for result in results.values():
+            result.pop('status_code', None)
+        return results
+    
+    def _post_shipments(self, token, shipments_data):
+        """
+        Post shipments concurrently with the given token.
+        
+        Returns:
+            dict: {key: _post_shipment result}
+        """
+        workers = min(self.MAX_WORKERS, len(shipments_data))
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix='barid_shipment') as executor:
+            futures = {
+                key: executor.submit(self._post_shipment, token, shipment_data)
+                for key, shipment_data in shipments_data.items()
             }
-            
-            url = f"{self.ECOM_BASE_URL}/Package/Insert"
-            
-            response = requests.post(
+            return {key: future.result() for key, future in futures.items()}
+    
+    def _post_shipment(self, token, shipment_data):
+        """
+        Post one shipment to /Package/Insert. Only does HTTP, so it can run
+        outside of the request thread.
+        
+        Returns:
+            dict: Shipment creation result, with the response 'status_code'
+        """
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        }
+        url = f"{self.ECOM_BASE_URL}/Package/Insert"
+        
+        try:
+            # Not replayed on 5xx: the package may already have been inserted
+            response = self._request(
+                'POST',
                 url,
                 json=shipment_data,
                 headers=headers,
-                timeout=30
+                read_timeout=self.SHIPMENT_READ_TIMEOUT,
+                retry_status=False
             )
-            
-            if response.status_code in [200, 201]:
-                try:
-                    result = response.json()
-                    _logger.info(f"Barid shipment created successfully: {result}")
-                    return {
-                        'success': True,
-                        'data': result
-                    }
-                except ValueError:
-                    return {
-                        'success': True,
-                        'data': response.text
-                    }
-            elif response.status_code == 401:
-                # Token expired, try once more with fresh token
-                _logger.warning("Token expired, refreshing...")
-                token_result = self._get_ecom_token(force_refresh=True)
-                if token_result['success']:
-                    headers['Authorization'] = f"Bearer {token_result['token']}"
-                    response = requests.post(
-                        url,
-                        json=shipment_data,
-                        headers=headers,
-                        timeout=30
-                    )
-                    if response.status_code in [200, 201]:
-                        return {
-                            'success': True,
-                            'data': response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text
-                        }
-                return {
-                    'success': False,
-                    'error': 'Authentication failed even after token refresh'
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': f'Shipment creation failed with status {response.status_code}: {response.text}'
-                }
-                
         except requests.Timeout:
             return {
                 'success': False,
@@ -352,6 +662,27 @@ class BaridProvider(BaseDeliveryProvider):
                 'success': False,
                 'error': str(e)
             }
+        
+        if response.status_code in [200, 201]:
+            try:
+                result = response.json()
+                _logger.info(f"Barid shipment created successfully: {result}")
+                return {
+                    'success': True,
+                    'data': result,
+                    'status_code': response.status_code
+                }
+            except ValueError:
+                return {
+                    'success': True,
+                    'data': response.text,
+                    'status_code': response.status_code
+                }
+        return {
+            'success': False,
+            'error': f'Shipment creation failed with status {response.status_code}: {response.text}',
+            'status_code': response.status_code
+        }
     
     def get_label(self, tracking_number):
         """
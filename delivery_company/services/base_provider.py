@@ -8,9 +8,43 @@ All providers must implement these methods.
 
 from abc import ABC, abstractmethod
 import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 _logger = logging.getLogger(__name__)
 
+# Pooled HTTP sessions and rate limiters, one per provider class and worker process
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+_RATE_LIMITERS = {}
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter spacing calls evenly to at most `rate` per second.
+    """
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        """Block until the next call slot is reached."""
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class BaseDeliveryProvider(ABC):
     """
@@ -24,6 +58,19 @@ class BaseDeliveryProvider(ABC):
         result = provider.track_package('ANP03920060MA')
     """
     
+    # HTTP session settings, pool size can be overridden with the
+    # 'delivery_company.http_pool_size' system parameter
+    POOL_SIZE = 10
+    CONNECT_TIMEOUT = 10
+    READ_TIMEOUT = 60
+    MAX_RETRIES = 3
+    BACKOFF_FACTOR = 0.5
+    RETRY_STATUSES = (500, 502, 503, 504)
+    
+    # Bulk submission settings: concurrent requests and API calls per second
+    MAX_WORKERS = 4
+    RATE_LIMIT = 5
+    
     def __init__(self, company_record):
         """
         Initialize provider with delivery.company record.
@@ -33,6 +80,86 @@ class BaseDeliveryProvider(ABC):
         self.company = company_record
         self._validate_credentials()
     
+    def _get_session(self):
+        """
+        Get the keep-alive HTTP session shared by all instances of this provider
+        in the current worker. Connections are pooled per host and connection
+        errors are retried by the transport with exponential backoff.
+        A forked worker builds its own session instead of reusing the parent's sockets.
+        
+        :return: requests.Session
+        """
+        key = (type(self), os.getpid())
+        session = _SESSIONS.get(key)
+        if session:
+            return session
+        with _SESSIONS_LOCK:
+            session = _SESSIONS.get(key)
+            if not session:
+                pool_size = int(self.company.env['ir.config_parameter'].sudo().get_param(
+                    'delivery_company.http_pool_size') or self.POOL_SIZE)
+                retry = Retry(
+                    total=self.MAX_RETRIES,
+                    connect=self.MAX_RETRIES,
+                    read=0,
+                    status=0,
+                    backoff_factor=self.BACKOFF_FACTOR,
+                    allowed_methods=None,
+                )
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                      max_retries=retry)
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers['Connection'] = 'keep-alive'
+                _SESSIONS[key] = session
+        return session
+    
+    def _get_rate_limiter(self):
+        """
+        Get the rate limiter shared by all instances of this provider in the current worker.
+        
+        :return: RateLimiter
+        """
+        key = (type(self), os.getpid())
+        with _SESSIONS_LOCK:
+            limiter = _RATE_LIMITERS.get(key)
+            if not limiter:
+                limiter = _RATE_LIMITERS[key] = RateLimiter(self.RATE_LIMIT)
+        return limiter
+    
+    def _request(self, method, url, read_timeout=None, retry_status=True, **kwargs):
+        """
+        Send an HTTP request through the pooled session, with separate connect
+        and read timeouts, within the provider rate limit. 5xx responses are
+        retried with exponential backoff; disable it for requests that are not
+        safe to replay.
+        
+        :param method: HTTP method ('GET', 'POST', ...)
+        :param url: Request URL
+        :param read_timeout: Read timeout in seconds, READ_TIMEOUT by default
+        :param retry_status: Retry on RETRY_STATUSES responses
+        :return: requests.Response
+        :raise requests.RequestException: once connection retries are exhausted
+        """
+        kwargs.setdefault('timeout', (self.CONNECT_TIMEOUT, read_timeout or self.READ_TIMEOUT))
+        kwargs.setdefault('verify', True)
+        session = self._get_session()
+        limiter = self._get_rate_limiter()
+        attempt = 0
+        while True:
+            limiter.wait()
+            response = session.request(method, url, **kwargs)
+            if (not retry_status or response.status_code not in self.RETRY_STATUSES
+                    or attempt >= self.MAX_RETRIES):
+                return response
+            delay = self.BACKOFF_FACTOR * (2 ** attempt)
+            attempt += 1
+            _logger.warning("%s returned %s on %s %s, retry %s/%s in %.1fs",
+                            self.provider_name, response.status_code, method, url,
+                            attempt, self.MAX_RETRIES, delay)
+            time.sleep(delay)
+    
     @property
     @abstractmethod
     def provider_code(self):
@@ -98,6 +225,30 @@ class BaseDeliveryProvider(ABC):
         """
         pass
     
+    def track_packages(self, tracking_numbers):
+        """
+        Get tracking information for a batch of packages.
+        Default: one track_package call after the other. Override in provider
+        to poll concurrently.
+        
+        :param tracking_numbers: {key: tracking number} dict, key identifying the shipment
+        :return: {key: track_package result}
+        """
+        return {key: self.track_package(tracking_number)
+                for key, tracking_number in tracking_numbers.items()}
+    
+    def create_shipments(self, shipments_data):
+        """
+        Create a batch of shipments.
+        Default: one create_shipment call after the other. Override in provider
+        to submit concurrently.
+        
+        :param shipments_data: {key: shipment_data} dict, key identifying the shipment
+        :return: {key: create_shipment result}
+        """
+        return {key: self.create_shipment(shipment_data)
+                for key, shipment_data in shipments_data.items()}
+    
     @abstractmethod
     def get_label(self, shipment_id):
         """
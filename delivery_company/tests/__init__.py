@@ -0,0 +1,2 @@
+from . import test_barid_provider
+from . import test_delivery_job
@@ -0,0 +1,34 @@
+from odoo.tests.common import TransactionCase, tagged
+from ..services.barid_provider import BaridProvider
+
+
+@tagged("delivery_company")
+class TestBaridProvider(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["delivery.company"].create({
+            "name": "Barid", "provider_type": "barid",
+            "code_contrat": "CONTRACT", "secret_key": "SECRET",
+            "ecom_password": "PASSWORD", })
+        cls.provider = BaridProvider(cls.company)
+
+    def _status(self, label):
+        return self.provider._get_tracking_status([{"status": label}])
+
+    def test_tracking_status_delivered(self):
+        self.assertEqual(self._status("Livré"), "delivered")
+        self.assertEqual(self._status("Colis livré au destinataire"), "delivered")
+        self.assertEqual(self._status("Remis au destinataire"), "delivered")
+
+    def test_tracking_status_not_delivered(self):
+        self.assertEqual(self._status("Non livré"), "in_transit")
+        self.assertEqual(self._status("Tentative de livraison - non livré"), "in_transit")
+        self.assertEqual(self._status("Remis à l'agence"), "in_transit")
+        self.assertEqual(self._status("En cours de livraison"), "in_transit")
+
+    def test_tracking_status_returned(self):
+        self.assertEqual(self._status("Retourné à l'expéditeur"), "returned")
+        self.assertEqual(self._status("Non livré, retourné à l'expéditeur"), "returned")
+        self.assertFalse(self.provider._get_tracking_status([]))
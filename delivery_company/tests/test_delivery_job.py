@@ -0,0 +1,95 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged("delivery_company")
+class TestDeliveryJob(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env["delivery.company"].create({
+            "name": "Barid", "provider_type": "barid",
+            "code_contrat": "CONTRACT", "secret_key": "SECRET",
+            "ecom_password": "PASSWORD", })
+        cls.Job = cls.env["delivery.job"]
+        cls.env["ir.config_parameter"].sudo().set_param("delivery_company.job_concurrency", "2")
+        cls.env["ir.config_parameter"].sudo().set_param("delivery_company.job_retry_delay", "60")
+
+    def _enqueue(self, method="track_package", **kwargs):
+        return self.Job._enqueue(self.company, method, args=["ANP03920060MA"], **kwargs)
+
+    def test_enqueue_rejects_unknown_method(self):
+        with self.assertRaises(UserError):
+            self.Job._enqueue(self.company, "unlink")
+        with self.assertRaises(UserError):
+            self._enqueue().write({"method": "unlink"})
+
+    def test_run_rejects_unknown_method(self):
+        job = self.Job.sudo().create({
+            "name": "unlink", "delivery_company_id": self.company.id,
+            "res_model": "delivery.company", "res_ids": f"[{self.company.id}]",
+            "method": "unlink", "state": "started", "attempts": 1, })
+        job._run()
+        self.assertEqual(job.state, "failed")
+        self.assertTrue(self.company.exists())
+
+    def test_run_retries_with_backoff(self):
+        job = self._enqueue(max_attempts=2)
+        failure = {"success": False, "error": "Service unavailable"}
+        with patch.object(type(self.company), "track_package", return_value=failure):
+            job.write({"state": "started", "attempts": 1})
+            before = fields.Datetime.now()
+            job._run()
+            self.assertEqual(job.state, "pending")
+            self.assertEqual(job.error, "Service unavailable")
+            self.assertGreaterEqual(job.eta, before + timedelta(seconds=60))
+            self.assertLess(job.eta, before + timedelta(seconds=120))
+
+            job.write({"state": "started", "attempts": 2})
+            job._run()
+            self.assertEqual(job.state, "failed")
+
+    def test_run_done(self):
+        job = self._enqueue()
+        result = {"success": True, "status": "delivered"}
+        with patch.object(type(self.company), "track_package", return_value=result) as track:
+            self.Job._cron_run_jobs("barid")
+        track.assert_called_once_with("ANP03920060MA")
+        self.assertEqual(job.state, "done")
+        self.assertEqual(job.attempts, 1)
+
+    def test_requeue_stale_jobs(self):
+        stale, running = self._enqueue(), self._enqueue()
+        stale.write({"state": "started",
+                     "date_started": fields.Datetime.now() - timedelta(hours=1)})
+        running.write({"state": "started", "date_started": fields.Datetime.now()})
+        self.Job._requeue_stale_jobs(30)
+        self.assertEqual(stale.state, "pending")
+        self.assertEqual(running.state, "started")
+
+    def test_claim_job(self):
+        later = self._enqueue()
+        later.write({"eta": fields.Datetime.now() + timedelta(hours=1)})
+        first, second, third = self._enqueue(priority=1), self._enqueue(), self._enqueue()
+        self.assertEqual(self.Job._claim_job("barid"), first)
+        self.assertEqual(first.state, "started")
+        self.assertEqual(first.attempts, 1)
+        self.assertEqual(self.Job._claim_job("barid"), second)
+        # Concurrency limit of the provider reached
+        self.assertFalse(self.Job._claim_job("barid"))
+        self.assertFalse(self.Job._claim_job("other"))
+        first.write({"state": "done"})
+        self.assertEqual(self.Job._claim_job("barid"), third)
+        self.assertEqual(later.state, "pending")
+
+    def test_runner_crons(self):
+        crons = self.Job._get_runner_crons("barid")
+        self.assertEqual(len(crons), 2)
+        self.assertEqual(self.Job._get_runner_crons("barid"), crons)
+        self.assertEqual(crons.mapped("code"), ["model._cron_run_jobs('barid')"] * 2)
+        self.assertFalse(self.Job._get_runner_crons("other") & crons)
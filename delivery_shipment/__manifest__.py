@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Delivery Shipment',
-    'version': '1.3',
+    'version': '1.7',
     'summary': 'Shipment Management with Barcode Generation',
     'description': """
         Manage shipments for delivery orders.
@@ -9,8 +9,9 @@
         - Generate barcodes (GAB, CAB1, MS Destinataire)
         - Support multiple packages per shipment
         - Track shipment status
+        - Scheduled tracking sync with the delivery company API
         - Change delivery company if needed
-        - Export to Excel for Barid (Amana)
+        - Export to Excel for Barid (Amana), CSV or JSON lines
         - Print shipment labels (Amana format)
     """,
     'category': 'Operations/Inventory',
@@ -19,6 +20,7 @@
     'data': [
         'security/ir.model.access.csv',
         'data/ir_sequence_data.xml',
+        'data/ir_cron.xml',
         'views/delivery_shipment_package_views.xml',
         'views/delivery_shipment_views.xml',
         'views/account_move_views.xml',
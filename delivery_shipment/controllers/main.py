@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import tempfile
+
+from werkzeug.wsgi import wrap_file
+
+from odoo import http
+from odoo.http import request, content_disposition
+
+from ..wizard.export_wizard import EXPORT_MIMETYPES
+
+
+class DeliveryShipmentExport(http.Controller):
+
+    @http.route('/delivery_shipment/export/<int:wizard_id>', type='http', auth='user')
+    def export_shipments(self, wizard_id, **kwargs):
+        """
+        Stream the export of a wizard in its format. The file is written to a
+        temporary file, removed once the response is sent.
+        """
+        wizard = request.env['delivery.shipment.export.wizard'].browse(wizard_id).exists()
+        if not wizard or wizard.create_uid != request.env.user:
+            raise request.not_found()
+        output = tempfile.TemporaryFile()
+        try:
+            wizard._write_export(output)
+            size = output.tell()
+            output.seek(0)
+        except Exception:
+            output.close()
+            raise
+        response = request.make_response(
+            wrap_file(request.httprequest.environ, output),
+            headers=[
+                ('Content-Type', EXPORT_MIMETYPES[wizard.export_format]),
+                ('Content-Length', size),
+                ('Content-Disposition', content_disposition(wizard._get_export_filename())),
+            ],
+        )
+        response.direct_passthrough = True
+        return response
@@ -3,3 +3,5 @@ from . import delivery_shipment
 from . import delivery_shipment_package
 from . import stock_picking
 from . import account_move
+from . import delivery_shipment_tracking_event
+from . import delivery_job
@@ -20,61 +20,109 @@ class AccountMove(models.Model):
     def _get_sale_order(self):
         """Get the sale order linked to this invoice."""
         self.ensure_one()
-        # Try to get from invoice origin
-        if self.invoice_origin:
-            sale_order = self.env['sale.order'].search([('name', '=', self.invoice_origin)], limit=1)
-            if sale_order:
-                return sale_order
-        # Try from invoice lines
-        for line in self.invoice_line_ids:
-            if line.sale_line_ids:
-                return line.sale_line_ids[0].order_id
-        return False
+        return self._get_sale_orders()[self]
+
+    def _get_sale_orders(self):
+        """Get the sale orders linked to the invoices, origins resolved in one query.
+        :return: {invoice: sale order or False}
+        """
+        origins = {move.invoice_origin for move in self if move.invoice_origin}
+        by_name = {}
+        if origins:
+            for order in self.env['sale.order'].search([('name', 'in', list(origins))]):
+                by_name.setdefault(order.name, order)
+        sale_orders = {}
+        for move in self:
+            # Try to get from invoice origin
+            sale_order = by_name.get(move.invoice_origin)
+            if not sale_order:
+                # Try from invoice lines
+                sale_order = next((line.sale_line_ids[0].order_id
+                                   for line in move.invoice_line_ids if line.sale_line_ids), False)
+            sale_orders[move] = sale_order
+        return sale_orders
 
     def _get_delivery_picking(self):
         """Get the delivery picking linked to this invoice."""
         self.ensure_one()
-        sale_order = self._get_sale_order()
-        if sale_order:
+        return self._get_delivery_pickings()[self]
+
+    def _get_delivery_pickings(self, sale_orders=None):
+        """Get the done delivery pickings linked to the invoices.
+        :param sale_orders: result of _get_sale_orders, when already known
+        :return: {invoice: picking or False}
+        """
+        if sale_orders is None:
+            sale_orders = self._get_sale_orders()
+        pickings = {}
+        for move in self:
             # Get done delivery pickings
-            pickings = sale_order.picking_ids.filtered(
+            delivery_pickings = sale_orders[move].picking_ids.filtered(
                 lambda p: p.picking_type_code == 'outgoing' and p.state == 'done'
-            )
-            if pickings:
-                return pickings[0]
-        return False
+            ) if sale_orders[move] else False
+            pickings[move] = delivery_pickings[:1] if delivery_pickings else False
+        return pickings
 
     def _create_shipment(self):
         """Create a shipment record for this invoice."""
         self.ensure_one()
-        if self.shipment_id:
+        return self._create_shipments()
+
+    def _create_shipments(self, generate_barcode=False):
+        """
+        Create the shipments of the invoices without one, all at once. Invoices
+        whose delivery order already has a shipment are linked to it.
+        :param generate_barcode: also generate the packages of the new shipments
+        :return: shipments of the invoices
+        """
+        moves = self.filtered(lambda m: not m.shipment_id)
+        if not moves:
             return self.shipment_id
-        
+        sale_orders = moves._get_sale_orders()
+        pickings = moves._get_delivery_pickings(sale_orders)
+
         # Get the delivery picking
-        picking = self._get_delivery_picking()
-        if not picking:
-            raise UserError(_("No delivery order found for this invoice. Please ensure the delivery is done first."))
-        
+        missing_picking = moves.filtered(lambda m: not pickings[m])
+        if missing_picking:
+            raise UserError(_(
+                "No delivery order found for the following invoices, please ensure "
+                "the delivery is done first:\n%s", '\n'.join(missing_picking.mapped('display_name'))))
+
         # Check if picking already has a shipment
-        if picking.shipment_id:
-            self.shipment_id = picking.shipment_id
-            return picking.shipment_id
-        
-        if not self.delivery_company_id:
-            raise UserError(_("Please select a Delivery Company first."))
-        
-        sale_order = self._get_sale_order()
-        
-        shipment_vals = {
+        for move in moves.filtered(lambda m: pickings[m].shipment_id):
+            move.shipment_id = pickings[move].shipment_id
+        moves = moves.filtered(lambda m: not m.shipment_id)
+
+        missing_company = moves.filtered(lambda m: not m.delivery_company_id)
+        if missing_company:
+            raise UserError(_(
+                "Please select a Delivery Company first on the following invoices:\n%s",
+                '\n'.join(missing_company.mapped('display_name'))))
+
+        # One shipment per delivery order, even when several invoices share it
+        moves_by_picking = {}
+        for move in moves:
+            moves_by_picking.setdefault(pickings[move], move)
+        shipments = self.env['delivery.shipment'].create([
+            move._prepare_shipment_vals(picking, sale_orders[move])
+            for picking, move in moves_by_picking.items()
+        ])
+        for picking, shipment in zip(moves_by_picking, shipments):
+            picking.shipment_id = shipment
+        for move in moves:
+            move.shipment_id = pickings[move].shipment_id
+        if generate_barcode and shipments:
+            shipments.action_generate_barcode()
+        return self.shipment_id
+
+    def _prepare_shipment_vals(self, picking, sale_order):
+        """Values of the shipment of this invoice."""
+        self.ensure_one()
+        return {
             'picking_id': picking.id,
             'delivery_company_id': self.delivery_company_id.id,
             'nbr_colis': sale_order.nbr_colis if sale_order and hasattr(sale_order, 'nbr_colis') else 1,
         }
-        
-        shipment = self.env['delivery.shipment'].create(shipment_vals)
-        self.shipment_id = shipment
-        picking.shipment_id = shipment
-        return shipment
 
     def action_create_shipment(self):
         """Create a shipment from the invoice (button action)."""
@@ -83,6 +131,21 @@ class AccountMove(models.Model):
             self._create_shipment()
         return self.action_open_shipment()
 
+    def action_create_shipments(self, generate_barcode=False):
+        """Create the shipments of the selected customer invoices (mass action)."""
+        moves = self.filtered(lambda m: m.move_type in ('out_invoice', 'out_refund'))
+        if not moves:
+            raise UserError(_("Select customer invoices to create their shipments."))
+        shipments = moves._create_shipments(generate_barcode=generate_barcode)
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Shipments'),
+            'res_model': 'delivery.shipment',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', shipments.ids)],
+            'target': 'current',
+        }
+
     def action_open_shipment(self):
         """Open the related shipment."""
         self.ensure_one()
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+
+class DeliveryJob(models.Model):
+    _inherit = 'delivery.job'
+
+    @api.model
+    def _get_job_methods(self):
+        """Shipment submission is queued as a delivery job."""
+        methods = super()._get_job_methods()
+        methods.setdefault('delivery.shipment', set()).add('_send_to_provider_job')
+        return methods
@@ -1,7 +1,15 @@
 # -*- coding: utf-8 -*-
+import logging
+from datetime import timedelta
+
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 
+_logger = logging.getLogger(__name__)
+
+# Shipment states still followed by the tracking sync
+TRACKED_STATES = ('confirmed', 'in_transit')
+
 
 class DeliveryShipment(models.Model):
     _name = 'delivery.shipment'
@@ -240,6 +248,47 @@ class DeliveryShipment(models.Model):
     notes = fields.Text(
         string='Notes',
     )
+    
+    # Provider submission
+    provider_state = fields.Selection([
+        ('not_sent', 'Not Sent'),
+        ('sent', 'Sent'),
+        ('error', 'Error'),
+    ], string='Provider Status',
+       default='not_sent',
+       copy=False,
+       tracking=True,
+    )
+    
+    provider_error = fields.Text(
+        string='Provider Error',
+        copy=False,
+    )
+    
+    provider_sent_date = fields.Datetime(
+        string='Sent to Provider On',
+        copy=False,
+    )
+    
+    # Tracking
+    tracking_status = fields.Char(
+        string='Tracking Status',
+        copy=False,
+        help="Last tracking event reported by the delivery company",
+    )
+    
+    tracking_last_check = fields.Datetime(
+        string='Last Tracking Check',
+        copy=False,
+        index=True,
+    )
+    
+    tracking_event_ids = fields.One2many(
+        'delivery.shipment.tracking.event',
+        'shipment_id',
+        string='Tracking Events',
+        copy=False,
+    )
 
     @api.depends('picking_id')
     def _compute_sale_order_id(self):
@@ -350,9 +399,11 @@ class DeliveryShipment(models.Model):
 
     @api.model_create_multi
     def create(self, vals_list):
-        for vals in vals_list:
-            if vals.get('name', _('New')) == _('New'):
-                vals['name'] = self.env['ir.sequence'].next_by_code('delivery.shipment') or _('New')
+        new_vals = [vals for vals in vals_list if vals.get('name', _('New')) == _('New')]
+        if new_vals:
+            names = self._next_sequence_chars('delivery.shipment', len(new_vals))
+            for vals, name in zip(new_vals, names or [_('New')] * len(new_vals)):
+                vals['name'] = name
         return super().create(vals_list)
 
     def action_confirm(self):
@@ -389,29 +440,29 @@ class DeliveryShipment(models.Model):
         """Generate packages based on number of colis.
         - Barid: Creates packages with GAB barcodes
         - Non-Barid: Creates packages with reference numbers
+        All GAB numbers of the selection are reserved in one block and all
+        packages are created at once.
         """
+        if self.filtered('package_ids'):
+            raise UserError(_("Packages already exist. Clear them first to generate new ones."))
+        
+        barid_shipments = self.filtered('is_barid')
+        gabs = iter(self._allocate_gabs(sum(s.nbr_colis or 1 for s in barid_shipments)))
+        package_vals = []
+        main_gabs = {}
         for shipment in self:
-            if shipment.package_ids:
-                raise UserError(_("Packages already exist. Clear them first to generate new ones."))
-            
             nbr = shipment.nbr_colis or 1
-            packages = []
             
             if shipment.is_barid:
                 # Barid: Generate GAB barcodes
                 for i in range(nbr):
-                    sequence = self.env['ir.sequence'].next_by_code('delivery.shipment.barcode') or '000000001'
-                    gab = f'LI{sequence}MA'
-                    packages.append((0, 0, {
+                    gab = next(gabs)
+                    main_gabs.setdefault(shipment, gab)
+                    package_vals.append({
+                        'shipment_id': shipment.id,
                         'gab': gab,
                         'sequence': i + 1,
-                    }))
-                
-                shipment.write({'package_ids': packages})
-                
-                # Set main GAB to first package GAB for backward compatibility
-                if shipment.package_ids:
-                    shipment.gab = shipment.package_ids[0].gab
+                    })
             else:
                 # Non-Barid: Use reference range
                 try:
@@ -421,12 +472,253 @@ class DeliveryShipment(models.Model):
                 
                 for i in range(nbr):
                     ref_num = str(ref_start + i) if ref_start else f"REF-{i + 1}"
-                    packages.append((0, 0, {
+                    package_vals.append({
+                        'shipment_id': shipment.id,
                         'reference': ref_num,
                         'sequence': i + 1,
-                    }))
-                
-                shipment.write({'package_ids': packages})
+                    })
+        
+        self.env['delivery.shipment.package'].create(package_vals)
+        
+        # Set main GAB to first package GAB for backward compatibility,
+        # flushed as one UPDATE
+        for shipment, gab in main_gabs.items():
+            shipment.gab = gab
+
+    @api.model
+    def _allocate_gabs(self, count):
+        """Reserve `count` GAB barcodes from the barcode sequence in one block.
+        :return: list of GAB numbers, e.g. ['LI000006399MA', ...]
+        """
+        if not count:
+            return []
+        numbers = self._next_sequence_chars('delivery.shipment.barcode', count)
+        if not numbers:
+            return ['LI000000001MA'] * count
+        return [f'LI{number}MA' for number in numbers]
+
+    @api.model
+    def _next_sequence_chars(self, code, count):
+        """Next `count` values of the sequence with `code`, reserved in one block.
+        :return: list of formatted values, empty when there is no such sequence
+        """
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', code),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return []
+        if sequence.use_date_range:
+            # Numbers depend on the date range, keep the standard allocation
+            return [sequence.next_by_id() for i in range(count)]
+        return [sequence.get_next_char(number)
+                for number in self._reserve_sequence_numbers(sequence, count)]
+
+    @api.model
+    def _reserve_sequence_numbers(self, sequence, count):
+        """Reserve `count` numbers of an ir.sequence in one query.
+        - Standard: `count` values of its PostgreSQL sequence
+        - No gap: a contiguous block, its row staying locked until commit
+        """
+        if sequence.implementation == 'standard':
+            self.env.cr.execute("SELECT nextval(%s) FROM generate_series(1, %s)",
+                                [f'ir_sequence_{sequence.id:03d}', count])
+            return [row[0] for row in self.env.cr.fetchall()]
+        sequence.flush_recordset(['number_next', 'number_increment'])
+        self.env.cr.execute("""
+            UPDATE ir_sequence
+               SET number_next = number_next + number_increment * %s
+             WHERE id = %s
+         RETURNING number_next, number_increment
+        """, [count, sequence.id])
+        number_next, increment = self.env.cr.fetchone()
+        sequence.invalidate_recordset(['number_next'])
+        first = number_next - increment * count
+        return [first + increment * i for i in range(count)]
+
+    def action_send_to_provider(self):
+        """Submit shipments to their delivery company API in one batch per company."""
+        shipments = self.filtered(lambda s: s.provider_state != 'sent' and s.state != 'cancelled')
+        if not shipments:
+            raise UserError(_("All selected shipments are already sent or cancelled."))
+        results = {}
+        for company, company_shipments in shipments.grouped('delivery_company_id').items():
+            results.update(company.create_shipments(company_shipments))
+        
+        failed = shipments.filtered(lambda s: not results[s.id]['success'])
+        message = _("%(sent)s shipment(s) sent, %(failed)s failed.",
+                    sent=len(shipments) - len(failed), failed=len(failed))
+        if failed:
+            message += '\n' + '\n'.join(
+                f"{shipment.name}: {results[shipment.id].get('error')}" for shipment in failed)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Send to Provider'),
+                'message': message,
+                'type': 'warning' if failed else 'success',
+                'sticky': bool(failed),
+            },
+        }
+
+    def action_send_to_provider_queued(self):
+        """Queue the submission of the shipments, one background job per delivery company."""
+        shipments = self.filtered(lambda s: s.provider_state != 'sent' and s.state != 'cancelled')
+        if not shipments:
+            raise UserError(_("All selected shipments are already sent or cancelled."))
+        for company, company_shipments in shipments.grouped('delivery_company_id').items():
+            self.env['delivery.job']._enqueue(
+                company_shipments, '_send_to_provider_job', delivery_company=company,
+                name=_("Send %(count)s shipment(s) to %(company)s",
+                       count=len(company_shipments), company=company.name))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Send to Provider'),
+                'message': _("%s shipment(s) queued, see Delivery Jobs for the progress.",
+                             len(shipments)),
+                'type': 'info',
+                'sticky': False,
+            },
+        }
+
+    def _send_to_provider_job(self):
+        """Delivery job: submit the shipments not sent yet. Reported as failed, and so
+        retried later, only when none could be sent, e.g. during a carrier outage."""
+        shipments = self.filtered(lambda s: s.provider_state != 'sent' and s.state != 'cancelled')
+        if not shipments:
+            return {'sent': 0, 'failed': 0}
+        results = shipments.delivery_company_id.create_shipments(shipments)
+        sent = [shipment_id for shipment_id, result in results.items() if result['success']]
+        if not sent:
+            return {
+                'success': False,
+                'error': next(iter(results.values())).get('error'),
+            }
+        return {'sent': len(sent), 'failed': len(results) - len(sent)}
+
+    def action_refresh_tracking(self):
+        """Refresh tracking of the shipments now, ignoring the freshness window."""
+        shipments = self.filtered(lambda s: s.state in TRACKED_STATES and s._get_tracking_number())
+        if not shipments:
+            raise UserError(_("No confirmed or in transit shipment with a tracking number selected."))
+        shipments._sync_tracking()
+
+    @api.model
+    def _cron_sync_tracking(self):
+        """Scheduler: refresh tracking of confirmed and in transit shipments whose last
+        check is older than the freshness window, oldest check first."""
+        param = self.env['ir.config_parameter'].sudo()
+        freshness = int(param.get_param('delivery_shipment.tracking_freshness_minutes') or 120)
+        batch_size = int(param.get_param('delivery_shipment.tracking_batch_size') or 500)
+        shipments = self.search([
+            ('state', 'in', TRACKED_STATES),
+            ('gab', '!=', False),
+            '|', ('tracking_last_check', '=', False),
+            ('tracking_last_check', '<', fields.Datetime.now() - timedelta(minutes=freshness)),
+        ], order='tracking_last_check asc nulls first, id', limit=batch_size)
+        shipments._sync_tracking()
+
+    def _sync_tracking(self):
+        """Track shipments with one concurrent batch per delivery company."""
+        for company, shipments in self.grouped('delivery_company_id').items():
+            try:
+                company.track_shipments(shipments)
+            except UserError as e:
+                # Provider without tracking support, mark the shipments as checked so
+                # they wait for the next freshness window instead of filling every batch
+                _logger.warning("Tracking sync skipped for %s: %s", company.name, e)
+                shipments.write({'tracking_last_check': fields.Datetime.now()})
+
+    def _get_tracking_number(self):
+        """Tracking number of the shipment at the delivery company."""
+        self.ensure_one()
+        return self.gab or self.reference or False
+
+    def _write_tracking_results(self, results):
+        """Write tracking results back: new events in one create, state and last
+        status with one write per distinct value.
+        :param results: {shipment id: {'success': bool, 'status': str, 'events': list}}
+        """
+        self.filtered(lambda s: s.id in results).write({
+            'tracking_last_check': fields.Datetime.now(),
+        })
+        event_vals = []
+        states = {}
+        statuses = {}
+        for shipment in self:
+            result = results.get(shipment.id) or {}
+            if not result.get('success') or not result.get('events'):
+                continue
+            known = {(event.date, event.status) for event in shipment.tracking_event_ids}
+            for event in result['events']:
+                if (event['date'] or False, event['status']) in known:
+                    continue
+                event_vals.append({
+                    'shipment_id': shipment.id,
+                    'date': event['date'],
+                    'status': event['status'],
+                    'location': event['location'],
+                })
+            last_status = result['events'][-1]['status']
+            if shipment.tracking_status != last_status:
+                statuses.setdefault(last_status, []).append(shipment.id)
+            state = result.get('status')
+            if state and state != shipment.state:
+                states.setdefault(state, []).append(shipment.id)
+        
+        if event_vals:
+            self.env['delivery.shipment.tracking.event'].create(event_vals)
+        for status, shipment_ids in statuses.items():
+            self.browse(shipment_ids).write({'tracking_status': status})
+        for state, shipment_ids in states.items():
+            vals = {'state': state}
+            if state == 'delivered':
+                vals['delivery_date'] = fields.Date.today()
+            self.browse(shipment_ids).write(vals)
+
+    def _get_provider_shipment_data(self):
+        """Shipment payload sent to the delivery company API."""
+        self.ensure_one()
+        partner = self.partner_id
+        return {
+            'reference': self.name,
+            'barcode': self.gab or False,
+            'packages': [package.gab or package.reference for package in self.package_ids],
+            'recipient_name': partner.name or '',
+            'recipient_address': ', '.join(filter(None, [partner.street, partner.street2])),
+            'recipient_zip': partner.zip or '',
+            'recipient_city': partner.city or '',
+            'recipient_phone': self.ms_destinataire or '',
+            'nbr_colis': self.nbr_colis,
+            'weight': self.weight,
+            'declared_value': self.vd,
+            'cod_amount': self.crbt_espece,
+            'cod_cheque': self.crbt_cheque or '',
+            'transport_nature': self.transport_nature,
+            'description': self.pod or '',
+            'is_fragile': self.is_fragile,
+            'relay_point_code': self.code_point_relais or '',
+        }
+
+    def _write_provider_results(self, results):
+        """Write provider submission results back, one write per outcome.
+        :param results: {shipment id: {'success': bool, 'error': str}}
+        """
+        sent = self.filtered(lambda s: results.get(s.id, {}).get('success'))
+        sent.write({
+            'provider_state': 'sent',
+            'provider_error': False,
+            'provider_sent_date': fields.Datetime.now(),
+        })
+        failed = (self - sent).filtered(lambda s: s.id in results)
+        for error, shipments in failed.grouped(lambda s: results[s.id].get('error')).items():
+            shipments.write({
+                'provider_state': 'error',
+                'provider_error': error,
+            })
 
     def action_clear_barcodes(self):
         """Clear all package barcodes."""
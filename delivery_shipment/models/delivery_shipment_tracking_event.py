@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields
+
+
+class DeliveryShipmentTrackingEvent(models.Model):
+    _name = 'delivery.shipment.tracking.event'
+    _description = 'Shipment Tracking Event'
+    _order = 'date desc, id desc'
+
+    shipment_id = fields.Many2one(
+        'delivery.shipment',
+        string='Shipment',
+        required=True,
+        index=True,
+        ondelete='cascade',
+    )
+    
+    date = fields.Datetime(
+        string='Date',
+    )
+    
+    status = fields.Char(
+        string='Status',
+        required=True,
+    )
+    
+    location = fields.Char(
+        string='Location',
+    )
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api, _
+from odoo.exceptions import UserError
 
 
 class StockPicking(models.Model):
@@ -26,36 +27,39 @@ class StockPicking(models.Model):
                 not picking.shipment_id
             )
 
-    def _get_sale_order(self):
-        """Get the sale order linked to this picking."""
+    def _prepare_shipment_vals(self, sale_order):
+        """Values of the shipment of this delivery order."""
         self.ensure_one()
-        if self.group_id and hasattr(self.group_id, 'sale_id') and self.group_id.sale_id:
-            return self.group_id.sale_id
-        if self.origin:
-            sale_order = self.env['sale.order'].search([('name', '=', self.origin)], limit=1)
-            if sale_order:
-                return sale_order
-        return False
-
-    def _create_shipment(self):
-        """Create a shipment record for this delivery order."""
-        self.ensure_one()
-        if self.shipment_id:
-            return self.shipment_id
-            
-        sale_order = self._get_sale_order()
-        
-        shipment_vals = {
+        return {
             'picking_id': self.id,
             'delivery_company_id': self.delivery_company_id.id,
             'nbr_colis': sale_order.nbr_colis if sale_order else 1,
             'shipping_payment_method': sale_order.shipping_payment_method if sale_order else 'cash',
             'transport_nature': sale_order.transport_nature if sale_order else 'standard',
         }
-        
-        shipment = self.env['delivery.shipment'].create(shipment_vals)
-        self.shipment_id = shipment
-        return shipment
+
+    def _create_shipment(self):
+        """Create a shipment record for this delivery order."""
+        self.ensure_one()
+        return self._create_shipments()
+
+    def _create_shipments(self, generate_barcode=False):
+        """
+        Create the shipments of the delivery orders without one, all at once.
+        :param generate_barcode: also generate the packages of the new shipments
+        :return: shipments of the delivery orders
+        """
+        pickings = self.filtered(lambda p: not p.shipment_id)
+        if pickings:
+            sale_orders = pickings._get_sale_orders()
+            shipments = self.env['delivery.shipment'].create([
+                picking._prepare_shipment_vals(sale_orders[picking]) for picking in pickings
+            ])
+            for picking, shipment in zip(pickings, shipments):
+                picking.shipment_id = shipment
+            if generate_barcode:
+                shipments.action_generate_barcode()
+        return self.shipment_id
 
     def action_create_shipment(self):
         """Create a shipment from the delivery order (button action)."""
@@ -63,6 +67,22 @@ class StockPicking(models.Model):
         if not self.shipment_id:
             self._create_shipment()
 
+    def action_create_shipments(self, generate_barcode=False):
+        """Create the shipments of the selected delivery orders (mass action)."""
+        pickings = self.filtered('can_create_shipment')
+        if not pickings:
+            raise UserError(_("None of the selected transfers is a done delivery order "
+                              "with a delivery company and without shipment."))
+        shipments = pickings._create_shipments(generate_barcode=generate_barcode)
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Shipments'),
+            'res_model': 'delivery.shipment',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', shipments.ids)],
+            'target': 'current',
+        }
+
     def action_open_shipment(self):
         """Open the related shipment."""
         self.ensure_one()
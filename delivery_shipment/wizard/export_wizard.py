@@ -1,18 +1,56 @@
 # -*- coding: utf-8 -*-
+import csv
+import io
+import json
+
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
-import base64
-import io
 
 try:
     from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle
+    from openpyxl.utils import get_column_letter
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
 
+# Headers - matching Amana format
+BARID_HEADERS = ['GAB', 'ETOILE', 'CAB1', 'Nom', 'Prénom', 'Code Postal', 'Ville', 'Adresse',
+                 'MS Destinataire', 'VD', 'CRBT Espèce', 'CRBT Chèque']
+
+BARID_COLUMN_WIDTHS = [
+    35,  # GAB barcode
+    8,   # ETOILE (just *)
+    35,  # CAB1 barcode
+    15,  # Nom
+    15,  # Prénom
+    12,  # Code Postal
+    20,  # Ville
+    40,  # Adresse
+    20,  # MS Destinataire
+    12,  # VD
+    15,  # CRBT Espèce
+    15,  # CRBT Chèque
+]
+
+# Shipments loaded per chunk while writing the export
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_MIMETYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/jsonl; charset=utf-8',
+}
+
 
 class DeliveryShipmentExportWizard(models.TransientModel):
+    """
+    Export shipments for bulk import by the delivery company, one row per
+    package. Each provider type declares its layout with the methods
+    `_get_export_columns_<provider_type>` and `_iter_export_rows_<provider_type>`;
+    the rows are then written as Excel, CSV or JSON lines.
+    """
     _name = 'delivery.shipment.export.wizard'
     _description = 'Export Shipments to Excel for Barid'
 
@@ -22,194 +60,224 @@ class DeliveryShipmentExportWizard(models.TransientModel):
         default=lambda self: self._default_shipment_ids(),
     )
     
+    shipment_count = fields.Integer(
+        string='Shipments to Export',
+        compute='_compute_shipment_count',
+    )
+
+    export_format = fields.Selection([
+        ('xlsx', 'Excel (Amana)'),
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ], string='Format', default='xlsx', required=True,
+       help="Excel keeps the Amana layout with barcode font. CSV and JSON lines hold "
+            "the same columns as plain values and are much faster to produce and upload.")
+
     @api.model
     def _default_shipment_ids(self):
         """Get shipments from context (active_ids)."""
         if self.env.context.get('active_model') == 'delivery.shipment':
             return self.env.context.get('active_ids', [])
         return []
-    
-    excel_file = fields.Binary(
-        string='Excel File',
-        readonly=True,
-    )
-    
-    filename = fields.Char(
-        string='Filename',
-        readonly=True,
-    )
-    
-    state = fields.Selection([
-        ('draft', 'Draft'),
-        ('done', 'Done'),
-    ], default='draft')
+
+    @api.depends('shipment_ids')
+    def _compute_shipment_count(self):
+        for wizard in self:
+            wizard.shipment_count = len(wizard.shipment_ids)
 
     def action_export(self):
-        """Export shipments to Excel with barcodes."""
+        """
+        Export shipments with barcodes. The file is written by the export
+        controller and streamed straight to the browser, so large selections
+        are never held in memory or stored on the wizard.
+        """
         self.ensure_one()
         
-        if not OPENPYXL_AVAILABLE:
+        if self.export_format == 'xlsx' and not OPENPYXL_AVAILABLE:
             raise UserError(_("Please install openpyxl library: pip install openpyxl"))
         
         if not self.shipment_ids:
             raise UserError(_("No shipments selected for export."))
-        
+
+        provider_type = self._get_export_provider_type()
+        if self.export_format == 'xlsx' and provider_type != 'barid':
+            raise UserError(_("The Excel export only supports the Barid (Amana) layout, "
+                              "use CSV or JSON lines instead."))
+
         # Check all shipments have packages with GAB
-        missing_gab = self.shipment_ids.filtered(lambda s: not s.package_ids)
+        packaged = self.env['delivery.shipment.package']._read_group(
+            [('shipment_id', 'in', self.shipment_ids.ids)], ['shipment_id'])
+        missing_gab = self.shipment_ids - self.env['delivery.shipment'].union(
+            *[shipment for shipment, in packaged])
         if missing_gab:
             raise UserError(_(
                 "The following shipments are missing GAB barcodes:\n%s\n\n"
                 "Please generate barcodes first."
-            ) % '\n'.join(missing_gab.mapped('name')))
-        
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Barid Export"
-        
-        # Headers - matching Amana format
-        headers = ['GAB', 'ETOILE', 'CAB1', 'Nom', 'Prénom', 'Code Postal', 'Ville', 'Adresse', 'MS Destinataire', 'VD', 'CRBT Espèce', 'CRBT Chèque']
-        
-        # Style for headers
-        header_font = Font(bold=True, size=11)
-        header_alignment = Alignment(horizontal='center', vertical='center')
-        header_fill = PatternFill(start_color='93C572', end_color='93C572', fill_type='solid')  # Pistachio green
+            ) % '\n'.join(missing_gab[:50].mapped('name')))
+
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/delivery_shipment/export/{self.id}',
+            'target': 'new',
+        }
+
+    def _get_export_provider_type(self):
+        """Provider type whose layout is exported, Barid when no company is set."""
+        provider_types = set(self.shipment_ids.delivery_company_id.mapped('provider_type'))
+        if len(provider_types) > 1:
+            raise UserError(_("Export shipments of a single provider at a time."))
+        provider_type = provider_types.pop() if provider_types else 'barid'
+        if not hasattr(self, f'_iter_export_rows_{provider_type}'):
+            raise UserError(_("No export layout is available for provider '%(provider)s'.",
+                              provider=provider_type))
+        return provider_type
+
+    def _get_export_filename(self):
+        return f'{self._get_export_provider_type()}_export_{fields.Date.today()}.{self.export_format}'
+
+    def _write_export(self, output):
+        """Write the export of the wizard shipments to the binary file object output."""
+        self.ensure_one()
+        provider_type = self._get_export_provider_type()
+        columns = getattr(self, f'_get_export_columns_{provider_type}')()
+        rows = getattr(self, f'_iter_export_rows_{provider_type}')()
+        getattr(self, f'_write_export_{self.export_format}')(output, columns, rows)
+
+    # ==========================================================================
+    # Rows
+    # ==========================================================================
+    def _iter_export_packages(self):
+        """
+        Yield (shipment values, partner values, package values) for each package
+        of the wizard shipments. Shipments are read in chunks, with their partners
+        and packages fetched in bulk, and the record cache is dropped after each
+        chunk, so memory stays flat whatever the size of the selection.
+        """
+        shipment_ids = self.shipment_ids.ids
+        for start in range(0, len(shipment_ids), EXPORT_CHUNK_SIZE):
+            shipments = self.env['delivery.shipment'].browse(
+                shipment_ids[start:start + EXPORT_CHUNK_SIZE])
+            shipment_rows = shipments.read(
+                ['partner_id', 'ms_destinataire', 'vd', 'crbt_espece', 'crbt_cheque'],
+                load=None)
+            partner_ids = {row['partner_id'] for row in shipment_rows if row['partner_id']}
+            partners = {
+                partner['id']: partner
+                for partner in self.env['res.partner'].browse(partner_ids).read(
+                    ['name', 'street', 'street2', 'zip', 'city'])
+            }
+            packages = {}
+            for package in self.env['delivery.shipment.package'].search_read(
+                    [('shipment_id', 'in', shipments.ids)], ['shipment_id', 'gab', 'reference'],
+                    order='sequence, id', load=None):
+                packages.setdefault(package['shipment_id'], []).append(package)
+
+            for shipment in shipment_rows:
+                partner = partners.get(shipment['partner_id'], {})
+                for package in packages.get(shipment['id'], []):
+                    yield shipment, partner, package
+            self.env.invalidate_all()
+
+    def _get_export_columns_barid(self):
+        return BARID_HEADERS
+
+    def _iter_export_rows_barid(self):
+        """Yield the Amana columns of each package."""
+        for shipment, partner, package in self._iter_export_packages():
+            # Partner info - split name into nom/prenom
+            name_parts = (partner.get('name') or '').split(' ', 1)
+            prenom = name_parts[0] if name_parts else ''
+            nom = name_parts[1] if len(name_parts) > 1 else ''
+
+            # Address
+            address = ', '.join(filter(None, [partner.get('street'), partner.get('street2')]))
+
+            gab = package['gab'] or ''
+            yield [
+                gab,
+                # ETOILE - just an asterisk *
+                '*',
+                # CAB1 - Code 39 *GAB*
+                f'*{gab}*',
+                nom,
+                prenom,
+                partner.get('zip') or '',
+                partner.get('city') or '',
+                address,
+                shipment['ms_destinataire'] or '',
+                # VD (Valeur Déclarée)
+                shipment['vd'] or '',
+                shipment['crbt_espece'] or '',
+                shipment['crbt_cheque'] or '',
+            ]
+
+    # ==========================================================================
+    # Writers
+    # ==========================================================================
+    def _write_export_csv(self, output, columns, rows):
+        text = io.TextIOWrapper(output, encoding='utf-8-sig', newline='', write_through=True)
+        writer = csv.writer(text)
+        writer.writerow(columns)
+        writer.writerows(rows)
+        text.detach()
+
+    def _write_export_jsonl(self, output, columns, rows):
+        text = io.TextIOWrapper(output, encoding='utf-8', newline='\n', write_through=True)
+        text.writelines(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in rows)
+        text.detach()
+
+    def _write_export_xlsx(self, output, columns, rows):
+        """
+        Write the Amana Excel workbook, with the GAB and CAB1 columns in barcode font.
+
+        The workbook is write-only: rows are flushed to disk as they are appended
+        and all cells share the same named styles.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Barid Export")
+
         thin_border = Border(
             left=Side(style='thin'),
             right=Side(style='thin'),
             top=Side(style='thin'),
             bottom=Side(style='thin')
         )
-        
-        # Barcode font style (C39HrP24DhTt Code 39 font)
-        barcode_font = Font(name='C39HrP24DhTt', size=24)
-        barcode_alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Write headers
+        center = Alignment(horizontal='center', vertical='center')
+        for style in (
+            NamedStyle(name='barid_header', font=Font(bold=True, size=11), alignment=center,
+                       border=thin_border,
+                       # Pistachio green
+                       fill=PatternFill(start_color='93C572', end_color='93C572',
+                                        fill_type='solid')),
+            # Barcode font style (C39HrP24DhTt Code 39 font)
+            NamedStyle(name='barid_barcode', font=Font(name='C39HrP24DhTt', size=24),
+                       alignment=center, border=thin_border),
+            NamedStyle(name='barid_cell', alignment=center, border=thin_border),
+        ):
+            wb.add_named_style(style)
+
+        def cell(value, style='barid_cell'):
+            new_cell = WriteOnlyCell(ws, value=value)
+            new_cell.style = style
+            return new_cell
+
+        # Column widths and the header row must be set before the data rows
+        for col, width in enumerate(BARID_COLUMN_WIDTHS, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
         ws.row_dimensions[1].height = 30  # Header row height
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.alignment = header_alignment
-            cell.border = thin_border
-            cell.fill = header_fill
-        
-        # Set column widths
-        ws.column_dimensions['A'].width = 35  # GAB barcode
-        ws.column_dimensions['B'].width = 8   # ETOILE (just *)
-        ws.column_dimensions['C'].width = 35  # CAB1 barcode
-        ws.column_dimensions['D'].width = 15  # Nom
-        ws.column_dimensions['E'].width = 15  # Prénom
-        ws.column_dimensions['F'].width = 12  # Code Postal
-        ws.column_dimensions['G'].width = 20  # Ville
-        ws.column_dimensions['H'].width = 40  # Adresse
-        ws.column_dimensions['I'].width = 20  # MS Destinataire
-        ws.column_dimensions['J'].width = 12  # VD
-        ws.column_dimensions['K'].width = 15  # CRBT Espèce
-        ws.column_dimensions['L'].width = 15  # CRBT Chèque
-        
-        # Write data - one row per package (not per shipment)
-        row_idx = 2
-        for shipment in self.shipment_ids:
-            partner = shipment.partner_id
-            
-            # Partner info - split name into nom/prenom
-            full_name = partner.name or ''
-            name_parts = full_name.split(' ', 1)
-            prenom = name_parts[0] if name_parts else ''
-            nom = name_parts[1] if len(name_parts) > 1 else ''
-            
-            # Address
-            address_parts = [
-                partner.street or '',
-                partner.street2 or '',
-            ]
-            address = ', '.join(filter(None, address_parts))
-            
-            # Create one row for each package in the shipment
-            for package in shipment.package_ids:
-                # Set row height for barcode font
-                ws.row_dimensions[row_idx].height = 60
-                
-                # GAB - raw barcode value with barcode font
-                gab_cell = ws.cell(row=row_idx, column=1, value=package.gab)
-                gab_cell.font = barcode_font
-                gab_cell.alignment = barcode_alignment
-                gab_cell.border = thin_border
-                
-                # ETOILE - just an asterisk * (no barcode font)
-                etoile_cell = ws.cell(row=row_idx, column=2, value='*')
-                etoile_cell.alignment = barcode_alignment
-                etoile_cell.border = thin_border
-                
-                # CAB1 - Excel formula =CONCATENATE(B,A,B) for *GAB*
-                cab1_cell = ws.cell(row=row_idx, column=3, value=f'=CONCATENATE(B{row_idx},A{row_idx},B{row_idx})')
-                cab1_cell.font = barcode_font
-                cab1_cell.alignment = barcode_alignment
-                cab1_cell.border = thin_border
-                
-                # Center alignment for all data cells
-                cell_alignment = Alignment(horizontal='center', vertical='center')
-                
-                nom_cell = ws.cell(row=row_idx, column=4, value=nom)
-                nom_cell.border = thin_border
-                nom_cell.alignment = cell_alignment
-                
-                prenom_cell = ws.cell(row=row_idx, column=5, value=prenom)
-                prenom_cell.border = thin_border
-                prenom_cell.alignment = cell_alignment
-                
-                zip_cell = ws.cell(row=row_idx, column=6, value=partner.zip or '')
-                zip_cell.border = thin_border
-                zip_cell.alignment = cell_alignment
-                
-                city_cell = ws.cell(row=row_idx, column=7, value=partner.city or '')
-                city_cell.border = thin_border
-                city_cell.alignment = cell_alignment
-                
-                address_cell = ws.cell(row=row_idx, column=8, value=address)
-                address_cell.border = thin_border
-                address_cell.alignment = cell_alignment
-                
-                # MS Destinataire
-                ms_cell = ws.cell(row=row_idx, column=9, value=shipment.ms_destinataire or '')
-                ms_cell.border = thin_border
-                ms_cell.alignment = cell_alignment
-                
-                # VD (Valeur Déclarée)
-                vd_cell = ws.cell(row=row_idx, column=10, value=shipment.vd or '')
-                vd_cell.border = thin_border
-                vd_cell.alignment = cell_alignment
-                
-                # CRBT Espèce
-                crbt_espece_cell = ws.cell(row=row_idx, column=11, value=shipment.crbt_espece or '')
-                crbt_espece_cell.border = thin_border
-                crbt_espece_cell.alignment = cell_alignment
-                
-                # CRBT Chèque
-                crbt_cheque_cell = ws.cell(row=row_idx, column=12, value=shipment.crbt_cheque or '')
-                crbt_cheque_cell.border = thin_border
-                crbt_cheque_cell.alignment = cell_alignment
-                
-                row_idx += 1
-        
-        # Save to buffer
-        output = io.BytesIO()
+        ws.append([cell(header, 'barid_header') for header in columns])
+
+        for row_idx, row in enumerate(rows, 2):
+            # Set row height for barcode font
+            ws.row_dimensions[row_idx].height = 60
+            # CAB1 - Excel formula =CONCATENATE(B,A,B) for *GAB*
+            row[2] = f'=CONCATENATE(B{row_idx},A{row_idx},B{row_idx})'
+            ws.append([
+                cell(value, 'barid_barcode' if col in (0, 2) else 'barid_cell')
+                for col, value in enumerate(row)
+            ])
+            # Written rows no longer need their dimensions
+            del ws.row_dimensions[row_idx]
+
         wb.save(output)
-        output.seek(0)
-        
-        # Update wizard
-        self.write({
-            'excel_file': base64.b64encode(output.read()),
-            'filename': f'barid_export_{fields.Date.today()}.xlsx',
-            'state': 'done',
-        })
-        
-        # Return wizard to download file
-        return {
-            'type': 'ir.actions.act_window',
-            'res_model': self._name,
-            'res_id': self.id,
-            'view_mode': 'form',
-            'target': 'new',
-        }
@@ -17,7 +17,7 @@
     'summary': """
         Property Sale & Rental Management
     """,
-    'version': "3.2.9",
+    'version': "3.4.0",
     'author': 'TechKhedut Inc.',
     'company': 'TechKhedut Inc.',
     'maintainer': 'TechKhedut Inc.',
@@ -74,6 +74,7 @@
         'views/property_project_view.xml',
         'views/property_project_view_inherit.xml',
         'views/property_sub_project_views.xml',
+        'views/property_unit_generation_views.xml',
         'views/rent_bill_view.xml',
         'views/templates/property_web_template.xml',
         'views/property_presale_views.xml',
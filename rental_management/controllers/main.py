@@ -1,4 +1,3 @@
-import base64
 import logging
 from odoo.http import request
 from odoo import http
@@ -8,17 +7,21 @@ from odoo.tools.mimetypes import guess_mimetype
 _logger = logging.getLogger(__name__)
 
 FILE_TYPE = ['image/jpeg', 'image/png', 'image/jpg']
-
-
-def get_encoded_image(image):
-    """Get encoded Image"""
-    if not image:
+# Bytes read from an upload to detect its type
+MIMETYPE_SNIFF_SIZE = 1024
+IMAGE_SIZES = {'full': 'image', '1024': 'image_1024', '512': 'image_512', '128': 'image_128'}
+
+
+def read_uploaded_image(upload):
+    """
+    Read uploaded image, checking its type from the first bytes before reading
+    the rest of the stream
+    :return: image bytes, False when the upload is not an accepted image
+    """
+    head = upload.stream.read(MIMETYPE_SNIFF_SIZE)
+    if not head or guess_mimetype(head) not in FILE_TYPE:
         return False
-    attachment = image.read()
-    mimetype = guess_mimetype(base64.b64decode(base64.encodebytes(attachment)))
-    if mimetype in FILE_TYPE:
-        return base64.encodebytes(attachment)
-    return False
+    return head + upload.stream.read()
 
 
 # My Portal Sell and Rent Contract Count
@@ -257,14 +260,32 @@ class PropertyImageController(http.Controller):
 
     @http.route('/property/images/create', type='http', auth='public', csrf=False)
     def create_image(self, **kw):
-        """Create property image"""
+        """Create property image, its renditions are generated once in the image store"""
         if kw.get('images[]'):
-            images = request.httprequest.files.getlist('images[]')
+            images = [(image.filename, read_uploaded_image(image))
+                      for image in request.httprequest.files.getlist('images[]')]
+            images = [(filename, raw) for filename, raw in images if raw]
             if images:
-                for image in images:
-                    request.env['property.images'].sudo().create({
-                        'title': image.filename.split('.')[0],
-                        'property_id': int(kw.get('property_id')),
-                        'image': get_encoded_image(image),
-                    })
+                stores = request.env['property.image.store'].sudo()._get_or_create_raw(
+                    [raw for filename, raw in images])
+                request.env['property.images'].sudo().create([{
+                    'title': filename.split('.')[0],
+                    'property_id': int(kw.get('property_id')),
+                    'image_store_id': store.id,
+                } for (filename, raw), store in zip(images, stores)])
         return request.redirect(kw.get('url'))
+
+    @http.route('/property/image/<string:checksum>/<string:size>', type='http', auth='public')
+    def property_image(self, checksum, size='full', **kw):
+        """
+        Stored gallery image or one of its renditions. The URL holds the checksum of
+        the image, so the response never changes and is cached for good.
+        """
+        if size not in IMAGE_SIZES:
+            raise request.not_found()
+        store = request.env['property.image.store'].sudo().search(
+            [('checksum', '=', checksum)], limit=1)
+        if not store:
+            raise request.not_found()
+        stream = request.env['ir.binary']._get_image_stream_from(store, IMAGE_SIZES[size])
+        return stream.get_response(max_age=http.STATIC_CACHE_LONG, immutable=True)
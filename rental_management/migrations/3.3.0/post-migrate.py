@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020-Today TechKhedut.
+# Part of TechKhedut. See LICENSE file for full copyright and licensing details.
+from odoo import SUPERUSER_ID, api
+
+OBSOLETE_RECURRING_CRONS = [
+    'rental_management.rent_recurring_invoice',
+    'rental_management.rent_recurring_invoice_quarterly',
+    'rental_management.rent_contract_half_year_installment_recurring',
+    'rental_management.rent_recurring_invoice_yearly',
+]
+
+
+def migrate(cr, version):
+    """
+    Remove the per payment term recurring invoice schedulers, replaced by the
+    unified 'rent_recurring_invoice_scheduler' cron.
+    """
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    for xml_id in OBSOLETE_RECURRING_CRONS:
+        cron = env.ref(xml_id, raise_if_not_found=False)
+        if cron:
+            cron.unlink()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020-Today TechKhedut.
+# Part of TechKhedut. See LICENSE file for full copyright and licensing details.
+
+
+def migrate(cr, version):
+    """
+    Create and backfill the stored 'end_date' column of tenancy.details and the map
+    coordinates of property.details in bulk. The columns are created before the
+    registry loads, so the ORM does not recompute every record one by one.
+    """
+    # Mirrors TenancyDetails._compute_end_date
+    cr.execute("""
+        ALTER TABLE tenancy_details
+        ADD COLUMN IF NOT EXISTS end_date date
+    """)
+    cr.execute("""
+        UPDATE tenancy_details td
+           SET end_date = CASE
+               WHEN td.duration_type = 'by_date' THEN td.duration_end_date
+               WHEN td.duration_type = 'by_duration' AND td.start_date IS NOT NULL THEN (
+                   td.start_date
+                   + CASE
+                       WHEN COALESCE(td.final_rent_unit, pd.rent_unit) = 'Day'
+                           THEN make_interval(days => COALESCE(cd.month, 0))
+                       WHEN COALESCE(td.final_rent_unit, pd.rent_unit) = 'Year'
+                            OR td.payment_term = 'year'
+                           THEN make_interval(years => COALESCE(cd.month, 0))
+                       ELSE make_interval(months => COALESCE(cd.month, 0))
+                     END
+                   - INTERVAL '1 day')::date
+           END
+          FROM tenancy_details src
+     LEFT JOIN contract_duration cd ON cd.id = src.duration_id
+     LEFT JOIN property_details pd ON pd.id = src.property_id
+         WHERE src.id = td.id
+    """)
+    # Numeric map coordinates of property.details, mirrors
+    # PropertyDetails._compute_map_coordinates
+    cr.execute("""
+        ALTER TABLE property_details
+        ADD COLUMN IF NOT EXISTS map_latitude double precision,
+        ADD COLUMN IF NOT EXISTS map_longitude double precision
+    """)
+    cr.execute("""
+        UPDATE property_details
+           SET map_latitude = CASE WHEN valid THEN latitude::double precision ELSE 0.0 END,
+               map_longitude = CASE WHEN valid THEN longitude::double precision ELSE 0.0 END
+          FROM (SELECT id AS src_id,
+                       latitude ~ '^\\s*-?[0-9]+(\\.[0-9]+)?\\s*$'
+                       AND longitude ~ '^\\s*-?[0-9]+(\\.[0-9]+)?\\s*$' AS valid
+                  FROM property_details) src
+         WHERE src.src_id = property_details.id
+    """)
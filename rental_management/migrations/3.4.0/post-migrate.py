@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020-Today TechKhedut.
+# Part of TechKhedut. See LICENSE file for full copyright and licensing details.
+from odoo import api, SUPERUSER_ID
+
+GALLERY_MODELS = {
+    'property.images': 'property_images',
+    'project.images.line': 'project_images_line',
+    'subproject.images.line': 'subproject_images_line',
+    'floor.plan': 'floor_plan',
+}
+
+
+def migrate(cr, version):
+    """
+    Move gallery images to the image store. Images with the same checksum are
+    collapsed into one stored image: one of their attachments is kept for the
+    store, gallery lines point to it and the duplicate attachments are dropped.
+    Duplicates share the same file in the filestore, so no file is left behind.
+    The renditions of the stored images are then generated once.
+    """
+    # One stored image per checksum
+    cr.execute("""
+        INSERT INTO property_image_store (checksum, file_size, create_uid, create_date,
+                                          write_uid, write_date)
+        SELECT DISTINCT ON (checksum) checksum, file_size, 1, now() at time zone 'UTC',
+               1, now() at time zone 'UTC'
+          FROM ir_attachment
+         WHERE res_model IN %s
+           AND res_field = 'image'
+           AND checksum IS NOT NULL
+      ORDER BY checksum, id
+            ON CONFLICT (checksum) DO NOTHING
+    """, [tuple(GALLERY_MODELS)])
+    # Gallery lines point to the stored image of their attachment
+    for model, table in GALLERY_MODELS.items():
+        cr.execute(f"""
+            UPDATE {table} line
+               SET image_store_id = store.id
+              FROM ir_attachment att
+              JOIN property_image_store store ON store.checksum = att.checksum
+             WHERE att.res_model = %s
+               AND att.res_field = 'image'
+               AND att.res_id = line.id
+        """, [model])
+    # Keep the oldest attachment of each checksum for stored images without one
+    cr.execute("""
+        UPDATE ir_attachment att
+           SET res_model = 'property.image.store',
+               res_id = store.id
+          FROM property_image_store store,
+               (SELECT DISTINCT ON (checksum) id, checksum
+                  FROM ir_attachment
+                 WHERE res_model IN %s
+                   AND res_field = 'image'
+              ORDER BY checksum, id) kept
+         WHERE att.id = kept.id
+           AND store.checksum = kept.checksum
+           AND NOT EXISTS (SELECT 1
+                             FROM ir_attachment stored
+                            WHERE stored.res_model = 'property.image.store'
+                              AND stored.res_field = 'image'
+                              AND stored.res_id = store.id)
+    """, [tuple(GALLERY_MODELS)])
+    cr.execute("""
+        DELETE FROM ir_attachment
+         WHERE res_model IN %s
+           AND res_field = 'image'
+    """, [tuple(GALLERY_MODELS)])
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['property.image.store'].search([]).modified(['image'])
+    env.flush_all()
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 # Copyright 2020-Today TechKhedut.
 # Part of TechKhedut. See LICENSE file for full copyright and licensing details.
+from . import rental_cron
+from . import rental_dashboard
+from . import rental_counter
+from . import property_image_store
 from . import property_details
 from . import property_presale
 from . import res_partner
@@ -13,6 +17,7 @@ from . import crm_lead
 from . import property_region
 from . import property_project
 from . import property_sub_project
+from . import property_unit_generation
 from . import rent_bill
 from . import ir_ui_view
 from . import ir_action
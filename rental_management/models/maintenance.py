@@ -147,17 +147,19 @@ class PropertyMaintenance(models.Model):
 
     def _compute_invoice_count(self):
         """Compute invoice count"""
+        counts = self.env['rental.counter']._read_counts(
+            self, 'account.move', 'maintenance_request_id', [('move_type', '=', 'out_invoice')],
+            aggregate='maintenance_request_id:count_distinct', sudo=True)
         for rec in self:
-            rec.invoice_count = len(self.env['account.move'].sudo().search(
-                [('maintenance_request_id', 'in', [rec.id]),
-                 ('move_type', '=', 'out_invoice')]).mapped('maintenance_request_id').mapped('id'))
+            rec.invoice_count = counts[rec._origin.id]
 
     def _compute_bill_count(self):
         """Compute bill count"""
+        counts = self.env['rental.counter']._read_counts(
+            self, 'account.move', 'maintenance_request_id', [('move_type', '=', 'in_invoice')],
+            aggregate='maintenance_request_id:count_distinct', sudo=True)
         for rec in self:
-            rec.bill_count = len(self.env['account.move'].sudo().search(
-                [('maintenance_request_id', 'in', [rec.id]),
-                 ('move_type', '=', 'in_invoice')]).mapped('maintenance_request_id').mapped('id'))
+            rec.bill_count = counts[rec._origin.id]
 
     def action_view_invoice(self):
         """View Invoices"""
@@ -8,6 +8,16 @@ from odoo.exceptions import ValidationError
 from odoo.addons.web_editor.tools import get_video_embed_code, get_video_thumbnail
 
 
+# Fields counted by the rental dashboards
+DASHBOARD_FIELDS = {'stage', 'type', 'sale_lease', 'company_id', 'latitude', 'longitude'}
+
+# Map data : cluster cell size in degrees at zoom 1, zoom from which markers are not
+# clustered and maximum number of markers returned
+MAP_CLUSTER_CELL = 8.0
+MAP_CLUSTER_MAX_ZOOM = 16
+MAP_MARKER_LIMIT = 2000
+
+
 def is_float(str_vals):
     """Check if string is Float or not
     :param str_vals: String
@@ -93,6 +103,10 @@ class PropertyDetails(models.Model):
     # Lat Long
     longitude = fields.Char(string='Longitude')
     latitude = fields.Char(string='Latitude')
+    map_longitude = fields.Float(string='Map Longitude', compute='_compute_map_coordinates',
+                                 store=True)
+    map_latitude = fields.Float(string='Map Latitude', compute='_compute_map_coordinates',
+                                store=True)
 
     # Owner Details
     landlord_id = fields.Many2one('res.partner',
@@ -288,8 +302,20 @@ class PropertyDetails(models.Model):
                 vals['property_seq'] = self.env['ir.sequence'].next_by_code(
                     'property.details') or ''
         res = super(PropertyDetails, self).create(vals_list)
+        self.env['rental.dashboard.cache']._invalidate()
         return res
 
+    def write(self, vals):
+        """Invalidate dashboard snapshots when a dashboard counter changes"""
+        if DASHBOARD_FIELDS.intersection(vals):
+            self.env['rental.dashboard.cache']._invalidate()
+        return super().write(vals)
+
+    def unlink(self):
+        """Invalidate dashboard snapshots"""
+        self.env['rental.dashboard.cache']._invalidate()
+        return super().unlink()
+
     # Stage Expand
     @api.model
     def _expand_groups(self, states, domain):
@@ -304,6 +330,55 @@ class PropertyDetails(models.Model):
                 raise ValidationError(
                     _("You can't delete property until status is in 'Draft' or 'Available'"))
 
+    # Project Statics
+    @api.model
+    def _get_project_statics(self, group_field, group_ids, subproject_only=()):
+        """
+        Unit statics of projects or subprojects, computed for all of them with one
+        grouped query on units and one batch of sale and rent contracts
+        :param group_field: 'property_project_id' or 'subproject_id'
+        :param group_ids: ids of projects or subprojects
+        :param subproject_only: ids of projects counting only the units of their
+            subprojects
+        :return: {group id: {'for_sale' or 'for_tenancy': {field: amount}}}, amounts
+            of total_area, available_area, total_values, total_maintenance,
+            total_collection and scope_of_collection
+        """
+        statics = {group_id: {sale_lease: dict.fromkeys(
+            ['total_area', 'available_area', 'total_values', 'total_maintenance',
+             'total_collection', 'scope_of_collection'], 0.0)
+            for sale_lease in ('for_sale', 'for_tenancy')} for group_id in group_ids}
+        if not group_ids:
+            return statics
+        groupby = [group_field, 'sale_lease', 'stage', 'is_maintenance_service']
+        if subproject_only:
+            groupby.append('subproject_id')
+        for group, sale_lease, stage, is_maintenance_service, *subproject, total_area, \
+                price, total_maintenance in self.sudo()._read_group(
+                    [(group_field, 'in', group_ids)], groupby,
+                    ['total_area:sum', 'price:sum', 'total_maintenance:sum']):
+            if not sale_lease or (group.id in subproject_only and
+                                   subproject[0].property_project_id != group):
+                continue
+            vals = statics[group.id][sale_lease]
+            vals['total_area'] += total_area
+            vals['total_values'] += price
+            if stage == 'available':
+                vals['available_area'] += total_area
+            if is_maintenance_service:
+                vals['total_maintenance'] += total_maintenance
+        # Collections of every contract of the units, whatever the unit is for
+        contract_domain = [(f'property_id.{group_field}', 'in', group_ids)]
+        for sale in self.env['property.vendor'].sudo().search(contract_domain):
+            vals = statics[sale.property_id[group_field].id]['for_sale']
+            vals['total_collection'] += sale.paid_amount
+            vals['scope_of_collection'] += sale.remaining_amount
+        for tenancy in self.env['tenancy.details'].sudo().search(contract_domain):
+            vals = statics[tenancy.property_id[group_field].id]['for_tenancy']
+            vals['total_collection'] += tenancy.paid_tenancy
+            vals['scope_of_collection'] += tenancy.remain_tenancy
+        return statics
+
     # Scheduler
     @api.model
     def update_property_measurement(self):
@@ -328,11 +403,11 @@ class PropertyDetails(models.Model):
     @api.depends('sale_lease')
     def _compute_lead(self):
         """Compute property lead"""
+        counts = self.env['rental.counter']._read_counts(
+            self, 'crm.lead', 'property_id', groupby='type')
         for rec in self:
-            rec.lead_count = self.env['crm.lead'].search_count(
-                [('property_id', 'in', [rec.id]), ('type', '=', 'lead')])
-            rec.lead_opp_count = self.env['crm.lead'].search_count(
-                [('property_id', 'in', [rec.id]), ('type', '=', 'opportunity')])
+            rec.lead_count = counts[rec._origin.id, 'lead']
+            rec.lead_opp_count = counts[rec._origin.id, 'opportunity']
 
     # Utility Service Total
     @api.depends('extra_service_ids')
@@ -349,42 +424,45 @@ class PropertyDetails(models.Model):
     # Document Count
     def _compute_document_count(self):
         """Compute property document count"""
+        counts = self.env['rental.counter']._read_counts(
+            self, 'property.documents', 'property_id')
         for rec in self:
-            document_count = self.env['property.documents'].search_count(
-                [('property_id', 'in', [rec.id])])
-            rec.document_count = document_count
+            rec.document_count = counts[rec._origin.id]
 
     # Booking Count
     def _compute_booking_count(self):
         """Compute property booking count"""
+        counter = self.env['rental.counter']
+        tenancy_counts = counter._read_counts(self, 'tenancy.details', 'property_id')
+        increment_counts = counter._read_counts(self, 'increment.history', 'property_id')
+        vendor_counts = counter._read_counts(self, 'property.vendor', 'property_id')
         for rec in self:
-            count = self.sold_booking_id.book_price
-            rec.booking_count = count
-            rec.tenancy_count = self.env['tenancy.details'].search_count(
-                [('property_id', 'in', [rec.id])])
-            rec.increment_history_count = self.env['increment.history'].search_count(
-                [('property_id', 'in', [rec.id])])
-            rec.vendor_count = self.env['property.vendor'].search_count(
-                [('property_id', 'in', [rec.id])])
+            rec.booking_count = rec.sold_booking_id.book_price
+            rec.tenancy_count = tenancy_counts[rec._origin.id]
+            rec.increment_history_count = increment_counts[rec._origin.id]
+            rec.vendor_count = vendor_counts[rec._origin.id]
 
     # Maintenance Request Count
     def _compute_request_count(self):
+        """Compute maintenance request count"""
+        counts = self.env['rental.counter']._read_counts(
+            self, 'maintenance.request', 'property_id')
         for rec in self:
-            """Compute maintenance request count"""
-            request_count = self.env['maintenance.request'].search_count(
-                [('property_id', 'in', [rec.id])])
-            rec.request_count = request_count
+            rec.request_count = counts[rec._origin.id]
 
     # Count
     def compute_count(self):
         """Compute Count"""
+        counter = self.env['rental.counter']
+        broker_domain = [('is_any_broker', '=', True)]
+        sale_counts = counter._read_counts(self, 'property.vendor', 'property_id', broker_domain,
+                                           aggregate='broker_id:count_distinct', sudo=True)
+        tenancy_counts = counter._read_counts(self, 'tenancy.details', 'property_id',
+                                              broker_domain,
+                                              aggregate='broker_id:count_distinct', sudo=True)
         for rec in self:
-            rec.sale_broker_count = len(self.env['property.vendor'].sudo(
-            ).search([('property_id', 'in', [rec.id]), ('is_any_broker', '=', True)]).mapped(
-                'broker_id').mapped('id'))
-            rec.tenancy_broker_count = len(self.env['tenancy.details'].sudo(
-            ).search([('property_id', 'in', [rec.id]), ('is_any_broker', '=', True)]).mapped(
-                'broker_id').mapped('id'))
+            rec.sale_broker_count = sale_counts[rec._origin.id]
+            rec.tenancy_broker_count = tenancy_counts[rec._origin.id]
 
     # Onchange
     # Area Wise Price
@@ -437,6 +515,21 @@ class PropertyDetails(models.Model):
         if self.state_id.country_id:
             self.country_id = self.state_id.country_id
 
+    def init(self):
+        """Index of map coordinates, used by map data viewport queries"""
+        tools.create_index(self._cr, 'property_details_map_coordinates_index',
+                           self._table, ['map_latitude', 'map_longitude'])
+
+    # Compute
+    @api.depends('latitude', 'longitude')
+    def _compute_map_coordinates(self):
+        """Numeric coordinates of property for map data queries"""
+        for rec in self:
+            valid = (rec.latitude and is_float(rec.latitude)
+                     and rec.longitude and is_float(rec.longitude))
+            rec.map_latitude = float(rec.latitude) if valid else 0.0
+            rec.map_longitude = float(rec.longitude) if valid else 0.0
+
     @api.constrains('longitude', 'latitude')
     def _check_longitude_latitude_values(self):
         """
@@ -659,100 +752,97 @@ class PropertyDetails(models.Model):
     # DashBoard
     @api.model
     def get_property_stats(self):
-        """Get dashboard statics"""
+        """Get dashboard statics from the company dashboard snapshot"""
+        return self.env['rental.dashboard.cache']._get_snapshot(
+            'property_stats', self._get_property_stats)
+
+    @api.model
+    def _get_property_stats(self):
+        """Compute dashboard statics, aggregated with one grouped query per model"""
         company_domain = [('company_id', 'in', self.env.companies.ids)]
-        # Property Stages
-        property = self.env['property.details']
-        avail_property = property.sudo().search_count(
-            [('stage', '=', 'available')] + company_domain)
-        booked_property = property.sudo().search_count(
-            [('stage', '=', 'booked')] + company_domain)
-        lease_property = property.sudo().search_count(
-            [('stage', '=', 'on_lease')] + company_domain)
-        sale_property = property.sudo().search_count([('stage', '=', 'sale')] + company_domain)
-        sold_property = property.sudo().search_count([('stage', '=', 'sold')] + company_domain)
         currency_symbol = self.env.company.currency_id.symbol
-        land_property = property.sudo().search_count([('type', '=', 'land')] + company_domain)
-        residential_property = property.sudo().search_count(
-            [('type', '=', 'residential')] + company_domain)
-        commercial_property = property.sudo().search_count(
-            [('type', '=', 'commercial')] + company_domain)
-        industrial_property = property.sudo().search_count(
-            [('type', '=', 'industrial')] + company_domain)
+        # Property Stages & Types
+        property_stage_count = {}
+        property_type_count = {}
+        total_property = 0
+        for stage, property_type, count in self.env['property.details'].sudo()._read_group(
+                company_domain, ['stage', 'type'], ['__count']):
+            property_stage_count[stage] = property_stage_count.get(stage, 0) + count
+            property_type_count[property_type] = property_type_count.get(property_type, 0) + count
+            total_property += count
         property_type = [['Land', 'Residential', 'Commercial', 'Industrial'],
-                         [land_property, residential_property, commercial_property,
-                          industrial_property]]
+                         [property_type_count.get('land', 0),
+                          property_type_count.get('residential', 0),
+                          property_type_count.get('commercial', 0),
+                          property_type_count.get('industrial', 0)]]
         property_stage = [
             ['Available Properties', 'Sold Properties', 'Booked Properties', 'On Sale', 'On Lease'],
-            [avail_property, sold_property, booked_property, sale_property, lease_property]]
+            [property_stage_count.get('available', 0), property_stage_count.get('sold', 0),
+             property_stage_count.get('booked', 0), property_stage_count.get('sale', 0),
+             property_stage_count.get('on_lease', 0)]]
 
         # Rent Contract
-        rent_contract = self.env['tenancy.details'].sudo()
-        draft_contract = rent_contract.search_count(
-            [('contract_type', '=', 'new_contract')] + company_domain)
-        running_contract = rent_contract.search_count(
-            [('contract_type', '=', 'running_contract')] + company_domain)
-        expire_contract = rent_contract.search_count(
-            [('contract_type', '=', 'expire_contract')] + company_domain)
-        extend_contract = rent_contract.search_count(
-            [('is_extended', '=', True)] + company_domain)
-        close_contract = rent_contract.search_count(
-            [('contract_type', '=', 'close_contract')] + company_domain)
-        full_tenancy_total = sum(self.env['rent.invoice'].search(
-            ['|', ('type', '=', 'rent'), ('type', '=', 'full_rent')] + company_domain).mapped(
-            'rent_invoice_id').mapped(
-            'amount_total'))
-        pending_invoice = self.env['rent.invoice'].search_count(
-            [('payment_state', '=', 'not_paid')] + company_domain)
+        contract_count = {}
+        extend_contract = 0
+        for contract_type, is_extended, count in self.env['tenancy.details'].sudo()._read_group(
+                company_domain, ['contract_type', 'is_extended'], ['__count']):
+            contract_count[contract_type] = contract_count.get(contract_type, 0) + count
+            if is_extended:
+                extend_contract += count
+        rent_invoice_domain = [('rent_invoice_ids', 'any', company_domain)]
+        [[full_tenancy_total]] = self.env['account.move'].sudo()._read_group(
+            [('rent_invoice_ids', 'any',
+              [('type', 'in', ['rent', 'full_rent'])] + company_domain)],
+            [], ['amount_total:sum'])
+        [[pending_invoice]] = self.env['account.move'].sudo()._read_group(
+            rent_invoice_domain + [('payment_state', '=', 'not_paid')], [], ['__count'])
 
         # Sale Contract
-        sale_contract = self.env['property.vendor'].sudo()
-        booked = sale_contract.search_count([('stage', '=', 'booked')] + company_domain)
-        sale_sold = sale_contract.search_count([('stage', '=', 'sold')] + company_domain)
-        refund = sale_contract.search_count([('stage', '=', 'refund')] + company_domain)
-        sold_total = sum(
-            sale_contract.search([('stage', '=', 'sold')] + company_domain).mapped('sale_price'))
+        sale_count = {}
+        sold_total = 0.0
+        for stage, count, sale_price in self.env['property.vendor'].sudo()._read_group(
+                company_domain, ['stage'], ['__count', 'sale_price:sum']):
+            sale_count[stage] = count
+            if stage == 'sold':
+                sold_total = sale_price or 0.0
         pending_invoice_sale = self.env['account.move'].search_count(
             [('sold_id', '!=', False), ('payment_state', '=', 'not_paid')] + company_domain)
 
-        # Region, Project, Sub Project, Properties
+        # Region, Project, Sub Project
         region_count = self.env['property.region'].search_count([])
         project_count = self.env['property.project'].search_count(company_domain)
         subproject_count = self.env['property.sub.project'].search_count(company_domain)
-        total_property = property.search_count(company_domain)
 
         # Customer & Landlord
-        customer_count = self.env['res.partner'].sudo(
-        ).search_count([('user_type', '=', 'customer')])
-        landlord_count = self.env['res.partner'].sudo(
-        ).search_count([('user_type', '=', 'landlord')])
+        partner_count = dict(self.env['res.partner'].sudo()._read_group(
+            [('user_type', 'in', ['customer', 'landlord'])], ['user_type'], ['__count']))
 
         return {
             # Property
-            'avail_property': avail_property,
-            'booked_property': booked_property,
-            'lease_property': lease_property,
-            'sale_property': sale_property,
-            'sold_property': sold_property,
+            'avail_property': property_stage_count.get('available', 0),
+            'booked_property': property_stage_count.get('booked', 0),
+            'lease_property': property_stage_count.get('on_lease', 0),
+            'sale_property': property_stage_count.get('sale', 0),
+            'sold_property': property_stage_count.get('sold', 0),
             # Rent Contract
-            'draft_contract': draft_contract,
-            'running_contract': running_contract,
-            'expire_contract': expire_contract,
+            'draft_contract': contract_count.get('new_contract', 0),
+            'running_contract': contract_count.get('running_contract', 0),
+            'expire_contract': contract_count.get('expire_contract', 0),
             'extend_contract': extend_contract,
-            'close_contract': close_contract,
+            'close_contract': contract_count.get('close_contract', 0),
             'pending_invoice': pending_invoice,
             'rent_total': str(
-                round(full_tenancy_total, 2)) + ' ' + currency_symbol if currency_symbol else "",
+                round(full_tenancy_total or 0.0, 2)) + ' ' + currency_symbol if currency_symbol else "",
             # Sale Contract
-            'booked': booked,
-            'sale_sold': sale_sold,
-            'refund': refund,
+            'booked': sale_count.get('booked', 0),
+            'sale_sold': sale_count.get('sold', 0),
+            'refund': sale_count.get('refund', 0),
             'sold_total': str(
                 round(sold_total, 2)) + ' ' + currency_symbol if currency_symbol else "",
             'pending_invoice_sale': pending_invoice_sale,
             # Customer & Landlord
-            'customer_count': customer_count,
-            'landlord_count': landlord_count,
+            'customer_count': partner_count.get('customer', 0),
+            'landlord_count': partner_count.get('landlord', 0),
             # Region, Project, Sub Project, Properties
             'region_count': region_count,
             'project_count': project_count,
@@ -761,161 +851,322 @@ class PropertyDetails(models.Model):
             # Graph
             'property_type': property_type,
             'property_stage': property_stage,
-            'property_map_data': self.get_property_map_data(),
+            'property_map_data': self.get_property_map_data(zoom=1),
             'due_paid_amount': self.due_paid_amount(),
             'tenancy_top_broker': self.get_top_broker(),
         }
 
     @api.model
-    def retrieve_list_dashboard_data(self):
+    def retrieve_list_dashboard_data(self, domain=None):
         """ This function returns the values to populate the custom dashboard in
             the Property List views.
+            :param domain: domain of the list view, counters follow the active filter
         """
-        property_obj = self.env['property.details'].sudo()
+        domain = domain or []
+        return self.env['rental.dashboard.cache']._get_snapshot(
+            'property_list', lambda: self._get_list_dashboard_data(domain), key=repr(domain))
 
+    @api.model
+    def _get_list_dashboard_data(self, domain=None):
+        """Compute Property List views dashboard values from one stage/type/sale_lease group"""
         stages = ['available', 'booked', 'on_lease', 'sale', 'sold', 'draft']
+        types = ['land', 'residential', 'commercial', 'industrial']
         data = {}
-
-        for stage in stages:
-            data[f'{stage}_prop_count'] = property_obj.search_count([('stage', '=', stage)])
-            data[f'{stage}_land_prop_count'] = property_obj.search_count([
-                ('stage', '=', stage),
-                ('type', '=', 'land'),
-            ])
-            data[f'{stage}_residential_prop_count'] = property_obj.search_count([
-                ('stage', '=', stage),
-                ('type', '=', 'residential'),
-            ])
-            data[f'{stage}_commercial_prop_count'] = property_obj.search_count([
-                ('stage', '=', stage),
-                ('type', '=', 'commercial'),
-            ])
-            data[f'{stage}_industrial_prop_count'] = property_obj.search_count([
-                ('stage', '=', stage),
-                ('type', '=', 'industrial'),
-            ])
-
-        data['total_prop_count'] = property_obj.search_count([('stage', '!=', 'draft')])
-        data['total_land_prop_count'] = property_obj.search_count([
-            ('stage', '!=', 'draft'),
-            ('type', '=', 'land'),
-        ])
-        data['total_residential_prop_count'] = property_obj.search_count([
-            ('stage', '!=', 'draft'),
-            ('type', '=', 'residential'),
-        ])
-        data['total_commercial_prop_count'] = property_obj.search_count([
-            ('stage', '!=', 'draft'),
-            ('type', '=', 'commercial'),
-        ])
-        data['total_industrial_prop_count'] = property_obj.search_count([
-            ('stage', '!=', 'draft'),
-            ('type', '=', 'industrial'),
-        ])
-        # FOR RENT
-        for_rent_domain = [('stage', '=', 'available'), ('sale_lease', '=', 'for_tenancy')]
-        data['total_for_rent_count'] = property_obj.search_count(for_rent_domain)
-        data['total_for_rent_land_count'] = property_obj.search_count(
-            for_rent_domain + [('type', '=', 'land')])
-        data['total_for_rent_residential_count'] = property_obj.search_count(
-            for_rent_domain + [('type', '=', 'residential')])
-        data['total_for_rent_commercial_count'] = property_obj.search_count(
-            for_rent_domain + [('type', '=', 'commercial')])
-        data['total_for_rent_industrial_count'] = property_obj.search_count(
-            for_rent_domain + [('type', '=', 'industrial')])
+        for key in stages + ['total']:
+            data[f'{key}_prop_count'] = 0
+            for prop_type in types:
+                data[f'{key}_{prop_type}_prop_count'] = 0
+        data['total_for_rent_count'] = 0
+        for prop_type in types:
+            data[f'total_for_rent_{prop_type}_count'] = 0
+
+        # Counted with the access rights of the user, as the list view the domain comes from
+        for stage, prop_type, sale_lease, count in self.env['property.details']._read_group(
+                domain or [], ['stage', 'type', 'sale_lease'], ['__count']):
+            if stage != 'draft':
+                data['total_prop_count'] += count
+                if prop_type in types:
+                    data[f'total_{prop_type}_prop_count'] += count
+            if stage not in stages:
+                continue
+            data[f'{stage}_prop_count'] += count
+            if prop_type in types:
+                data[f'{stage}_{prop_type}_prop_count'] += count
+            # FOR RENT
+            if stage == 'available' and sale_lease == 'for_tenancy':
+                data['total_for_rent_count'] += count
+                if prop_type in types:
+                    data[f'total_for_rent_{prop_type}_count'] += count
         return data
 
     def get_top_broker(self):
         """Dashboard : Get top broker"""
-        company_ids = self.env.companies.ids
-        broker_tenancy = {}
-        broker_sold = {}
-        for group in self.env['tenancy.details'].read_group(
-                [('is_any_broker', '=', True), ('company_id', 'in', company_ids)],
-                ['broker_id'],
-                ['broker_id'], limit=5):
-            if group['broker_id']:
-                name = self.env['res.partner'].sudo().browse(
-                    int(group['broker_id'][0])).name
-                broker_tenancy[name] = group['broker_id_count']
-        for group in self.env['property.vendor'].read_group(
-                [('is_any_broker', '=', True), ('company_id', 'in', company_ids),
-                 ('stage', '=', 'sold')],
-                ['broker_id'],
-                ['broker_id'], limit=5):
-            if group['broker_id']:
-                name = self.env['res.partner'].sudo().browse(
-                    int(group['broker_id'][0])).name
-                broker_sold[name] = group['broker_id_count']
-
-        brokers_tenancy_list = dict(
-            sorted(broker_tenancy.items(), key=lambda x: x[1], reverse=True))
-        broker_sold_list = dict(
-            sorted(broker_sold.items(), key=lambda x: x[1], reverse=True))
-        return [list(brokers_tenancy_list.keys()), list(brokers_tenancy_list.values()),
-                list(broker_sold_list.keys()),
-                list(broker_sold_list.values())]
-
-    def due_paid_amount(self):
-        """Dashboard : Due / Paid Amount"""
-        company_domain = [('company_id', 'in', self.env.companies.ids)]
-        sold = {}
-        tenancy = {}
-        not_paid_amount_sold = 0.0
-        paid_amount_sold = 0.0
-        not_paid_amount_tenancy = 0.0
-        paid_amount_tenancy = 0.0
-        property_sold = self.env['account.move'].sudo().search(
-            [('sold_id', '!=', False)] + company_domain)
-        for data in property_sold:
-            if data.sold_id.stage == "sold":
-                if data.payment_state == "not_paid":
-                    not_paid_amount_sold = not_paid_amount_sold + data.amount_total
-                if data.payment_state == "paid":
-                    paid_amount_sold = paid_amount_sold + data.amount_total
-        sold['Due'] = not_paid_amount_sold
-        sold['Paid'] = paid_amount_sold
-        property_tenancy = self.env['rent.invoice'].sudo().search(company_domain)
-        for rec in property_tenancy:
-            if rec.payment_state == 'not_paid':
-                not_paid_amount_tenancy = not_paid_amount_tenancy + rec.rent_invoice_id.amount_total
-            if rec.payment_state == 'paid':
-                paid_amount_tenancy = paid_amount_tenancy + rec.rent_invoice_id.amount_total
-        tenancy['Due'] = not_paid_amount_tenancy
-        tenancy['Paid'] = paid_amount_tenancy
-        return [list(sold.keys()), list(sold.values()), list(tenancy.keys()),
-                list(tenancy.values())]
-
-    def get_property_map_data(self):
-        """Dashboard : Get map data"""
-        company_domain = [('company_id', 'in', self.env.companies.ids)]
+        leaderboard = self.get_broker_leaderboard()
+        return [[broker['name'] for broker in leaderboard['tenancy']],
+                [broker['count'] for broker in leaderboard['tenancy']],
+                [broker['name'] for broker in leaderboard['sold']],
+                [broker['count'] for broker in leaderboard['sold']]]
+
+    @api.model
+    def get_broker_leaderboard(self, date_from=None, date_to=None, company_ids=None,
+                               order='count', limit=5):
+        """
+        Dashboard : Broker leaderboard of tenancy and sold contracts, ranked in database
+        :param date_from: only contracts started (tenancy) or created (sold) from this date
+        :param date_to: only contracts started or created until this date
+        :param company_ids: companies to rank, restricted to the allowed companies
+        :param order: 'count' to rank by number of contracts, 'commission' by commission
+        :param limit: number of brokers per ranking
+        :return: {'tenancy': [{'broker_id', 'name', 'count', 'commission'}], 'sold': [...]}
+        """
+        companies = self.env.companies
+        if company_ids:
+            companies = companies.filtered(lambda company: company.id in company_ids)
+        self.env['tenancy.details'].flush_model(
+            ['is_any_broker', 'broker_id', 'company_id', 'start_date', 'commission_type',
+             'broker_commission', 'broker_commission_percentage', 'total_rent', 'rent_type',
+             'duration_id'])
+        self.env['contract.duration'].flush_model(['month'])
+        self.env['property.vendor'].flush_model(
+            ['is_any_broker', 'broker_id', 'company_id', 'date', 'stage', 'commission_type',
+             'broker_commission', 'broker_commission_percentage', 'sale_price'])
+        self.env['res.partner'].flush_model(['name'])
+
+        tenancy_period = sold_period = ""
+        if date_from:
+            tenancy_period += " AND td.start_date >= %(date_from)s"
+            sold_period += " AND pv.date >= %(date_from)s"
+        if date_to:
+            tenancy_period += " AND td.start_date <= %(date_to)s"
+            sold_period += " AND pv.date <= %(date_to)s"
+        rank_by = ("commission DESC, contract_count DESC" if order == 'commission'
+                   else "contract_count DESC, commission DESC")
+        # Commissions mirror TenancyDetails._compute_broker_commission and
+        # PropertyVendor._compute_broker_final_commission
+        self.env.cr.execute(f"""
+            WITH ranking AS (
+                SELECT 'tenancy' AS kind, td.broker_id, COUNT(*) AS contract_count,
+                       SUM(CASE td.commission_type
+                               WHEN 'f' THEN COALESCE(td.broker_commission, 0)
+                               WHEN 'p' THEN COALESCE(td.broker_commission_percentage, 0)
+                                             * COALESCE(td.total_rent, 0) / 100
+                               ELSE 0
+                           END
+                           * CASE td.rent_type
+                               WHEN 'once' THEN 1
+                               WHEN 'e_rent' THEN COALESCE(cd.month, 0)
+                               ELSE 0
+                           END)::float AS commission
+                  FROM tenancy_details td
+             LEFT JOIN contract_duration cd ON cd.id = td.duration_id
+                 WHERE td.is_any_broker
+                   AND td.broker_id IS NOT NULL
+                   AND td.company_id IN %(company_ids)s
+                       {tenancy_period}
+              GROUP BY td.broker_id
+             UNION ALL
+                SELECT 'sold' AS kind, pv.broker_id, COUNT(*) AS contract_count,
+                       SUM(CASE pv.commission_type
+                               WHEN 'p' THEN COALESCE(pv.sale_price, 0)
+                                             * COALESCE(pv.broker_commission_percentage, 0)
+                                             / 100
+                               ELSE COALESCE(pv.broker_commission, 0)
+                           END)::float AS commission
+                  FROM property_vendor pv
+                 WHERE pv.is_any_broker
+                   AND pv.broker_id IS NOT NULL
+                   AND pv.stage = 'sold'
+                   AND pv.company_id IN %(company_ids)s
+                       {sold_period}
+              GROUP BY pv.broker_id
+            ), ranked AS (
+                SELECT ranking.*,
+                       ROW_NUMBER() OVER (PARTITION BY kind
+                                          ORDER BY {rank_by}, broker_id) AS rank
+                  FROM ranking
+            )
+            SELECT ranked.kind, ranked.broker_id, partner.name, ranked.contract_count,
+                   ranked.commission
+              FROM ranked
+              JOIN res_partner partner ON partner.id = ranked.broker_id
+             WHERE ranked.rank <= %(limit)s
+          ORDER BY ranked.kind, ranked.rank
+        """, {
+            'company_ids': tuple(companies.ids) or (None,),
+            'date_from': date_from,
+            'date_to': date_to,
+            'limit': limit,
+        })
+        leaderboard = {'tenancy': [], 'sold': []}
+        for kind, broker_id, name, count, commission in self.env.cr.fetchall():
+            leaderboard[kind].append({
+                'broker_id': broker_id,
+                'name': name,
+                'count': count,
+                'commission': commission or 0.0,
+            })
+        return leaderboard
+
+    def due_paid_amount(self, by_month=False):
+        """
+        Dashboard : Due / Paid Amount, summed in database
+        :param by_month: bucket amounts by month of invoice date, e.g. for an aging chart
+        :return: [sold keys, sold amounts, tenancy keys, tenancy amounts], or when
+                 by_month, {'months': [...], 'sold': {'Due': [...], 'Paid': [...]},
+                 'tenancy': {'Due': [...], 'Paid': [...]}}
+        """
+        sold = self._get_due_paid_groups('sold', by_month)
+        tenancy = self._get_due_paid_groups('tenancy', by_month)
+        if not by_month:
+            sold = {key: sum(amounts.values()) for key, amounts in sold.items()}
+            tenancy = {key: sum(amounts.values()) for key, amounts in tenancy.items()}
+            return [list(sold.keys()), list(sold.values()), list(tenancy.keys()),
+                    list(tenancy.values())]
+        months = sorted(set().union(*sold.values(), *tenancy.values()))
+        return {
+            'months': [fields.Date.to_string(month) for month in months],
+            'sold': {key: [amounts.get(month, 0.0) for month in months]
+                     for key, amounts in sold.items()},
+            'tenancy': {key: [amounts.get(month, 0.0) for month in months]
+                        for key, amounts in tenancy.items()},
+        }
+
+    @api.model
+    def _get_due_paid_groups(self, contract, by_month=False):
+        """
+        Due / Paid invoice amounts of sold contracts or rent invoices in one grouped query
+        :param contract: 'sold' or 'tenancy'
+        :return: {'Due': {month: amount}, 'Paid': {month: amount}}, month being False
+                 when not by_month
+        """
+        self.env['account.move'].flush_model(
+            ['amount_total', 'payment_state', 'invoice_date', 'date', 'company_id', 'sold_id'])
+        if contract == 'sold':
+            self.env['property.vendor'].flush_model(['stage'])
+            query = """
+                SELECT am.payment_state, {month}, SUM(am.amount_total)::float
+                  FROM account_move am
+                  JOIN property_vendor pv ON pv.id = am.sold_id
+                 WHERE am.company_id IN %s
+                   AND pv.stage = 'sold'
+                   AND am.payment_state IN ('not_paid', 'paid')
+              GROUP BY {group_by}
+            """
+            month = "date_trunc('month', COALESCE(am.invoice_date, am.date))::date"
+        else:
+            self.env['rent.invoice'].flush_model(['rent_invoice_id', 'company_id',
+                                                  'invoice_date'])
+            query = """
+                SELECT am.payment_state, {month}, SUM(am.amount_total)::float
+                  FROM rent_invoice ri
+                  JOIN account_move am ON am.id = ri.rent_invoice_id
+                 WHERE ri.company_id IN %s
+                   AND am.payment_state IN ('not_paid', 'paid')
+              GROUP BY {group_by}
+            """
+            month = ("date_trunc('month', COALESCE(am.invoice_date, ri.invoice_date, am.date))"
+                     "::date")
+        if by_month:
+            query = query.format(month=month, group_by="1, 2")
+        else:
+            query = query.format(month="NULL", group_by="1")
+        self.env.cr.execute(query, [tuple(self.env.companies.ids)])
+
+        labels = {'not_paid': 'Due', 'paid': 'Paid'}
+        data = {'Due': {}, 'Paid': {}}
+        for payment_state, month, amount in self.env.cr.fetchall():
+            data[labels[payment_state]][month or False] = amount or 0.0
+        return data
+
+    @api.model
+    def get_property_map_data(self, bbox=None, zoom=None):
+        """
+        Dashboard : Get map data of the viewport. Below MAP_CLUSTER_MAX_ZOOM, properties
+        are clustered server side on a grid whose cells shrink as the zoom grows.
+        :param bbox: viewport [west, south, east, north] in degrees, whole map when empty
+        :param zoom: map zoom level, 1 showing the whole map; no clustering when empty
+        :return: list of markers, a cluster has a count above 1 and no status
+        """
+        self.flush_model(['company_id', 'latitude', 'longitude', 'map_latitude',
+                          'map_longitude'])
+        where = ["company_id IN %s", "COALESCE(latitude, '') != ''",
+                 "COALESCE(longitude, '') != ''"]
+        params = [tuple(self.env.companies.ids)]
+        if bbox:
+            west, south, east, north = (float(value) for value in bbox)
+            where.append("map_latitude BETWEEN %s AND %s")
+            params += [south, north]
+            if east - west < 360:
+                west, east = ((west + 180) % 360) - 180, ((east + 180) % 360) - 180
+                if west <= east:
+                    where.append("map_longitude BETWEEN %s AND %s")
+                else:
+                    # Viewport crossing the antimeridian
+                    where.append("(map_longitude >= %s OR map_longitude <= %s)")
+                params += [west, east]
+        where = " AND ".join(where)
+
+        if zoom and float(zoom) < MAP_CLUSTER_MAX_ZOOM:
+            cell = MAP_CLUSTER_CELL / max(float(zoom), 1.0)
+            self.env.cr.execute(f"""
+                SELECT COUNT(*), AVG(map_latitude), AVG(map_longitude), MIN(id)
+                  FROM property_details
+                 WHERE {where}
+              GROUP BY FLOOR(map_latitude / %s), FLOOR(map_longitude / %s)
+            """, params + [cell, cell])
+        else:
+            self.env.cr.execute(f"""
+                SELECT 1, map_latitude, map_longitude, id
+                  FROM property_details
+                 WHERE {where}
+              ORDER BY id
+                 LIMIT %s
+            """, params + [MAP_MARKER_LIMIT])
+        groups = self.env.cr.fetchall()
+
+        single_ids = [prop_id for count, __, __, prop_id in groups if count == 1]
+        properties = {
+            vals['id']: vals for vals in self.sudo().browse(single_ids).read(
+                ['name', 'street', 'city_id', 'stage', 'latitude', 'longitude'])
+        }
         data = []
-        properties = self.env['property.details'].sudo().search(company_domain)
-        for prop in properties:
-            if not prop.latitude or not prop.longitude:
+        for count, latitude, longitude, prop_id in groups:
+            if count > 1:
+                data.append({
+                    'title': _("%s Properties", count),
+                    'latitude': latitude,
+                    'longitude': longitude,
+                    'status': False,
+                    'count': count,
+                })
                 continue
-            address_parts = []
-            if prop.street:
-                address_parts.append(prop.street)
-            if prop.city_id and prop.city_id.name:
-                address_parts.append(prop.city_id.name)
-
-            address_line = ", ".join(address_parts)
-            name_line = prop.name or ""
-
-            if address_line:
-                line_length = max(len(name_line), len(address_line)) * 2
-                title = f"{name_line}\n{'-' * line_length}\n{address_line}"
-            else:
-                title = name_line
+            vals = properties[prop_id]
             data.append({
-                'title': title,
-                'latitude': prop.latitude,
-                'longitude': prop.longitude,
-                'status': prop.stage,
+                'title': self._get_map_title(vals),
+                'latitude': vals['latitude'],
+                'longitude': vals['longitude'],
+                'status': vals['stage'],
+                'count': 1,
             })
         return data
 
+    @api.model
+    def _get_map_title(self, vals):
+        """Map marker title of property values"""
+        address_parts = []
+        if vals['street']:
+            address_parts.append(vals['street'])
+        if vals['city_id']:
+            address_parts.append(vals['city_id'][1])
+
+        address_line = ", ".join(address_parts)
+        name_line = vals['name'] or ""
+
+        if address_line:
+            line_length = max(len(name_line), len(address_line)) * 2
+            return f"{name_line}\n{'-' * line_length}\n{address_line}"
+        return name_line
+
 
 # Area Measurement
 class PropertyRoomMeasurement(models.Model):
@@ -1022,13 +1273,13 @@ class FloorPlan(models.Model):
     """Property Flore Plans"""
     _name = 'floor.plan'
     _description = 'Details About Floor Plan'
-    _inherit = ["image.mixin"]
+    _inherit = ["image.mixin", "property.image.store.mixin"]
     _order = "sequence, id"
 
     title = fields.Char(string='Title', translate=True)
     sequence = fields.Integer(default=10)
     property_id = fields.Many2one('property.details', string='Property')
-    image = fields.Image(string='Image ')
+    image = fields.Image(string='Image ', compute='_compute_image', inverse='_inverse_image')
     video_url = fields.Char("Video URL",
                             help="URL of a video for showcasing your property.")
     embed_code = fields.Html(compute="_compute_embed_code",
@@ -1037,12 +1288,12 @@ class FloorPlan(models.Model):
                                               compute="_compute_can_image_1024_be_zoomed",
                                               store=True)
 
-    @api.depends("image", "image_1024")
+    @api.depends("image", "gallery_image_1024")
     def _compute_can_image_1024_be_zoomed(self):
         """Compute image can be zoomed or  not"""
         for image in self:
-            image.can_image_1024_be_zoomed = image.image and is_image_size_above(image.image,
-                                                                                 image.image_1024)
+            image.can_image_1024_be_zoomed = image.image and is_image_size_above(
+                image.image, image.gallery_image_1024)
 
     @api.onchange("video_url")
     def _onchange_video_url(self):
@@ -1070,7 +1321,7 @@ class FloorPlan(models.Model):
 class PropertyImages(models.Model):
     _name = 'property.images'
     _description = 'Property Images'
-    _inherit = ["image.mixin"]
+    _inherit = ["image.mixin", "property.image.store.mixin"]
     _order = "sequence, id"
     _rec_name = "title"
 
@@ -1079,7 +1330,7 @@ class PropertyImages(models.Model):
     property_id = fields.Many2one('property.details',
                                   string='Property Name',
                                   readonly=True)
-    image = fields.Image(string='Images')
+    image = fields.Image(string='Images', compute='_compute_image', inverse='_inverse_image')
     video_url = fields.Char("Video URL",
                             help="URL of a video for showcasing your property.")
     embed_code = fields.Html(compute="_compute_embed_code",
@@ -1088,12 +1339,12 @@ class PropertyImages(models.Model):
                                               compute="_compute_can_image_1024_be_zoomed",
                                               store=True)
 
-    @api.depends("image", "image_1024")
+    @api.depends("image", "gallery_image_1024")
     def _compute_can_image_1024_be_zoomed(self):
         """Compute image can be zoomed or not"""
         for image in self:
-            image.can_image_1024_be_zoomed = image.image and is_image_size_above(image.image,
-                                                                                 image.image_1024)
+            image.can_image_1024_be_zoomed = image.image and is_image_size_above(
+                image.image, image.gallery_image_1024)
 
     @api.onchange("video_url")
     def _onchange_video_url(self):
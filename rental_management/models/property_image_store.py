@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020-Today TechKhedut.
+# Part of TechKhedut. See LICENSE file for full copyright and licensing details.
+import base64
+import hashlib
+from datetime import timedelta
+from odoo import api, fields, models
+
+
+class PropertyImageStore(models.Model):
+    """
+    Gallery images stored once per content. Gallery lines of properties, projects,
+    subprojects and floor plans point to the image with the same checksum, so a
+    gallery copied to hundreds of units stores its images once.
+    """
+    _name = 'property.image.store'
+    _description = 'Property Image Store'
+    _rec_name = 'checksum'
+
+    checksum = fields.Char(string='Checksum', required=True, readonly=True)
+    image = fields.Image(string='Image', readonly=True)
+    # Renditions, generated once when the image is stored
+    image_1024 = fields.Image(string='Image 1024', related='image', max_width=1024,
+                              max_height=1024, store=True)
+    image_512 = fields.Image(string='Image 512', related='image', max_width=512,
+                             max_height=512, store=True)
+    image_128 = fields.Image(string='Image 128', related='image', max_width=128,
+                             max_height=128, store=True)
+    file_size = fields.Integer(string='File Size', readonly=True)
+    ref_count = fields.Integer(string='References', compute='_compute_ref_count')
+
+    _sql_constraints = [
+        ('checksum_unique', 'unique(checksum)', 'An image can only be stored once.'),
+    ]
+
+    @api.model
+    def _get_reference_models(self):
+        """Models whose images are kept in the store"""
+        return [name for name, model in self.env.registry.items()
+                if not model._abstract and 'image_store_id' in model._fields
+                and model._fields['image_store_id'].comodel_name == self._name]
+
+    def _compute_ref_count(self):
+        """Count gallery lines using image"""
+        counts = dict.fromkeys(self.ids, 0)
+        for model_name in self._get_reference_models():
+            for store, count in self.env[model_name].sudo()._read_group(
+                    [('image_store_id', 'in', self.ids)], ['image_store_id'], ['__count']):
+                counts[store.id] += count
+        for rec in self:
+            rec.ref_count = counts.get(rec.id, 0)
+
+    @api.model
+    def _get_or_create(self, images):
+        """
+        Get stored images of base64 values, storing the missing ones
+        :param images: list of base64 images, False for no image
+        :return: list of property.image.store records, empty for no image
+        """
+        return self._get_or_create_raw([image and base64.b64decode(image) for image in images])
+
+    @api.model
+    def _get_or_create_raw(self, raws):
+        """
+        Get stored images of binary contents, storing the missing ones
+        :param raws: list of image bytes, False for no image
+        :return: list of property.image.store records, empty for no image
+        """
+        checksums = [raw and hashlib.sha1(raw).hexdigest() for raw in raws]
+        stores = {store.checksum: store for store in self.sudo().search(
+            [('checksum', 'in', [checksum for checksum in checksums if checksum])])}
+        missing = {}
+        for raw, checksum in zip(raws, checksums):
+            if checksum and checksum not in stores:
+                missing.setdefault(checksum, raw)
+        if missing:
+            for store in self.sudo().create([{
+                'checksum': checksum,
+                'image': base64.b64encode(raw),
+                'file_size': len(raw),
+            } for checksum, raw in missing.items()]):
+                stores[store.checksum] = store
+        return [stores[checksum] if checksum else self.browse() for checksum in checksums]
+
+    def _get_image_url(self, size=None):
+        """
+        Public URL of image or of one of its renditions. The URL holds the checksum,
+        so it never changes content and can be cached for good.
+        :param size: 128, 512 or 1024, None for the original image
+        """
+        self.ensure_one()
+        return f'/property/image/{self.checksum}/{size or "full"}'
+
+    @api.autovacuum
+    def _gc_unreferenced_images(self):
+        """Delete stored images no gallery line uses anymore"""
+        self.env.flush_all()
+        query = """
+            SELECT store.id
+              FROM property_image_store store
+             WHERE store.create_date < %s
+        """
+        for model_name in self._get_reference_models():
+            query += " AND NOT EXISTS (SELECT 1 FROM %s line WHERE line.image_store_id = store.id)" \
+                     % self.env[model_name]._table
+        self.env.cr.execute(query, [fields.Datetime.now() - timedelta(days=1)])
+        self.browse([row[0] for row in self.env.cr.fetchall()]).sudo().unlink()
+
+
+class PropertyImageStoreMixin(models.AbstractModel):
+    """Gallery line whose image is kept in the image store"""
+    _name = 'property.image.store.mixin'
+    _description = 'Stored Gallery Image'
+
+    image_store_id = fields.Many2one('property.image.store', string='Stored Image',
+                                     index=True, ondelete='restrict', readonly=True)
+    gallery_image_1024 = fields.Image(related='image_store_id.image_1024', string='Image 1024')
+    gallery_image_512 = fields.Image(related='image_store_id.image_512', string='Image 512')
+    gallery_image_128 = fields.Image(related='image_store_id.image_128', string='Image 128')
+    gallery_image_url = fields.Char(string='Image URL', compute='_compute_gallery_image_url')
+
+    @api.depends('image_store_id')
+    def _compute_gallery_image_url(self):
+        """URL of the 512 rendition, served with immutable cache headers"""
+        for rec in self:
+            rec.gallery_image_url = rec.image_store_id.sudo()._get_image_url(512) \
+                if rec.image_store_id else False
+
+    @api.depends('image_store_id')
+    def _compute_image(self):
+        """Get image from store"""
+        for rec in self:
+            rec.image = rec.image_store_id.sudo().image
+
+    def _inverse_image(self):
+        """Keep image in store"""
+        stores = self.env['property.image.store']._get_or_create([rec.image for rec in self])
+        for rec, store in zip(self, stores):
+            rec.image_store_id = store
@@ -201,9 +201,10 @@ class PropertyVendor(models.Model):
     company_currency_id = fields.Many2one(related='company_id.currency_id', readonly=True)
 
     def _compute_schedule_count(self):
-        Schedule = self.env['property.payment.schedule']
+        counts = self.env['rental.counter']._read_counts(
+            self, 'property.payment.schedule', 'vendor_id')
         for rec in self:
-            rec.schedule_count = Schedule.search_count([('vendor_id', '=', rec.id)])
+            rec.schedule_count = counts[rec._origin.id]
 
     def _compute_amounts(self):
         Schedule = self.env['property.payment.schedule']
@@ -7,7 +7,7 @@ from datetime import timedelta
 class PropertyPreSale(models.Model):
     _name = "property.presale"
     _description = "Pre-sale (Option) for a Property Unit"
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'rental.cron.mixin']
     _order = "id desc"
 
     name = fields.Char(string="Reference", default="New", copy=False, readonly=True)
@@ -49,12 +49,27 @@ class PropertyPreSale(models.Model):
             return
 
         # 1. Pre-sales expiring tomorrow (reminder)
-        expiring_soon = self.search([
-            ('state', '=', 'active'),
-            ('date_expiry', '=', tomorrow),
-            ('reminder_sent', '=', False),
-        ])
-        for presale in expiring_soon:
+        self._process_cron_chunks(
+            'property.presale.expiry_reminder', 'property.presale',
+            [('state', '=', 'active'),
+             ('date_expiry', '=', tomorrow),
+             ('reminder_sent', '=', False)],
+            lambda presales: presales._notify_expiring_soon(activity_type),
+            cron_xmlid='rental_management.presale_expiry_check')
+
+        # 2. Pre-sales already expired (expiry notification)
+        self._process_cron_chunks(
+            'property.presale.expiry_notification', 'property.presale',
+            [('state', '=', 'active'),
+             ('date_expiry', '<', today),
+             ('expiry_notified', '=', False)],
+            lambda presales: presales._notify_expired(activity_type),
+            cron_xmlid='rental_management.presale_expiry_check')
+
+    def _notify_expiring_soon(self, activity_type):
+        """Schedule reminder activity for pre-sales expiring tomorrow"""
+        today = fields.Date.today()
+        for presale in self:
             user = presale.create_uid or self.env.user
             presale.activity_schedule(
                 activity_type_id=activity_type.id,
@@ -65,15 +80,12 @@ class PropertyPreSale(models.Model):
                 user_id=user.id,
                 date_deadline=today,
             )
-            presale.reminder_sent = True
+        self.reminder_sent = True
 
-        # 2. Pre-sales already expired (expiry notification)
-        expired = self.search([
-            ('state', '=', 'active'),
-            ('date_expiry', '<', today),
-            ('expiry_notified', '=', False),
-        ])
-        for presale in expired:
+    def _notify_expired(self, activity_type):
+        """Schedule expiry activity for expired pre-sales and mark them expired"""
+        today = fields.Date.today()
+        for presale in self:
             user = presale.create_uid or self.env.user
             presale.activity_schedule(
                 activity_type_id=activity_type.id,
@@ -157,9 +169,9 @@ class PropertyDetailsPreSale(models.Model):
 
     @api.depends('presale_id')
     def _compute_presale_count(self):
-        Presale = self.env['property.presale']
+        counts = self.env['rental.counter']._read_counts(self, 'property.presale', 'property_id')
         for rec in self:
-            rec.presale_count = Presale.search_count([('property_id', '=', rec.id)])
+            rec.presale_count = counts[rec._origin.id]
 
     def action_property_presale_wizard(self):
         """Open the Pre-Sale wizard for this property (no external id required)."""
@@ -21,13 +21,14 @@ class PropertyRegion(models.Model):
 
     def _compute_count(self):
         """Compute Count"""
+        counter = self.env['rental.counter']
+        project_counts = counter._read_counts(self, 'property.project', 'region_id')
+        subproject_counts = counter._read_counts(self, 'property.sub.project', 'region_id')
+        unit_counts = counter._read_counts(self, 'property.details', 'region_id')
         for rec in self:
-            rec.project_count = self.env['property.project'].search_count(
-                [('region_id', 'in', [rec.id])])
-            rec.subproject_count = self.env['property.sub.project'].search_count(
-                [('region_id', 'in', [rec.id])])
-            rec.unit_count = self.env['property.details'].search_count(
-                [('region_id', 'in', [rec.id])])
+            rec.project_count = project_counts[rec._origin.id]
+            rec.subproject_count = subproject_counts[rec._origin.id]
+            rec.unit_count = unit_counts[rec._origin.id]
 
     def action_view_project(self):
         """View project"""
@@ -145,72 +145,29 @@ class PropertySubProject(models.Model):
     # Count
     def compute_count(self):
         """Compute count"""
+        counter = self.env['rental.counter']
+        document_counts = counter._read_counts(self, 'subproject.document', 'subproject_id')
+        unit_counts = counter._read_counts(self, 'property.details', 'subproject_id',
+                                           groupby='stage')
         for rec in self:
-            rec.document_count = self.env["subproject.document"].search_count(
-                [("subproject_id", "in", [rec.id])])
-            rec.unit_count = self.env['property.details'].search_count(
-                [('subproject_id', 'in', [rec.id])])
-            rec.available_unit_count = self.env['property.details'].search_count(
-                [('subproject_id', 'in', [rec.id]), ('stage', '=', 'available')])
-            rec.sold_count = self.env['property.details'].search_count(
-                [('subproject_id', 'in', [rec.id]), ('stage', 'in', ['sale', 'sold'])])
-            rec.rent_count = self.env['property.details'].search_count(
-                [('subproject_id', 'in', [rec.id]), ('stage', '=', 'on_lease')])
+            rec.document_count = document_counts[rec._origin.id]
+            rec.unit_count = unit_counts[rec._origin.id]
+            rec.available_unit_count = unit_counts[rec._origin.id, 'available']
+            rec.sold_count = (unit_counts[rec._origin.id, 'sale']
+                              + unit_counts[rec._origin.id, 'sold'])
+            rec.rent_count = unit_counts[rec._origin.id, 'on_lease']
 
     # Valuation Calculation
     @api.depends('sale_lease')
     def compute_properties_statics(self):
-        """Compute properties statics"""
+        """Compute properties statics, for all subprojects at once"""
+        statics = self.env['property.details']._get_project_statics(
+            'subproject_id', self._origin.ids)
         for rec in self:
-            total_area = 0.0
-            available_area = 0.0
-            total_values = 0.0
-            total_maintenance = 0.0
-            total_collection = 0.0
-            scope_of_collection = 0.0
-            properties = self.env['property.details'].sudo()
-            project_domain = [('subproject_id', 'in', [rec.id])]
-            properties_ids = self.env['property.details'].sudo().search(
-                project_domain).mapped('id')
-            properties_sale = self.env['property.vendor'].sudo().search(
-                [('property_id', 'in', properties_ids)])
-            properties_tenancy = self.env['tenancy.details'].sudo().search(
-                [('property_id', 'in', properties_ids)])
-            if rec.sale_lease == 'sale':
-                sale_domain = project_domain + [('sale_lease', '=', 'for_sale')]
-                total_area = sum(properties.search(
-                    sale_domain).mapped('total_area'))
-                available_area = sum(properties.search(
-                    sale_domain + [('stage', '=', 'available')]).mapped('total_area'))
-                total_values = sum(properties.search(
-                    sale_domain).mapped('price'))
-                total_maintenance = sum(properties.search(
-                    sale_domain + [('is_maintenance_service', '=', True)]).mapped(
-                    'total_maintenance'))
-                total_collection = sum(properties_sale.mapped('paid_amount'))
-                scope_of_collection = sum(
-                    properties_sale.mapped('remaining_amount'))
-            if rec.sale_lease == 'rent':
-                tenancy_domain = [('sale_lease', '=', 'for_tenancy')] + project_domain
-                total_area = sum(properties.search(
-                    tenancy_domain).mapped('total_area'))
-                available_area = sum(properties.search(
-                    tenancy_domain + [('stage', '=', 'available')]).mapped('total_area'))
-                total_values = sum(properties.search(
-                    tenancy_domain).mapped('price'))
-                total_maintenance = sum(properties.search(
-                    tenancy_domain + [('is_maintenance_service', '=', True)]).mapped(
-                    'total_maintenance'))
-                total_collection = sum(
-                    properties_tenancy.mapped('paid_tenancy'))
-                scope_of_collection = sum(
-                    properties_tenancy.mapped('remain_tenancy'))
-            rec.total_area = total_area
-            rec.available_area = available_area
-            rec.total_values = total_values
-            rec.total_maintenance = total_maintenance
-            rec.total_collection = total_collection
-            rec.scope_of_collection = scope_of_collection
+            sale_lease = {'sale': 'for_sale', 'rent': 'for_tenancy'}.get(rec.sale_lease)
+            rec.update(statics.get(rec._origin.id, {}).get(sale_lease) or dict.fromkeys(
+                ['total_area', 'available_area', 'total_values', 'total_maintenance',
+                 'total_collection', 'scope_of_collection'], 0.0))
 
     # Onchange
     # Property Project info
@@ -371,13 +328,13 @@ class ProjectImagesLine(models.Model):
     """Subproject image line"""
     _name = 'subproject.images.line'
     _description = 'Subproject Image Line'
-    _inherit = ["image.mixin"]
+    _inherit = ["image.mixin", "property.image.store.mixin"]
     _order = "sequence, id"
 
     title = fields.Char(string='Title', translate=True)
     sequence = fields.Integer(default=10)
     subproject_id = fields.Many2one('property.sub.project')
-    image = fields.Image(string='Images')
+    image = fields.Image(string='Images', compute='_compute_image', inverse='_inverse_image')
     video_url = fields.Char("Video URL",
                             help="URL of a video for showcasing your property.")
     embed_code = fields.Html(compute="_compute_embed_code",
@@ -386,11 +343,12 @@ class ProjectImagesLine(models.Model):
                                               compute="_compute_can_image_1024_be_zoomed",
                                               store=True)
 
-    @api.depends("image", "image_1024")
+    @api.depends("image", "gallery_image_1024")
     def _compute_can_image_1024_be_zoomed(self):
         """Compute if image can be zoomed or not"""
         for image in self:
-            image.can_image_1024_be_zoomed = image.image and is_image_size_above(image.image, image.image_1024)
+            image.can_image_1024_be_zoomed = image.image and is_image_size_above(
+                image.image, image.gallery_image_1024)
 
     @api.onchange("video_url")
     def _onchange_video_url(self):
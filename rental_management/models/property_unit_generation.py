@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020-Today TechKhedut.
+# Part of TechKhedut. See LICENSE file for full copyright and licensing details.
+import json
+import logging
+import threading
+import time
+from odoo import api, fields, models, _
+
+_logger = logging.getLogger(__name__)
+
+
+class PropertyUnitGeneration(models.Model):
+    """
+    Bulk generation of the units of a project or subproject. Units are created with
+    one create per chunk and point to the stored images of the project gallery
+    instead of copying them.
+    Large generations run in background, chunk by chunk, from a scheduler.
+    """
+    _name = 'property.unit.generation'
+    _description = 'Property Unit Generation'
+    _order = 'id desc'
+
+    name = fields.Char(string='Name', required=True)
+    property_project_id = fields.Many2one('property.project', string='Project',
+                                          ondelete='cascade')
+    subproject_id = fields.Many2one('property.sub.project', string='Sub Project',
+                                    ondelete='cascade')
+    user_id = fields.Many2one('res.users', string='Requested By',
+                              default=lambda self: self.env.user)
+    state = fields.Selection([('pending', 'Pending'),
+                              ('running', 'Running'),
+                              ('done', 'Done'),
+                              ('failed', 'Failed')],
+                             string='Status', default='pending', required=True, index=True)
+    common_vals = fields.Text(string='Common Values', default='{}',
+                              help="JSON values shared by every unit")
+    unit_vals = fields.Text(string='Unit Values', default='[]',
+                            help="JSON list of the name, code and floor of each unit")
+    image_model = fields.Char(string='Image Model')
+    image_ids = fields.Char(string='Images', default='[]',
+                            help="JSON list of the images shared with every unit")
+    total_count = fields.Integer(string='Units')
+    done_count = fields.Integer(string='Created Units')
+    progress = fields.Float(string='Progress', compute='_compute_progress')
+    error = fields.Text(string='Error')
+
+    @api.depends('total_count', 'done_count')
+    def _compute_progress(self):
+        """Compute percentage of created units"""
+        for rec in self:
+            rec.progress = rec.total_count and 100.0 * rec.done_count / rec.total_count
+
+    @api.model
+    def _create_units(self, common_vals, units, images):
+        """
+        Create units in one create
+        :param common_vals: values shared by every unit
+        :param units: list of the values proper to each unit
+        :param images: project or subproject image lines, their stored images are
+            shared with every unit
+        :return: property.details records, in the order of units
+        """
+        image_commands = [(0, 0, {
+            'title': image.title,
+            'sequence': image.sequence,
+            'image_store_id': image.image_store_id.id,
+            'video_url': image.video_url,
+        }) for image in images]
+        vals_list = []
+        for unit in units:
+            vals = dict(common_vals, **unit)
+            if image_commands:
+                vals['property_images_ids'] = image_commands
+            vals_list.append(vals)
+        return self.env['property.details'].sudo().create(vals_list)
+
+    def _generate(self, limit=None):
+        """Create next units of generation, at most limit"""
+        self.ensure_one()
+        units = json.loads(self.unit_vals)[self.done_count:]
+        if limit:
+            units = units[:limit]
+        images = self.env[self.image_model].browse(json.loads(self.image_ids)).exists() \
+            if self.image_model else []
+        self._create_units(json.loads(self.common_vals), units, images)
+        done_count = self.done_count + len(units)
+        self.write({
+            'done_count': done_count,
+            'state': 'done' if done_count >= self.total_count else 'running',
+        })
+
+    # Scheduler
+    @api.model
+    def _cron_generate_units(self):
+        """Create units of pending generations, chunk by chunk, in the time budget"""
+        param = self.env['ir.config_parameter'].sudo()
+        chunk_size = int(param.get_param('rental_management.unit_generation_chunk_size') or 200)
+        time_budget = int(param.get_param('rental_management.cron_time_budget') or 60)
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        deadline = time.monotonic() + time_budget
+        for generation in self.search([('state', 'in', ['pending', 'running'])], order='id'):
+            while generation.state != 'done':
+                if time.monotonic() > deadline:
+                    self.env.ref('rental_management.property_unit_generation_cron')._trigger()
+                    return
+                try:
+                    with self.env.cr.savepoint():
+                        generation._generate(chunk_size)
+                except Exception as e:
+                    _logger.exception("Unit generation %s failed", generation.id)
+                    generation.write({'state': 'failed', 'error': str(e)})
+                if auto_commit:
+                    self.env.cr.commit()
+                if generation.state == 'failed':
+                    break
+
+    # Button
+    def action_retry(self):
+        """Resume failed generation"""
+        self.filtered(lambda rec: rec.state == 'failed').write({'state': 'running',
+                                                                'error': False})
+        self.env.ref('rental_management.property_unit_generation_cron')._trigger()
+
+    def action_view_units(self):
+        """View units of generation project"""
+        self.ensure_one()
+        domain = [('subproject_id', '=', self.subproject_id.id)] if self.subproject_id else \
+            [('property_project_id', '=', self.property_project_id.id)]
+        return {
+            'name': _('Properties'),
+            'type': 'ir.actions.act_window',
+            'domain': domain,
+            'view_mode': 'list,form',
+            'context': {'create': False},
+            'res_model': 'property.details',
+            'target': 'current',
+        }
@@ -6,14 +6,55 @@ import re
 from dateutil.relativedelta import relativedelta
 from odoo.exceptions import ValidationError
 from odoo import api, fields, models, _
-from odoo.tools import DEFAULT_SERVER_DATE_FORMAT as DATE_FORMAT
+from odoo.osv import expression
+
+# Months between two recurring installments, per payment term
+RECURRING_INVOICE_MONTHS = {
+    'monthly': 1,
+    'quarterly': 3,
+    'half_year': 6,
+    'year': 12,
+}
+# Rent unit of contracts invoiced by the recurring scheduler, per payment term
+RECURRING_RENT_UNIT = {
+    'monthly': 'Month',
+    'quarterly': 'Month',
+    'half_year': 'Month',
+    'year': 'Year',
+}
+RECURRING_INVOICE_LABELS = {
+    'monthly': {
+        'installment': 'Installment of ',
+        'service': "Service Type : Recurring\nService : %s",
+        'maintenance': 'Recurring Monthly Maintenance of ',
+        'description': 'Installment of ',
+    },
+    'quarterly': {
+        'installment': 'Quarterly Installment of ',
+        'service': "Service Type : Quarterly\nService : %s",
+        'maintenance': 'Recurring Quarterly Maintenance of ',
+        'description': 'Quarterly Installment of ',
+    },
+    'half_year': {
+        'installment': 'Semi-Annual Installment of ',
+        'service': "Service Type: Quarterly\nService: %s",
+        'maintenance': 'Recurring Quarterly Maintenance of ',
+        'description': 'Semi-Annual Installment of ',
+    },
+    'year': {
+        'installment': 'Yearly installment of ',
+        'service': "Service Type : Recurring\nService : %s",
+        'maintenance': 'Recurring Monthly Maintenance of ',
+        'description': 'Installment of ',
+    },
+}
 
 
 class TenancyDetails(models.Model):
     """Property Rent Contract"""
     _name = 'tenancy.details'
     _description = 'Information Related To customer Tenancy while Creating Contract'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'rental.cron.mixin']
     _rec_name = 'tenancy_seq'
 
     # Tenancy Details
@@ -106,11 +147,15 @@ class TenancyDetails(models.Model):
                                   ('Year', "Year")],
                                  compute="_compute_rent_unit")
     start_date = fields.Date(string='Start Date', default=fields.date.today())
-    end_date = fields.Date(string='End Date', compute='_compute_end_date',
-                           search='_search_end_date')
+    end_date = fields.Date(string='End Date', compute='_compute_end_date', store=True,
+                           index=True)
     invoice_start_date = fields.Date(
         string="Invoice Start From", default=fields.date.today())
     last_invoice_payment_date = fields.Date(string='Last Invoice Payment Date')
+    next_invoice_date = fields.Date(string='Next Invoice Date', compute='_compute_next_invoice_date',
+                                    store=True, index=True)
+    next_reminder_date = fields.Date(string='Next Reminder Date',
+                                     compute='_compute_next_invoice_date', store=True, index=True)
     rent_invoice_ids = fields.One2many(
         'rent.invoice', 'tenancy_id', string='Invoices')
     total_area = fields.Float(related="property_id.total_area")
@@ -267,6 +312,7 @@ class TenancyDetails(models.Model):
                 vals['tenancy_seq'] = self.env['ir.sequence'].next_by_code(
                     'tenancy.details') or 'New'
         res = super(TenancyDetails, self).create(vals_list)
+        self.env['rental.dashboard.cache']._invalidate()
         return res
 
     @api.constrains("start_date", "duration_type", "duration_end_date")
@@ -284,6 +330,7 @@ class TenancyDetails(models.Model):
         for rec in self:
             if rec.contract_type == 'new_contract':
                 rec.property_id.stage = 'draft'
+        self.env['rental.dashboard.cache']._invalidate()
         return super(TenancyDetails, self).unlink()
 
     # On delete
@@ -311,12 +358,15 @@ class TenancyDetails(models.Model):
                 raise ValidationError(_(f"For Rent Unit '{rent_unit}', "
                                         f"Payment Term should be one "
                                         f"of {', '.join(valid_payment_terms[rent_unit])}"))
+        if {'contract_type', 'is_extended', 'payment_term', 'duration_type',
+                'company_id'}.intersection(vals):
+            self.env['rental.dashboard.cache']._invalidate()
         return super().write(vals)
 
     # Compute
     # Contract End Date
-    @api.depends('start_date', 'month', 'rent_unit', 'payment_term', 'duration_type',
-                 'duration_end_date')
+    @api.depends('start_date', 'duration_id.month', 'final_rent_unit', 'property_id.rent_unit',
+                 'payment_term', 'duration_type', 'duration_end_date')
     def _compute_end_date(self):
         """Compute end date"""
         for rec in self:
@@ -333,30 +383,22 @@ class TenancyDetails(models.Model):
                 end_date = rec.duration_end_date
             rec.end_date = end_date
 
-    # Search End Date
-    def _search_end_date(self, operator, value):
-        """End Date search for compute method"""
-        contracts = []
-        contracts_ids = self.env['tenancy.details'].search([])
-        for rec in contracts_ids:
-            end_date = rec.end_date
-            if value and end_date:
-                if isinstance(value, str):
-                    end_date = datetime.datetime.strftime(
-                        end_date, DATE_FORMAT)
-                if operator == '=' and end_date == value:
-                    contracts.append(rec.id)
-                elif operator == '>=' and end_date >= value:
-                    contracts.append(rec.id)
-                elif operator == '<=' and end_date <= value:
-                    contracts.append(rec.id)
-                elif operator == '>' and end_date > value:
-                    contracts.append(rec.id)
-                elif operator == '<' and end_date < value:
-                    contracts.append(rec.id)
-                elif operator == '!=' and end_date != value:
-                    contracts.append(rec.id)
-        return [('id', 'in', contracts)]
+    # Next Recurring Invoice Date
+    @api.depends('last_invoice_payment_date', 'payment_term', 'end_date')
+    def _compute_next_invoice_date(self):
+        """Compute next recurring installment date and its reminder date"""
+        reminder_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'rental_management.reminder_days') or 0)
+        for rec in self:
+            next_invoice_date = False
+            months = RECURRING_INVOICE_MONTHS.get(rec.payment_term)
+            if months and rec.last_invoice_payment_date and rec.end_date:
+                next_invoice_date = rec.last_invoice_payment_date + relativedelta(months=months)
+                if next_invoice_date > rec.end_date:
+                    next_invoice_date = False
+            rec.next_invoice_date = next_invoice_date
+            rec.next_reminder_date = (next_invoice_date
+                                      and next_invoice_date - relativedelta(days=reminder_days))
 
     # Broker Commission
     @api.depends('is_any_broker', 'month', 'broker_commission', 'broker_commission_percentage',
@@ -430,9 +472,9 @@ class TenancyDetails(models.Model):
     @api.depends('rent_invoice_ids')
     def _compute_invoice_count(self):
         """Compute invoice count"""
+        counts = self.env['rental.counter']._read_counts(self, 'rent.invoice', 'tenancy_id')
         for rec in self:
-            rec.invoice_count = self.env['rent.invoice'].search_count(
-                [('tenancy_id', 'in', [rec.id])])
+            rec.invoice_count = counts[rec._origin.id]
 
     @api.depends('rent_bill_ids')
     def _compute_total_bill_amount(self):
@@ -451,10 +493,10 @@ class TenancyDetails(models.Model):
 
     def _compute_maintenance_request_count(self):
         """Comoute maintenance request count"""
+        counts = self.env['rental.counter']._read_counts(
+            self, 'maintenance.request', 'rent_contract_id')
         for rec in self:
-            request_count = self.env['maintenance.request'].search_count(
-                [('rent_contract_id', 'in', [rec.id])])
-            rec.maintenance_request_count = request_count
+            rec.maintenance_request_count = counts[rec._origin.id]
 
     # Profit and Loss (P/L)
     @api.depends('rent_invoice_ids', 'rent_bill_ids')
@@ -753,11 +795,12 @@ class TenancyDetails(models.Model):
             })
             self.added_service_ids.write({'invoice_id': invoice_id.id})
 
-    def _process_separate_invoices(self, maintenance=None, utility=None, quarter_qty=None):
-        """Process Utility and Maintenance Separate Invoices"""
+    def _prepare_separate_invoice_vals(self, maintenance=None, utility=None, quarter_qty=None):
+        """Prepare Utility and Maintenance Separate Invoices as (move vals, rent invoice vals)"""
         quarter = quarter_qty if quarter_qty else 3
+        separate_vals = []
         if maintenance:
-            maintenance_invoice_id = self.env['account.move'].create({
+            separate_vals.append(({
                 "partner_id": self.tenancy_id.id,
                 "move_type": "out_invoice",
                 "invoice_date": self.invoice_start_date,
@@ -768,14 +811,12 @@ class TenancyDetails(models.Model):
                     "quantity": quarter if self.payment_term == 'quarterly' else 1,
                     "price_unit": self.total_maintenance,
                 })],
-            })
-            self.env['rent.invoice'].create({
+            }, {
                 "tenancy_id": self.id,
                 "type": "maintenance",
                 "invoice_date": self.invoice_start_date,
-                "amount": maintenance_invoice_id.amount_total,
                 "description": "Maintenance of " + self.property_id.name,
-                "rent_invoice_id": maintenance_invoice_id.id})
+            }))
         if utility:
             service_invoice_lines = []
             for line in self.extra_services_ids:
@@ -787,20 +828,30 @@ class TenancyDetails(models.Model):
                     "price_unit": line.price,
                     "tax_ids": self.tax_ids.ids if self.service_tax else False,
                 }))
-            service_invoice_id = self.env['account.move'].create({
+            separate_vals.append(({
                 "partner_id": self.tenancy_id.id,
                 "move_type": "out_invoice",
                 "invoice_date": self.invoice_start_date,
                 "tenancy_id": self.id,
                 "invoice_line_ids": service_invoice_lines,
-            })
-            self.env['rent.invoice'].create({
+            }, {
                 "tenancy_id": self.id,
                 "type": "other",
                 "invoice_date": self.invoice_start_date,
-                "amount": service_invoice_id.amount_total,
                 "description": "Utility Services",
-                "rent_invoice_id": service_invoice_id.id})
+            }))
+        return separate_vals
+
+    def _process_separate_invoices(self, maintenance=None, utility=None, quarter_qty=None):
+        """Process Utility and Maintenance Separate Invoices"""
+        separate_vals = self._prepare_separate_invoice_vals(
+            maintenance=maintenance, utility=utility, quarter_qty=quarter_qty)
+        if not separate_vals:
+            return
+        invoice_ids = self.env['account.move'].create([vals[0] for vals in separate_vals])
+        self.env['rent.invoice'].create([
+            dict(rent_vals, amount=invoice_id.amount_total, rent_invoice_id=invoice_id.id)
+            for (move_vals, rent_vals), invoice_id in zip(separate_vals, invoice_ids)])
 
     # Rent Invoice Record
     def action_create_rent_invoice_entry(self, amount, invoice_id):
@@ -847,14 +898,15 @@ class TenancyDetails(models.Model):
             mail_template.send_mail(self.id, force_send=True)
 
     # Send Tenancy reminder Mail
-    def action_send_tenancy_reminder(self):
-        """Send tenancy reminder to tenant"""
+    def action_send_tenancy_reminder(self, force_send=True):
+        """Send tenancy reminder to tenants, queued in one batch per company"""
         mail_template = self.env.ref(
             'rental_management.tenancy_reminder_mail_template', raise_if_not_found=False)
         if mail_template:
-            mail_template.send_mail(self.id,
-                                    email_values={'author_id': self.company_id.partner_id.id},
-                                    force_send=True)
+            for company, contracts in self.grouped('company_id').items():
+                mail_template.send_mail_batch(contracts.ids,
+                                              email_values={'author_id': company.partner_id.id},
+                                              force_send=force_send)
 
     # Broker Invoice
     def action_broker_invoice(self):
@@ -903,84 +955,132 @@ class TenancyDetails(models.Model):
                 'rent_amount': customer_invoice_id.amount_total
             })
 
+    # Recurring Invoice Scheduler
+    @api.model
+    def _get_recurring_invoice_domain(self, reminder_date, payment_terms=None):
+        """Domain of running automatic contracts whose next installment is reminded by
+        reminder_date"""
+        terms = payment_terms or list(RECURRING_INVOICE_MONTHS)
+        return [('contract_type', '=', 'running_contract'),
+                ('type', '=', 'automatic'),
+                ('next_reminder_date', '!=', False),
+                ('next_reminder_date', '<=', reminder_date)] + expression.OR([
+            [('payment_term', '=', term), ('final_rent_unit', '=', RECURRING_RENT_UNIT[term])]
+            for term in terms])
+
+    @api.model
+    def _cron_recurring_invoice(self, payment_terms=None):
+        """
+        Scheduler : Recurring invoice for automatic installments of every payment term.
+        Contracts are selected through the indexed next_reminder_date and invoiced in
+        committed chunks, and installments missed while the scheduler did not run are
+        caught up in the following passes.
+        """
+        domain = self._get_recurring_invoice_domain(fields.Date.today(), payment_terms)
+        key = 'tenancy.recurring_invoice.%s' % ','.join(payment_terms or ['all'])
+        while True:
+            done, finished = self._process_cron_chunks(
+                key, 'tenancy.details', domain,
+                lambda contracts: contracts._create_recurring_invoices(),
+                cron_xmlid='rental_management.rent_recurring_invoice_scheduler')
+            if not (done and finished):
+                break
+
+    def _get_recurring_invoice_units(self):
+        """Number of rent units billed by the next installment, shortened on the last period"""
+        months = RECURRING_INVOICE_MONTHS.get(self.payment_term)
+        if self.payment_term not in ['quarterly', 'half_year']:
+            return 1
+        next_next_invoice_date = self.next_invoice_date + relativedelta(months=months)
+        overrun = 0
+        if self.end_date < next_next_invoice_date:
+            overrun = relativedelta(next_next_invoice_date, self.end_date).months
+        return months - overrun
+
+    def _prepare_recurring_invoice_vals(self, units):
+        """Prepare next recurring installment invoice values of the contract"""
+        labels = RECURRING_INVOICE_LABELS[self.payment_term]
+        extra_qty = units if self.payment_term == 'quarterly' else 1
+        invoice_lines = [(0, 0, {
+            'product_id': self.installment_item_id.id,
+            'name': labels['installment'] + str(self.property_id.name),
+            'quantity': 1,
+            'price_unit': self.total_rent * units,
+            'tax_ids': self.tax_ids.ids if self.instalment_tax else False
+        })]
+        if self.is_extra_service and self.extra_service_invoice == 'merge':
+            for line in self.extra_services_ids.filtered(
+                    lambda line: line.service_type == 'monthly'):
+                invoice_lines.append((0, 0, {
+                    'product_id': line.service_id.id,
+                    'name': labels['service'] % line.service_id.name,
+                    'quantity': extra_qty,
+                    'price_unit': line.price * extra_qty,
+                    'tax_ids': self.tax_ids.ids if self.service_tax else False
+                }))
+        if (self.is_maintenance_service
+                and self.maintenance_rent_type == 'recurring'
+                and self.maintenance_service_invoice == 'merge'):
+            invoice_lines.append((0, 0, {
+                'product_id': self.maintenance_item_id.id,
+                'name': labels['maintenance'] + self.property_id.name,
+                'quantity': extra_qty,
+                'price_unit': self.total_maintenance * extra_qty,
+            }))
+        return {
+            'partner_id': self.tenancy_id.id,
+            'move_type': 'out_invoice',
+            'invoice_date': self.next_invoice_date,
+            'invoice_line_ids': invoice_lines,
+            'tenancy_id': self.id
+        }
+
+    def _create_recurring_invoices(self):
+        """
+        Create next recurring installment invoices of the contracts in batch: all
+        invoices are created, posted and recorded as rent invoices in one call each.
+        """
+        invoice_post_type = self.env['ir.config_parameter'].sudo().get_param(
+            'rental_management.invoice_post_type')
+        installment_vals, installment_rent_vals = [], []
+        separate_vals = []
+        for rec in self:
+            units = rec._get_recurring_invoice_units()
+            installment_vals.append(rec._prepare_recurring_invoice_vals(units))
+            installment_rent_vals.append({
+                'tenancy_id': rec.id,
+                'type': 'rent',
+                'invoice_date': rec.next_invoice_date,
+                'description': (RECURRING_INVOICE_LABELS[rec.payment_term]['description']
+                                + rec.property_id.name),
+                'rent_amount': rec.total_rent * units
+            })
+            separate_vals += rec._prepare_separate_invoice_vals(
+                maintenance=(rec.is_maintenance_service
+                             and rec.maintenance_service_invoice == 'separate'),
+                utility=rec.is_extra_service and rec.extra_service_invoice == 'separate',
+                quarter_qty=units)
+        invoice_ids = self.env['account.move'].sudo().create(
+            installment_vals + [vals[0] for vals in separate_vals])
+        installment_invoice_ids = invoice_ids[:len(installment_vals)]
+        if invoice_post_type == 'automatically':
+            installment_invoice_ids.action_post()
+        for rec, invoice_id in zip(self, installment_invoice_ids):
+            rec.last_invoice_payment_date = invoice_id.invoice_date
+        rent_invoice_vals = installment_rent_vals + [vals[1] for vals in separate_vals]
+        self.env['rent.invoice'].create([
+            dict(rent_vals, amount=invoice_id.amount_total, rent_invoice_id=invoice_id.id)
+            for rent_vals, invoice_id in zip(rent_invoice_vals, invoice_ids)])
+        # Queue Reminders
+        self.action_send_tenancy_reminder(force_send=False)
+        return installment_invoice_ids
+
     @api.model
     def tenancy_recurring_invoice(self):
         """
         Scheduler : Tenancy recurring invoice for monthly payment term & automatic installments
         """
-        # today_date = datetime.date(2023, 8, 1)
-        today_date = fields.Date.today()
-        reminder_days = self.env['ir.config_parameter'].sudo(
-        ).get_param('rental_management.reminder_days')
-        invoice_post_type = self.env['ir.config_parameter'].sudo(
-        ).get_param('rental_management.invoice_post_type')
-        tenancy_contracts = self.env['tenancy.details'].sudo().search(
-            [('contract_type', '=', 'running_contract'), ('payment_term', '=', 'monthly'),
-             ('final_rent_unit', '=', 'Month'),
-             ('type', '=', 'automatic')])
-        for rec in tenancy_contracts:
-            if rec.contract_type == 'running_contract' and rec.payment_term == 'monthly':
-                if today_date < rec.end_date:
-                    invoice_date = rec.last_invoice_payment_date + relativedelta(months=1)
-                    next_invoice_date = rec.last_invoice_payment_date + relativedelta(
-                        months=1) - relativedelta(
-                        days=int(reminder_days))
-                    if today_date == next_invoice_date:
-                        record = {
-                            'product_id': rec.installment_item_id.id,
-                            'name': 'Installment of ' + rec.property_id.name,
-                            'quantity': 1,
-                            'price_unit': rec.total_rent,
-                            'tax_ids': rec.tax_ids.ids if rec.instalment_tax else False
-                        }
-                        invoice_lines = [(0, 0, record)]
-                        if rec.is_extra_service and rec.extra_service_invoice == 'merge':
-                            for line in rec.extra_services_ids.filtered(
-                                    lambda line: line.service_type == 'monthly'):
-                                if line.service_type == "monthly":
-                                    invoice_lines.append((0, 0, {
-                                        'product_id': line.service_id.id,
-                                        'name': "Service Type : Recurring" + "\n"
-                                                + f"Service : {line.service_id.name}",
-                                        'quantity': 1,
-                                        'price_unit': line.price,
-                                        'tax_ids': rec.tax_ids.ids if rec.service_tax else False
-                                    }))
-                        if (rec.is_maintenance_service
-                                and rec.maintenance_rent_type == 'recurring'
-                                and rec.maintenance_service_invoice == 'merge'):
-                            invoice_lines.append((0, 0, {
-                                'product_id': rec.maintenance_item_id.id,
-                                'name': 'Recurring Monthly Maintenance of ' + rec.property_id.name,
-                                'quantity': 1,
-                                'price_unit': rec.total_maintenance,
-                            }))
-                        invoice_id = self.env['account.move'].sudo().create({
-                            'partner_id': rec.tenancy_id.id,
-                            'move_type': 'out_invoice',
-                            'invoice_date': invoice_date,
-                            'invoice_line_ids': invoice_lines,
-                            'tenancy_id': rec.id})
-                        if invoice_post_type == 'automatically':
-                            invoice_id.action_post()
-                        rec.last_invoice_payment_date = invoice_id.invoice_date
-                        self.env['rent.invoice'].create({
-                            'tenancy_id': rec.id,
-                            'type': 'rent',
-                            'invoice_date': invoice_date,
-                            'description': 'Installment of ' + rec.property_id.name,
-                            'rent_invoice_id': invoice_id.id,
-                            'amount': invoice_id.amount_total,
-                            'rent_amount': self.total_rent
-                        })
-                        # Process Separate Invoice
-                        if (rec.is_maintenance_service
-                                and rec.maintenance_service_invoice == 'separate'):
-                            rec._process_separate_invoices(maintenance=True)
-                        if rec.is_extra_service and rec.extra_service_invoice == 'separate':
-                            rec._process_separate_invoices(utility=True)
-                        # Send Reminder
-                        rec.action_send_tenancy_reminder()
+        self._cron_recurring_invoice(['monthly'])
 
     # Expire Contract Scheduler
     @api.model
@@ -989,11 +1089,11 @@ class TenancyDetails(models.Model):
         Scheduler : Expire rent contract
         """
         today_date = fields.Date.today()
-        tenancy_contracts = self.env['tenancy.details'].sudo().search(
-            [('contract_type', '=', 'running_contract')])
-        for rec in tenancy_contracts:
-            if rec.contract_type == 'running_contract' and today_date > rec.end_date:
-                rec.contract_type = 'expire_contract'
+        self._process_cron_chunks(
+            'tenancy.expire', 'tenancy.details',
+            [('contract_type', '=', 'running_contract'), ('end_date', '<', today_date)],
+            lambda contracts: contracts.write({'contract_type': 'expire_contract'}),
+            cron_xmlid='rental_management.expiring_invoice')
 
     # Quarterly Recurring Invoice
     @api.model
@@ -1001,91 +1101,7 @@ class TenancyDetails(models.Model):
         """
         Scheduler : Tenancy recurring invoice for quarterly payment term & automatic installments
         """
-        today_date = fields.Date.today()
-        # today_date = datetime.date(2024, 4, 1)
-        reminder_days = self.env['ir.config_parameter'].sudo().get_param(
-            'rental_management.reminder_days')
-        invoice_post_type = self.env['ir.config_parameter'].sudo().get_param(
-            'rental_management.invoice_post_type')
-        tenancy_contracts = self.env['tenancy.details'].sudo().search(
-            [('contract_type', '=', 'running_contract'),
-             ('payment_term', '=', 'quarterly'),
-             ('type', '=', 'automatic'),
-             ('final_rent_unit', '=', 'Month')])
-        for rec in tenancy_contracts:
-            if rec.contract_type == 'running_contract' and rec.payment_term == 'quarterly':
-                if today_date < rec.end_date:
-                    invoice_date = rec.last_invoice_payment_date + relativedelta(months=3)
-                    next_next_invoice_date = invoice_date + relativedelta(months=3)
-                    next_invoice_date = rec.last_invoice_payment_date + relativedelta(
-                        months=3) - relativedelta(
-                        days=int(reminder_days))
-                    if rec.end_date < next_next_invoice_date:
-                        delta = relativedelta(
-                            next_next_invoice_date, rec.end_date)
-                        diff = delta.months
-                    else:
-                        diff = 0
-                    if today_date == next_invoice_date:
-                        record = {
-                            'product_id': rec.installment_item_id.id,
-                            'name': 'Quarterly Installment of ' + rec.property_id.name,
-                            'quantity': 1,
-                            'price_unit': rec.total_rent * (3 - diff),
-                            'tax_ids': rec.tax_ids.ids if rec.instalment_tax else False
-                        }
-                        invoice_lines = [(0, 0, record)]
-                        if rec.is_extra_service and rec.extra_service_invoice == 'merge':
-                            for line in rec.extra_services_ids.filtered(
-                                    lambda line: line.service_type == 'monthly'):
-                                invoice_lines.append((0, 0, {
-                                    'product_id': line.service_id.id,
-                                    'name': "Service Type : Quarterly" + "\n"
-                                            + f"Service : {line.service_id.name}",
-                                    'quantity': (3 - diff),
-                                    'price_unit': line.price * (3 - diff),
-                                    'tax_ids': rec.tax_ids.ids if rec.service_tax else False
-                                }))
-                        if (rec.is_maintenance_service
-                                and rec.maintenance_rent_type == 'recurring'
-                                and rec.maintenance_service_invoice == 'merge'):
-                            invoice_lines.append((0, 0, {
-                                'product_id': rec.maintenance_item_id.id,
-                                'name': 'Recurring Quarterly Maintenance of '
-                                        + rec.property_id.name,
-                                'quantity': (3 - diff),
-                                'price_unit': rec.total_maintenance * (3 - diff),
-                            }))
-                        invoice_id = self.env['account.move'].sudo().create({
-                            'partner_id': rec.tenancy_id.id,
-                            'move_type': 'out_invoice',
-                            'invoice_date': invoice_date,
-                            'invoice_line_ids': invoice_lines
-                        })
-                        invoice_id.tenancy_id = rec.id
-                        if invoice_post_type == 'automatically':
-                            invoice_id.action_post()
-                        rec.last_invoice_payment_date = invoice_id.invoice_date
-                        rent_invoice = {
-                            'tenancy_id': rec.id,
-                            'type': 'rent',
-                            'invoice_date': invoice_date,
-                            'description': 'Quarterly Installment of ' + rec.property_id.name,
-                            'rent_invoice_id': invoice_id.id,
-                            'amount': invoice_id.amount_total,
-                            'rent_amount': self.total_rent * (3 - diff)
-                        }
-                        self.env['rent.invoice'].create(rent_invoice)
-                        # Process Separate Invoice
-                        if (rec.is_maintenance_service
-                                and rec.maintenance_service_invoice == 'separate'):
-                            rec._process_separate_invoices(
-                                maintenance=True, quarter_qty=(3 - diff))
-                        if rec.is_extra_service and rec.extra_service_invoice == 'separate':
-                            rec._process_separate_invoices(
-                                utility=True, quarter_qty=(3 - diff))
-                        # Send Reminder
-                        rec.action_send_tenancy_reminder()
+        self._cron_recurring_invoice(['quarterly'])
 
     # Yearly Recurring Invoice
     @api.model
@@ -1093,79 +1109,7 @@ class TenancyDetails(models.Model):
         """
         Scheduler : Tenancy recurring invoice for yearly payment term & automatic installments
         """
-        today_date = fields.Date.today()
-        # today_date = datetime.date(2024, 7, 1)
-        reminder_days = self.env['ir.config_parameter'].sudo(
-        ).get_param('rental_management.reminder_days')
-        invoice_post_type = self.env['ir.config_parameter'].sudo(
-        ).get_param('rental_management.invoice_post_type')
-        tenancy_contracts = self.env['tenancy.details'].sudo().search(
-            [('contract_type', '=', 'running_contract'), ('type', '=', 'automatic'),
-             ('payment_term', '=', 'year'),
-             ('final_rent_unit', '=', 'Year')])
-        for rec in tenancy_contracts:
-            if today_date < rec.end_date:
-                invoice_date = rec.last_invoice_payment_date + relativedelta(years=1)
-                next_invoice_date = rec.last_invoice_payment_date + relativedelta(
-                    years=1) - relativedelta(
-                    days=int(reminder_days))
-                if today_date == next_invoice_date:
-                    record = {
-                        'product_id': rec.installment_item_id.id,
-                        'name': "Yearly installment of " + str(rec.property_id.name),
-                        'quantity': 1,
-                        'price_unit': rec.total_rent,
-                        'tax_ids': rec.tax_ids.ids if rec.instalment_tax else False
-                    }
-                    invoice_lines = [(0, 0, record)]
-                    if rec.is_extra_service and rec.extra_service_invoice == 'merge':
-                        for line in rec.extra_services_ids.filtered(
-                                lambda line: line.service_type == 'monthly'):
-                            invoice_lines.append((0, 0, {
-                                'product_id': line.service_id.id,
-                                'name': "Service Type : Recurring" + "\n"
-                                        + f"Service : {line.service_id.name}",
-                                'quantity': 1,
-                                'price_unit': line.price,
-                                'tax_ids': rec.tax_ids.ids if rec.service_tax else False
-                            }))
-
-                    if (rec.is_maintenance_service
-                            and rec.maintenance_rent_type == 'recurring'
-                            and rec.maintenance_service_invoice == 'merge'):
-                        invoice_lines.append((0, 0, {
-                            'product_id': rec.maintenance_item_id.id,
-                            'name': 'Recurring Monthly Maintenance of ' + rec.property_id.name,
-                            'quantity': 1,
-                            'price_unit': rec.total_maintenance,
-                        }))
-                    invoice_id = self.env['account.move'].sudo().create({
-                        'partner_id': rec.tenancy_id.id,
-                        'move_type': 'out_invoice',
-                        'invoice_date': invoice_date,
-                        'invoice_line_ids': invoice_lines,
-                        'tenancy_id': rec.id
-                    })
-                    if invoice_post_type == 'automatically':
-                        invoice_id.action_post()
-                    rec.last_invoice_payment_date = invoice_id.invoice_date
-                    rent_invoice = {
-                        'tenancy_id': rec.id,
-                        'type': 'rent',
-                        'invoice_date': invoice_date,
-                        'description': 'Installment of ' + rec.property_id.name,
-                        'rent_invoice_id': invoice_id.id,
-                        'amount': invoice_id.amount_total,
-                        'rent_amount': self.total_rent
-                    }
-                    self.env['rent.invoice'].create(rent_invoice)
-                    # Process Separate Invoice
-                    if rec.is_maintenance_service and rec.maintenance_service_invoice == 'separate':
-                        rec._process_separate_invoices(maintenance=True)
-                    if rec.is_extra_service and rec.extra_service_invoice == 'separate':
-                        rec._process_separate_invoices(utility=True)
-                    # Send Reminder
-                    rec.action_send_tenancy_reminder()
+        self._cron_recurring_invoice(['year'])
 
     # Manual Invoice Rent Invoice Line
     @api.model
@@ -1244,6 +1188,12 @@ class TenancyDetails(models.Model):
         This function returns the values to populate the custom dashboard in
         the Contract List views.
         """
+        return self.env['rental.dashboard.cache']._get_snapshot(
+            'contract_list', self._get_contract_list_dashboard_data)
+
+    @api.model
+    def _get_contract_list_dashboard_data(self):
+        """Compute Contract List views dashboard values"""
         tenancy_obj = self.env['tenancy.details'].sudo()
         stages = ['new_contract', 'running_contract', 'expire_contract']
         payment_terms = ['monthly', 'full_payment', 'quarterly','half_year', 'year', 'daily']
@@ -1265,96 +1215,7 @@ class TenancyDetails(models.Model):
         """
         Scheduler: Auto-generate half-yearly invoices for running tenancy contracts.
         """
-        today = fields.Date.today()
-        reminder_days = int(self.env['ir.config_parameter'].sudo().get_param(
-            'rental_management.reminder_days', default=0))
-        invoice_post_type = self.env['ir.config_parameter'].sudo().get_param(
-            'rental_management.invoice_post_type', default='draft')
-
-        contracts = self.env['tenancy.details'].sudo().search([
-            ('contract_type', '=', 'running_contract'),
-            ('payment_term', '=', 'half_year'),
-            ('type', '=', 'automatic'),
-            ('final_rent_unit', '=', 'Month')
-        ])
-
-        for contract in contracts:
-            if today >= contract.end_date:
-                continue
-
-            last_invoice_date = contract.last_invoice_payment_date
-            invoice_date = last_invoice_date + relativedelta(months=6)
-            next_next_invoice_date = invoice_date + relativedelta(months=6)
-            reminder_date = invoice_date - relativedelta(days=reminder_days)
-
-            if today != reminder_date:
-                continue
-
-            # Calculate number of months if contract ends before next-next invoice
-            overrun = max(0, relativedelta(next_next_invoice_date, contract.end_date).months)
-            effective_months = 6 - overrun
-
-            invoice_lines = [(0, 0, {
-                'product_id': contract.installment_item_id.id,
-                'name': f'Semi-Annual Installment of {contract.property_id.name}',
-                'quantity': 1,
-                'price_unit': contract.total_rent * effective_months,
-                'tax_ids': contract.tax_ids.ids if contract.instalment_tax else False,
-            })]
-
-            if contract.is_extra_service and contract.extra_service_invoice == 'merge':
-                for line in contract.extra_services_ids.filtered(
-                        lambda l: l.service_type == 'monthly'):
-                    invoice_lines.append((0, 0, {
-                        'product_id': line.service_id.id,
-                        'name': f"Service Type: Quarterly\nService: {line.service_id.name}",
-                        'quantity': 1,
-                        'price_unit': line.price,
-                        'tax_ids': contract.tax_ids.ids if contract.service_tax else False,
-                    }))
-
-            if (contract.is_maintenance_service
-                    and contract.maintenance_rent_type == 'recurring'
-                    and contract.maintenance_service_invoice == 'merge'):
-                invoice_lines.append((0, 0, {
-                    'product_id': contract.maintenance_item_id.id,
-                    'name': f'Recurring Quarterly Maintenance of {contract.property_id.name}',
-                    'quantity': 1,
-                    'price_unit': contract.total_maintenance,
-                }))
-
-            invoice = self.env['account.move'].sudo().create({
-                'partner_id': contract.tenancy_id.id,
-                'move_type': 'out_invoice',
-                'invoice_date': invoice_date,
-                'invoice_line_ids': invoice_lines,
-            })
-            invoice.tenancy_id = contract.id
-
-            if invoice_post_type == 'automatically':
-                invoice.action_post()
-
-            # Update contract info and create rent invoice record
-            contract.last_invoice_payment_date = invoice.invoice_date
-            self.env['rent.invoice'].create({
-                'tenancy_id': contract.id,
-                'type': 'rent',
-                'invoice_date': invoice_date,
-                'description': f'Semi-Annual Installment of {contract.property_id.name}',
-                'rent_invoice_id': invoice.id,
-                'amount': invoice.amount_total,
-                'rent_amount': contract.total_rent * effective_months,
-            })
-
-            # Separate Invoices (if needed)
-            if contract.is_maintenance_service and contract.maintenance_service_invoice == 'separate':
-                contract._process_separate_invoices(maintenance=True)
-
-            if contract.is_extra_service and contract.extra_service_invoice == 'separate':
-                contract._process_separate_invoices(utility=True)
-
-            # Send reminder
-            contract.action_send_tenancy_reminder()
+        self._cron_recurring_invoice(['half_year'])
 
 
 # Contract Duration
@@ -263,3 +263,35 @@ class TenancyInvoice(models.Model):
                                        string="Property ")
     maintenance_request_id = fields.Many2one(
         'maintenance.request', string="Maintenance Ref.")
+    rent_invoice_ids = fields.One2many('rent.invoice', 'rent_invoice_id',
+                                       string="Rent Invoices")
+
+    def write(self, vals):
+        """Invalidate dashboard snapshots when a rental invoice payment state is written"""
+        if 'payment_state' in vals and any(move.tenancy_id or move.sold_id for move in self):
+            self.env['rental.dashboard.cache']._invalidate()
+        return super().write(vals)
+
+
+class TenancyPartialReconcile(models.Model):
+    """Tenancy invoice reconciliation"""
+    _inherit = 'account.partial.reconcile'
+
+    def _invalidate_rental_dashboard(self):
+        """Invalidate dashboard snapshots when a rental invoice is reconciled, as its
+        payment state is recomputed from its reconciliations"""
+        moves = self.debit_move_id.move_id | self.credit_move_id.move_id
+        if any(move.tenancy_id or move.sold_id for move in moves):
+            self.env['rental.dashboard.cache']._invalidate()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalidate dashboard snapshots when a rental invoice is paid"""
+        partials = super().create(vals_list)
+        partials._invalidate_rental_dashboard()
+        return partials
+
+    def unlink(self):
+        """Invalidate dashboard snapshots when a rental invoice payment is removed"""
+        self._invalidate_rental_dashboard()
+        return super().unlink()
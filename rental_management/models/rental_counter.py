@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020-Today TechKhedut.
+# Part of TechKhedut. See LICENSE file for full copyright and licensing details.
+from collections import defaultdict
+from odoo import api, models
+
+
+class RentalCounter(models.AbstractModel):
+    """
+    Smart button counters of a whole recordset, with one grouped query per counted
+    model instead of one search count per record
+    """
+    _name = 'rental.counter'
+    _description = 'Rental Smart Button Counter'
+
+    @api.model
+    def _read_counts(self, records, model_name, field_name, domain=None, groupby=None,
+                     aggregate='__count', sudo=False):
+        """
+        Count records of model_name linked to records
+        :param records: records whose smart buttons are computed
+        :param model_name: counted model
+        :param field_name: many2one field of model_name pointing to records
+        :param domain: extra domain of counted records
+        :param groupby: field splitting the counts, e.g. the type of leads
+        :param aggregate: aggregate counted, e.g. 'broker_id:count_distinct'
+        :param sudo: count records the user cannot read as well
+        :return: {record id: count}, with groupby also {(record id, groupby value): count},
+            zero for any other key
+        """
+        counts = defaultdict(int)
+        if not records.ids:
+            return counts
+        model = self.env[model_name].sudo() if sudo else self.env[model_name]
+        for record, *values, count in model._read_group(
+                [(field_name, 'in', records.ids)] + (domain or []),
+                [field_name] + ([groupby] if groupby else []), [aggregate]):
+            counts[record.id] += count
+            if groupby:
+                counts[record.id, values[0]] = count
+        return counts
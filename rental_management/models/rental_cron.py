@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020-Today TechKhedut.
+# Part of TechKhedut. See LICENSE file for full copyright and licensing details.
+import logging
+import threading
+import time
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+
+class RentalCronProgress(models.Model):
+    """Progress cursor of chunked rental schedulers"""
+    _name = 'rental.cron.progress'
+    _description = 'Rental Scheduler Progress'
+    _rec_name = 'key'
+
+    key = fields.Char(string='Scheduler', required=True, index=True)
+    last_id = fields.Integer(string='Last Processed ID')
+    done_count = fields.Integer(string='Processed')
+    failed_count = fields.Integer(string='Failed')
+    date_start = fields.Datetime(string='Run Started On')
+    domain = fields.Char(string='Run Domain',
+                         help="Domain of the run the cursor belongs to, a new domain restarts the run")
+
+    _sql_constraints = [
+        ('key_unique', 'unique(key)', 'A scheduler can only have one progress cursor.'),
+    ]
+
+
+class RentalCronMixin(models.AbstractModel):
+    """Chunked, resumable execution of rental schedulers"""
+    _name = 'rental.cron.mixin'
+    _description = 'Rental Chunked Scheduler'
+
+    @api.model
+    def _get_cron_progress(self, key):
+        """Get or create progress cursor of scheduler"""
+        progress = self.env['rental.cron.progress'].sudo().search([('key', '=', key)], limit=1)
+        if not progress:
+            progress = self.env['rental.cron.progress'].sudo().create({'key': key})
+        return progress
+
+    @api.model
+    def _process_cron_chunks(self, key, model_name, domain, process, cron_xmlid=None):
+        """
+        Run process on the records of model_name matching domain, in chunks ordered by id.
+        Each chunk is committed and its last id saved as cursor, so a run stopped by the
+        time budget resumes where it stopped once the cron is re-triggered, as long as the
+        domain did not change; a domain of another day restarts from the first record, so
+        records only matching the new domain are not skipped. A failing chunk is replayed
+        record by record and only the failing records are skipped.
+        :return: (number of records processed, whether the run reached the end)
+        """
+        param = self.env['ir.config_parameter'].sudo()
+        chunk_size = int(param.get_param('rental_management.cron_chunk_size') or 100)
+        time_budget = int(param.get_param('rental_management.cron_time_budget') or 60)
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        deadline = time.monotonic() + time_budget
+        progress = self._get_cron_progress(key)
+        if not progress.last_id or progress.domain != str(domain):
+            progress.write({'last_id': 0, 'done_count': 0, 'failed_count': 0,
+                            'date_start': fields.Datetime.now(), 'domain': str(domain)})
+        done = 0
+        while True:
+            records = self.env[model_name].sudo().search(
+                domain + [('id', '>', progress.last_id)], order='id', limit=chunk_size)
+            if not records:
+                progress.last_id = 0
+                if auto_commit:
+                    self.env.cr.commit()
+                return done, True
+            failed = 0
+            try:
+                with self.env.cr.savepoint():
+                    process(records)
+            except Exception:
+                _logger.warning("Scheduler %s: chunk %s failed, retrying record by record",
+                                key, records.ids, exc_info=True)
+                for record in records:
+                    try:
+                        with self.env.cr.savepoint():
+                            process(record)
+                    except Exception:
+                        failed += 1
+                        _logger.exception("Scheduler %s: skipping %s", key, record)
+            done += len(records) - failed
+            progress.write({'last_id': records[-1].id,
+                            'done_count': progress.done_count + len(records) - failed,
+                            'failed_count': progress.failed_count + failed})
+            if auto_commit:
+                self.env.cr.commit()
+            if time.monotonic() > deadline:
+                cron = cron_xmlid and self.env.ref(cron_xmlid, raise_if_not_found=False)
+                if cron:
+                    cron._trigger()
+                _logger.info("Scheduler %s: time budget exhausted at id %s, re-triggered",
+                             key, progress.last_id)
+                return done, False
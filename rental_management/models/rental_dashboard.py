@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020-Today TechKhedut.
+# Part of TechKhedut. See LICENSE file for full copyright and licensing details.
+import copy
+import threading
+import time
+from odoo import api, models
+from odoo.tools.lru import LRU
+
+# Snapshots kept per worker, least recently used ones dropped first
+DASHBOARD_SNAPSHOT_LIMIT = 512
+
+# {(dbname, snapshot name, user, company, allowed companies, lang, key):
+#  (generation, expiry, data)}
+_DASHBOARD_SNAPSHOTS = LRU(DASHBOARD_SNAPSHOT_LIMIT)
+
+
+class RentalDashboardCache(models.AbstractModel):
+    """
+    Per user and company snapshot cache of the rental dashboards, as their counts
+    follow the access rights of the user. Snapshots expire after a TTL and are
+    dropped as soon as the database generation counter moves; the counter is a
+    PostgreSQL sequence, so an invalidation is seen by every worker at once.
+    """
+    _name = 'rental.dashboard.cache'
+    _description = 'Rental Dashboard Cache'
+
+    def init(self):
+        """Create generation counter of dashboard snapshots"""
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS rental_dashboard_cache_seq")
+
+    @api.model
+    def _get_generation(self):
+        """Current generation of dashboard snapshots"""
+        self.env.cr.execute("SELECT last_value FROM rental_dashboard_cache_seq")
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _get_snapshot(self, name, compute, key=None):
+        """
+        Get dashboard snapshot of current companies, computing it when missing or stale
+        :param name: snapshot name
+        :param compute: callable returning the dashboard data
+        :param key: extra hashable key, e.g. a list view domain
+        """
+        if getattr(threading.current_thread(), 'testing', False):
+            # Test transactions are rolled back, while the generation counter is not
+            return compute()
+        ttl = int(self.env['ir.config_parameter'].sudo().get_param(
+            'rental_management.dashboard_cache_ttl') or 300)
+        cache_key = (self.env.cr.dbname, name, self.env.uid, self.env.company.id,
+                     tuple(self.env.companies.ids), self.env.lang, key)
+        generation = self._get_generation()
+        snapshot = _DASHBOARD_SNAPSHOTS.get(cache_key)
+        if not snapshot or snapshot[0] != generation or snapshot[1] < time.monotonic():
+            snapshot = (generation, time.monotonic() + ttl, compute())
+            _DASHBOARD_SNAPSHOTS[cache_key] = snapshot
+        return copy.deepcopy(snapshot[2])
+
+    @api.model
+    def _invalidate(self):
+        """
+        Invalidate dashboard snapshots. The counter moves now and again after commit, so
+        a snapshot computed by another worker before this transaction commits is dropped.
+        """
+        cr = self.env.cr
+        cr.execute("SELECT nextval('rental_dashboard_cache_seq')")
+        if cr.postcommit.data.get('rental_dashboard_cache_invalidated'):
+            return
+        cr.postcommit.data['rental_dashboard_cache_invalidated'] = True
+        registry = self.env.registry
+
+        def invalidate_after_commit():
+            with registry.cursor() as new_cr:
+                new_cr.execute("SELECT nextval('rental_dashboard_cache_seq')")
+        cr.postcommit.add(invalidate_after_commit)
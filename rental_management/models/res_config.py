@@ -47,3 +47,14 @@ class RentalConfig(models.TransientModel):
                                               'rental_management.property_product_4',
                                               raise_if_not_found=False),
                                           config_parameter='rental_management.account_maintenance_item_id')
+
+    def set_values(self):
+        """Refresh contract reminder dates when reminder days change"""
+        reminder_days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'rental_management.reminder_days') or 0)
+        res = super().set_values()
+        if self.reminder_days != reminder_days:
+            contracts = self.env['tenancy.details'].sudo().search(
+                [('next_invoice_date', '!=', False)])
+            self.env.add_to_compute(contracts._fields['next_reminder_date'], contracts)
+        return res
@@ -53,9 +53,9 @@ class UserTypes(models.Model):
     @api.depends('properties_ids')
     def _compute_properties_count(self):
         """Compute property count"""
+        counts = self.env['rental.counter']._read_counts(self, 'property.details', 'landlord_id')
         for rec in self:
-            count = self.env['property.details'].search_count([('landlord_id', 'in', [rec.id])])
-            rec.properties_count = count
+            rec.properties_count = counts[rec._origin.id]
 
     def action_properties(self):
         """View house owner properties"""
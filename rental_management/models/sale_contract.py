@@ -12,7 +12,7 @@ class PropertyVendor(models.Model):
     _name = 'property.vendor'
     _description = 'Stored Data About Sold Property'
     _rec_name = 'sold_seq'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'rental.cron.mixin']
 
     # Sale Contract Details
     sold_seq = fields.Char(string='Sequence', required=True,
@@ -160,9 +160,10 @@ class PropertyVendor(models.Model):
     schedule_count = fields.Integer(compute='_compute_schedule_count')
 
     def _compute_schedule_count(self):
-        Schedule = self.env['property.payment.schedule']
+        counts = self.env['rental.counter']._read_counts(
+            self, 'property.payment.schedule', 'vendor_id')
         for rec in self:
-            rec.schedule_count = Schedule.search_count([('vendor_id', '=', rec.id)])
+            rec.schedule_count = counts[rec._origin.id]
 
     def action_view_schedule(self):
         self.ensure_one()
@@ -189,8 +190,20 @@ class PropertyVendor(models.Model):
                 vals['sold_seq'] = self.env['ir.sequence'].next_by_code(
                     'property.vendor') or _('New')
         res = super(PropertyVendor, self).create(vals_list)
+        self.env['rental.dashboard.cache']._invalidate()
         return res
 
+    def write(self, vals):
+        """Invalidate dashboard snapshots when a dashboard counter changes"""
+        if {'stage', 'type', 'sale_price', 'company_id', 'broker_id'}.intersection(vals):
+            self.env['rental.dashboard.cache']._invalidate()
+        return super().write(vals)
+
+    def unlink(self):
+        """Invalidate dashboard snapshots"""
+        self.env['rental.dashboard.cache']._invalidate()
+        return super().unlink()
+
     # Default Get
     @api.model
     def default_get(self, fields_list):
@@ -211,33 +224,12 @@ class PropertyVendor(models.Model):
         ).get_param('rental_management.sale_reminder_days')
         today_date = fields.Date.today()
         # today_date = datetime.date(2023, 7, 29)
-        sale_invoice = self.env['sale.invoice'].sudo().search(
-            [('invoice_created', '=', False)])
-        for data in sale_invoice:
-            reminder_date = data.invoice_date - relativedelta(days=int(reminder_days))
-            invoice_post_type = self.env['ir.config_parameter'].sudo(
-            ).get_param('rental_management.invoice_post_type')
-            if today_date == reminder_date:
-                record = {
-                    'product_id': data.property_sold_id.installment_item_id.id,
-                    'name': data.name + "\n" + (data.desc if data.desc else ""),
-                    'quantity': 1,
-                    'price_unit': data.amount,
-                    'tax_ids': data.tax_ids.ids if data.tax_ids else False,
-                }
-                invoice_lines = [(0, 0, record)]
-                sold_data = {
-                    'partner_id': data.property_sold_id.customer_id.id,
-                    'move_type': 'out_invoice',
-                    'sold_id': data.property_sold_id.id,
-                    'invoice_date': data.invoice_date,
-                    'invoice_line_ids': invoice_lines
-                }
-                invoice_id = self.env['account.move'].sudo().create(sold_data)
-                if invoice_post_type == 'automatically':
-                    invoice_id.action_post()
-                data.invoice_id = invoice_id.id
-                data.invoice_created = True
+        self._process_cron_chunks(
+            'property.vendor.sale_recurring_invoice', 'sale.invoice',
+            [('invoice_created', '=', False),
+             ('invoice_date', '=', today_date + relativedelta(days=int(reminder_days or 0)))],
+            lambda sale_invoices: sale_invoices._create_scheduled_invoices(),
+            cron_xmlid='rental_management.sale_recurring_invoice')
 
     # Compute
     # Total amount paid amount, remaining amount
@@ -291,10 +283,10 @@ class PropertyVendor(models.Model):
     # Count
     def _compute_maintenance_request_count(self):
         """Compute maintenance request count"""
+        counts = self.env['rental.counter']._read_counts(
+            self, 'maintenance.request', 'sell_contract_id')
         for rec in self:
-            request_count = self.env['maintenance.request'].search_count(
-                [('sell_contract_id', 'in', [rec.id])])
-            rec.maintenance_request_count = request_count
+            rec.maintenance_request_count = counts[rec._origin.id]
 
     # Sell Price Calculation
     @api.depends('sale_price',
@@ -490,6 +482,12 @@ class PropertyVendor(models.Model):
         """ This function returns the values to populate the custom dashboard in
                    the Contract List views.
                """
+        return self.env['rental.dashboard.cache']._get_snapshot(
+            'sale_contract_list', self._get_sale_contract_list_dashboard_data)
+
+    @api.model
+    def _get_sale_contract_list_dashboard_data(self):
+        """Compute Sale Contract List views dashboard values"""
         sale_contract_obj = self.env['property.vendor'].sudo()
         stages = ['booked', 'refund', 'sold']
         types = ['land', 'residential', 'commercial', 'industrial']
@@ -581,6 +579,29 @@ class SaleInvoice(models.Model):
         self.invoice_created = True
         self.action_send_sale_invoice(invoice_id.id)
 
+    def _create_scheduled_invoices(self):
+        """Create installment invoices of scheduled sale installments in batch"""
+        invoice_post_type = self.env['ir.config_parameter'].sudo(
+        ).get_param('rental_management.invoice_post_type')
+        invoice_ids = self.env['account.move'].sudo().create([{
+            'partner_id': data.property_sold_id.customer_id.id,
+            'move_type': 'out_invoice',
+            'sold_id': data.property_sold_id.id,
+            'invoice_date': data.invoice_date,
+            'invoice_line_ids': [(0, 0, {
+                'product_id': data.property_sold_id.installment_item_id.id,
+                'name': data.name + "\n" + (data.desc if data.desc else ""),
+                'quantity': 1,
+                'price_unit': data.amount,
+                'tax_ids': data.tax_ids.ids if data.tax_ids else False,
+            })]
+        } for data in self])
+        if invoice_post_type == 'automatically':
+            invoice_ids.action_post()
+        for data, invoice_id in zip(self, invoice_ids):
+            data.invoice_id = invoice_id.id
+        self.invoice_created = True
+
     def action_send_sale_invoice(self, invoice_id):
         """Send notification on sale invoice"""
         mail_template = self.env.ref(
@@ -2,7 +2,7 @@
 
 import { session } from '@web/session';
 import { useService } from "@web/core/utils/hooks";
-import { Component, useState, onWillStart} from "@odoo/owl";
+import { Component, useState, onWillStart, onWillUpdateProps} from "@odoo/owl";
 
 export class RentalPropertyDashboard extends Component {
     setup() {
@@ -12,11 +12,19 @@ export class RentalPropertyDashboard extends Component {
             'property_data': {}
         })
         onWillStart(async ()=>{
-            const data = await this.orm.call('property.details', 'retrieve_list_dashboard_data', []);
-            this.state.property_data = data
+            await this.loadDashboardData(this.props.domain)
+        })
+        onWillUpdateProps(async (nextProps)=>{
+            if (JSON.stringify(nextProps.domain) !== JSON.stringify(this.props.domain)) {
+                await this.loadDashboardData(nextProps.domain)
+            }
         })
 
 
+    }
+    async loadDashboardData(domain){
+        const data = await this.orm.call('property.details', 'retrieve_list_dashboard_data', [domain || []]);
+        this.state.property_data = data
     }
     viewAllProperties(status){
         let domain, context;
@@ -78,3 +86,4 @@ export class RentalPropertyDashboard extends Component {
 }
 
 RentalPropertyDashboard.template = 'rental_management.RentalPropertyDashboard';
+RentalPropertyDashboard.props = { domain: { type: Array, optional: true } };
@@ -466,6 +466,28 @@ export class RentalDashboard extends Component {
             // Get the data for this point
             const data = dataItem.dataContext;
 
+            // Server side cluster
+            if (data.count > 1) {
+                const container = am5.Container.new(root, {
+                    tooltipText: "{title}"
+                });
+                container.children.push(am5.Circle.new(root, {
+                    radius: 10,
+                    fill: am5.color(0xff8c00)
+                }));
+                container.children.push(am5.Label.new(root, {
+                    centerX: am5.p50,
+                    centerY: am5.p50,
+                    fill: am5.color(0xffffff),
+                    populateText: true,
+                    fontSize: "8",
+                    text: "{count}"
+                }));
+                return am5.Bullet.new(root, {
+                    sprite: container
+                });
+            }
+
             // Determine color based on status
             let fillColor;
 
@@ -501,18 +523,32 @@ export class RentalDashboard extends Component {
             });
         });
 
-        for (let i = 0; i < sessionData.length; i++) {
-            const city = sessionData[i];
-            addCity(city.longitude, city.latitude, city.title, city.status);
-        }
-
-        function addCity(longitude, latitude, title, status) {
-            pointSeries.data.push({
-                geometry: {type: "Point", coordinates: [longitude, latitude]},
-                title: title,
-                status: status
-            });
+        function setCities(cities) {
+            pointSeries.data.setAll(cities.map((city) => ({
+                geometry: {type: "Point", coordinates: [city.longitude, city.latitude]},
+                title: city.title,
+                status: city.status,
+                count: city.count
+            })));
         }
+        setCities(sessionData);
+
+        // Reload server side clusters of the viewport when the map moves
+        let reloadTimeout;
+        chart.events.on("geoboundschanged", () => {
+            clearTimeout(reloadTimeout);
+            reloadTimeout = setTimeout(async () => {
+                const bounds = chart.geoBounds();
+                if (!bounds) {
+                    return;
+                }
+                const cities = await this.orm.call('property.details', 'get_property_map_data', [
+                    [bounds.left, bounds.bottom, bounds.right, bounds.top],
+                    chart.get("zoomLevel") || 1,
+                ]);
+                setCities(cities);
+            }, 300);
+        });
 
         chart.appear(1000, 100);
     }
@@ -1,4 +1,8 @@
+import base64
+import io
+
 import psycopg2
+from PIL import Image
 from odoo.exceptions import ValidationError, AccessError
 from .common import CreateRentalData
 from odoo.tests.common import tagged
@@ -299,3 +303,74 @@ class TestProject(CreateRentalData):
 
         with self.assertRaises(ValidationError):
             self.test_property_one.unlink()
+
+    def test_unit_generation(self):
+        """Test units share stored project images and large generations run in background"""
+        # Image larger than its 1024 rendition, so it can be zoomed
+        stream = io.BytesIO()
+        Image.new("RGB", (2048, 1536), "white").save(stream, "PNG")
+        image = base64.b64encode(stream.getvalue())
+        self.test_property_three.write({
+            "avail_image": True,
+            "project_image_ids": [(0, 0, {"title": "Front", "image": image})],
+        })
+        create_unit_wizard = self._create_units_wizard(
+            2, 2, 1, active_id=self.test_property_three.id, unit_from="project")
+        action = create_unit_wizard.action_create_property_unit()
+        units = self.env["property.details"].search(action["domain"])
+        self.assertEqual(len(units), 4)
+        self.assertEqual(units.property_images_ids.mapped("title"), ["Front"] * 4)
+        project_image = self.test_property_three.project_image_ids
+        self.assertTrue(project_image.can_image_1024_be_zoomed)
+        for unit_image in units.property_images_ids:
+            self.assertEqual(unit_image.image, project_image.image)
+            # Stored flag computed from the shared image, not from an empty image
+            self.assertTrue(unit_image.can_image_1024_be_zoomed)
+        store = self.test_property_three.project_image_ids.image_store_id
+        self.assertEqual(len(store), 1)
+        self.assertEqual(units.property_images_ids.image_store_id, store)
+        self.assertEqual(store.ref_count, 5)
+
+        self.env["ir.config_parameter"].sudo().set_param(
+            "rental_management.unit_generation_async_threshold", 3)
+        self.env["ir.config_parameter"].sudo().set_param(
+            "rental_management.unit_generation_chunk_size", 3)
+        create_unit_wizard = self._create_units_wizard(
+            2, 2, 1, active_id=self.test_property_four.id, unit_from="project")
+        action = create_unit_wizard.action_create_property_unit()
+        self.assertEqual(action["res_model"], "property.unit.generation")
+        generation = self.env["property.unit.generation"].browse(action["res_id"])
+        self.assertEqual(generation.state, "pending")
+        self.env["property.unit.generation"]._cron_generate_units()
+        self.assertEqual(generation.state, "done")
+        self.assertEqual(generation.progress, 100)
+        self.assertEqual(self.env["property.details"].search_count(
+            [("property_project_id", "=", self.test_property_four.id)]), 4)
+
+    def test_image_store(self):
+        """Test identical gallery images are stored once"""
+        image = ("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA"
+                 "60e6kgAAAABJRU5ErkJggg==")
+        self.test_property_one.write({
+            "project_image_ids": [(0, 0, {"title": "One", "image": image}),
+                                  (0, 0, {"title": "Two", "image": image})],
+        })
+        lines = self.test_property_one.project_image_ids
+        self.assertEqual(len(lines.image_store_id), 1)
+        self.assertEqual(lines[0].image, lines[1].image)
+        self.assertEqual(len(self.env["ir.attachment"].search([
+            ("res_model", "=", "project.images.line"), ("res_field", "=", "image"),
+            ("res_id", "in", lines.ids)])), 0)
+
+        store = lines.image_store_id
+        self.assertTrue(store.image_128)
+        self.assertTrue(store.image_512)
+        self.assertEqual(lines[0].gallery_image_512, store.image_512)
+        self.assertEqual(store._get_image_url(128), "/property/image/%s/128" % store.checksum)
+        self.assertEqual(lines[0].gallery_image_url, "/property/image/%s/512" % store.checksum)
+        lines[1].image = False
+        self.assertFalse(lines[1].image_store_id)
+        self.assertEqual(store.ref_count, 1)
+        lines.unlink()
+        store.invalidate_recordset(["ref_count"])
+        self.assertEqual(store.ref_count, 0)
@@ -677,3 +677,43 @@ class TestProperty(CreateRentalData):
 
         self.assertEqual(data["total_property"],
                          property.search_count(company_domain))
+
+    def test_list_dashboard_totals(self):
+        properties = (self.property_one | self.property_two | self.property_three
+                      | self.property_four)
+        domain = [("id", "in", properties.ids)]
+        self.property_one.stage = "pre_sale"
+        self.property_two.stage = "administration"
+        self.property_three.stage = "available"
+        self.property_four.stage = "draft"
+
+        data = self.env["property.details"].retrieve_list_dashboard_data(domain)
+        self.assertEqual(data["total_prop_count"], 3)
+        self.assertEqual(data["available_prop_count"], 1)
+        self.assertEqual(data["draft_prop_count"], 1)
+        self.assertEqual(sum(data[f"total_{prop_type}_prop_count"] for prop_type in
+                             ["land", "residential", "commercial", "industrial"]), 3)
+
+    def test_property_map_data(self):
+        self.property_one.write({"latitude": "10.01", "longitude": "20.01"})
+        self.property_two.write({"latitude": "10.02", "longitude": "20.02"})
+        self.property_three.write({"latitude": "10.03", "longitude": "20.03"})
+        self.property_four.write({"latitude": "-10.5", "longitude": "20.5"})
+        self.assertEqual(self.property_one.map_latitude, 10.01)
+        self.assertEqual(self.property_one.map_longitude, 20.01)
+
+        bbox = [20, 10, 20.1, 10.1]
+        property = self.env["property.details"]
+        data = property.get_property_map_data(bbox=bbox)
+        self.assertEqual(len(data), 3)
+        self.assertEqual({marker["count"] for marker in data}, {1})
+        self.assertIn("Property One", [marker["title"] for marker in data])
+
+        data = property.get_property_map_data(bbox=bbox, zoom=1)
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["count"], 3)
+        self.assertFalse(data[0]["status"])
+        self.assertAlmostEqual(data[0]["latitude"], 10.02)
+
+        data = property.get_property_map_data(bbox=bbox, zoom=16)
+        self.assertEqual(len(data), 3)
@@ -83,3 +83,29 @@ class TestPropertyRegion(CreateRentalData):
         self.assertEqual({'create': False}, action.get("context", []))
         self.assertEqual(action["res_model"], "property.details")
         self.assertEqual(action["target"], "current")
+
+    def test_region_counts_batch(self):
+        region_one = self._create_region(
+            name="R1", city_ids=[(6, 0, [self._create_cities(name="C1").id])])
+        region_two = self._create_region(
+            name="R2", city_ids=[(6, 0, [self._create_cities(name="C2").id])])
+        region_three = self._create_region(
+            name="R3", city_ids=[(6, 0, [self._create_cities(name="C3").id])])
+        self.env["property.details"].create([{
+            "name": "Unit %s" % index, "property_seq": "RU%s" % index,
+            "region_id": region.id,
+        } for index, region in enumerate([region_one, region_one, region_two])])
+
+        regions = region_one | region_two | region_three
+        regions._compute_count()
+        self.assertEqual(region_one.unit_count, 2)
+        self.assertEqual(region_two.unit_count, 1)
+        self.assertEqual(region_three.unit_count, 0)
+        self.assertEqual(region_one.project_count, 0)
+
+        counts = self.env["rental.counter"]._read_counts(
+            regions, "property.details", "region_id", groupby="sale_lease")
+        self.assertEqual(counts[region_one.id], 2)
+        self.assertEqual(counts[region_one.id, "for_tenancy"], 2)
+        self.assertEqual(counts[region_one.id, "for_sale"], 0)
+        self.assertEqual(counts[region_three.id], 0)
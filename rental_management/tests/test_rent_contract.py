@@ -213,12 +213,15 @@ class TestRentContract(CreateRentalData):
         self.assertEqual(self.contract_two.end_date, datetime.datetime.strptime(
             "2026-03-01", "%Y-%m-%d").date())
 
-        #  _search_end_date ----------------------------------------------------
+        #  end_date search ------------------------------------------------------
 
-        domain = self.contract_one._search_end_date(
-            "=", datetime.datetime.strptime("2026-03-01", "%Y-%m-%d").date())
-        value = self.env["tenancy.details"].search(domain)
+        value = self.env["tenancy.details"].search([
+            ("end_date", "=", datetime.datetime.strptime("2026-03-01", "%Y-%m-%d").date()),
+            ("id", "in", [self.contract_one.id, self.contract_two.id])])
         self.assertEqual(value.id, self.contract_two.id)
+        value = self.env["tenancy.details"].search([
+            ("end_date", "<", "2026-03-01"), ("id", "=", self.contract_one.id)])
+        self.assertEqual(value.id, self.contract_one.id)
 
         # _compute_broker_commission -------------------------------------------
 
@@ -538,6 +541,65 @@ class TestRentContract(CreateRentalData):
         self.contract_six.tenancy_expire()
         self.assertEqual(self.contract_six.contract_type, "expire_contract")
 
+    def test_scheduler_catch_up(self):
+        active_contract_wizard = self._create_active_contract(
+            active_id=self.contract_four.id, type="automatic", contract_id=self.contract_four.id,
+            rent_unit=self.contract_four.rent_unit)
+        active_contract_wizard.action_create_contract()
+        self.assertEqual(len(self.contract_four.rent_invoice_ids), 1)
+        self.env['ir.config_parameter'].set_param(
+            'rental_management.reminder_days', '0')
+        today = datetime.datetime.today().date()
+        self.contract_four.last_invoice_payment_date = today - relativedelta(months=2)
+        self.assertEqual(self.contract_four.next_invoice_date, today - relativedelta(months=1))
+        self.assertEqual(self.contract_four.next_reminder_date, today - relativedelta(months=1))
+        self.assertIn(self.contract_four, self.env["tenancy.details"].search(
+            self.env["tenancy.details"]._get_recurring_invoice_domain(today)))
+        self.env["tenancy.details"]._cron_recurring_invoice()
+        self.assertEqual(len(self.contract_four.rent_invoice_ids), 3)
+        self.assertEqual(self.contract_four.last_invoice_payment_date, today)
+        self.assertEqual(self.contract_four.next_invoice_date, today + relativedelta(months=1))
+
+        self.contract_four.last_invoice_payment_date = self.contract_four.end_date
+        self.assertFalse(self.contract_four.next_invoice_date)
+
+    def test_scheduler_chunks(self):
+        self.env['ir.config_parameter'].set_param('rental_management.cron_chunk_size', '1')
+        contracts = self.contract_four | self.contract_five
+        contracts.write({"contract_type": "running_contract"})
+        contracts.write({"end_date": datetime.date(2025, 1, 1)})
+        self.env["tenancy.details"].tenancy_expire()
+        self.assertEqual(set(contracts.mapped("contract_type")), {"expire_contract"})
+        progress = self.env["rental.cron.progress"].search([("key", "=", "tenancy.expire")])
+        self.assertEqual(progress.last_id, 0)
+        self.assertEqual(progress.done_count, 2)
+
+        # A failing record is skipped without blocking the rest of its chunk
+        self.env['ir.config_parameter'].set_param('rental_management.cron_chunk_size', '10')
+        contracts = self.contract_one | self.contract_two | self.contract_three
+
+        def process(records):
+            if self.contract_two in records:
+                raise ValidationError("Broken contract")
+            records.write({"terminate_date": datetime.date(2025, 1, 1)})
+
+        done, finished = self.env["tenancy.details"]._process_cron_chunks(
+            "test.chunks", "tenancy.details", [("id", "in", contracts.ids)], process)
+        self.assertTrue(finished)
+        self.assertEqual(done, 2)
+        self.assertEqual(self.contract_one.terminate_date, datetime.date(2025, 1, 1))
+        self.assertFalse(self.contract_two.terminate_date)
+        self.assertEqual(self.contract_three.terminate_date, datetime.date(2025, 1, 1))
+
+        # A run stopped on the domain of another day restarts from the first record
+        progress = self.env["rental.cron.progress"].search([("key", "=", "test.chunks")])
+        progress.write({"last_id": self.contract_three.id,
+                        "domain": str([("id", "in", self.contract_one.ids)])})
+        done, finished = self.env["tenancy.details"]._process_cron_chunks(
+            "test.chunks", "tenancy.details", [("id", "in", contracts.ids)], process)
+        self.assertTrue(finished)
+        self.assertEqual(done, 2)
+
     def test_scheduler_manual(self):
         active_contract_wizard = self._create_active_contract(
             active_id=self.contract_four.id, type="manual", contract_id=self.contract_four.id,
@@ -116,6 +116,39 @@ class TestSubProject(CreateRentalData):
         self.assertEqual(self.test_sub_project_one.rent_count, 5)
         self.assertEqual(self.test_sub_project_two.rent_count, 0)
 
+    def test_compute_statics_batch(self):
+        self.test_sub_project_one.sale_lease = "rent"
+        self.test_sub_project_two.sale_lease = "sale"
+        units = self.env["property.details"].create([{
+            "name": "Unit %s" % index, "property_seq": "SPU%s" % index,
+            "subproject_id": subproject.id,
+            "property_project_id": subproject.property_project_id.id,
+            "sale_lease": sale_lease, "total_area": 100.0, "price": 50.0,
+            "is_maintenance_service": True, "total_maintenance": 10.0,
+        } for index, (subproject, sale_lease) in enumerate([
+            (self.test_sub_project_one, "for_tenancy"),
+            (self.test_sub_project_one, "for_tenancy"),
+            (self.test_sub_project_one, "for_sale"),
+            (self.test_sub_project_two, "for_sale"),
+        ])])
+        units[0].action_in_available()
+        units[3].action_in_available()
+
+        subprojects = self.test_sub_project_one | self.test_sub_project_two
+        subprojects.compute_properties_statics()
+        subprojects.compute_count()
+
+        self.assertEqual(self.test_sub_project_one.total_area, 200.0)
+        self.assertEqual(self.test_sub_project_one.available_area, 100.0)
+        self.assertEqual(self.test_sub_project_one.total_values, 100.0)
+        self.assertEqual(self.test_sub_project_one.total_maintenance, 20.0)
+        self.assertEqual(self.test_sub_project_one.unit_count, 3)
+        self.assertEqual(self.test_sub_project_two.total_area, 100.0)
+        self.assertEqual(self.test_sub_project_two.available_area, 100.0)
+        self.assertEqual(self.test_sub_project_two.total_values, 50.0)
+        self.assertEqual(self.test_sub_project_two.total_collection, 0)
+        self.assertEqual(self.test_sub_project_two.available_unit_count, 1)
+
     def test_onchange_methods(self):
 
         self.test_property_one.street = "Street One"
@@ -55,7 +55,7 @@ class SubprojectCreation(models.TransientModel):
                 images.append((0, 0, {
                     'title': image.title,
                     'sequence': image.sequence,
-                    'image': image.image,
+                    'image_store_id': image.image_store_id.id,
                     'video_url': image.video_url,
                 }))
             data['subproject_image_ids'] = images
@@ -65,7 +65,6 @@ class SubprojectCreation(models.TransientModel):
                 nearby.append((0, 0, {
                     'connectivity_id': n.connectivity_id.id,
                     'name': n.name,
-                    'image': n.image,
                     'distance': n.distance
                 }))
             data['subproject_connectivity_ids'] = nearby
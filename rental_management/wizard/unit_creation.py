@@ -2,7 +2,7 @@
 # Copyright 2023-Today TechKhedut.
 # Part of TechKhedut. See LICENSE file for full copyright and licensing details.
 
-
+import json
 from odoo import api, fields, models, _
 
 
@@ -52,7 +52,6 @@ class UnitCreation(models.TransientModel):
 
     def action_create_property_unit(self):
         """Create property unit from project or subproject"""
-        created_ids = []
         active_id = self._context.get("active_id", False)
         unit_from = self._context.get('unit_from')
         property_rec = {}
@@ -145,23 +144,41 @@ class UnitCreation(models.TransientModel):
             unit_connectivity=unit_connectivity
         )
         property_rec.update(availability_info)
-        # Property Data
-        for data in property_data:
-            property_rec['name'] = data.get('name')
-            property_rec['property_seq'] = data.get('property_seq')
-            property_rec['floor'] = data.get('floor')
-            property_id = self.env['property.details'].sudo().create(
-                property_rec)
-            created_ids.append(property_id.id)
         project_id.write({
             'total_floors': self.total_floors,
             'units_per_floor': self.units_per_floor,
             'floor_created': project_id.floor_created + self.total_floors
         })
+        # Property Data
+        generation_obj = self.env['property.unit.generation']
+        images = unit_images if project_id.avail_image and unit_images else False
+        async_threshold = int(self.env['ir.config_parameter'].sudo().get_param(
+            'rental_management.unit_generation_async_threshold') or 500)
+        if len(property_data) > async_threshold:
+            generation = generation_obj.sudo().create({
+                'name': _("Units of %s", project_id.name),
+                'property_project_id': property_rec['property_project_id'],
+                'subproject_id': property_rec.get('subproject_id'),
+                'common_vals': json.dumps(property_rec),
+                'unit_vals': json.dumps(property_data),
+                'image_model': images and images._name,
+                'image_ids': json.dumps(images.ids if images else []),
+                'total_count': len(property_data),
+            })
+            self.env.ref('rental_management.property_unit_generation_cron')._trigger()
+            return {
+                "name": _("Unit Generation"),
+                "type": "ir.actions.act_window",
+                "res_id": generation.id,
+                "view_mode": "form",
+                "res_model": "property.unit.generation",
+                "target": "current",
+            }
+        properties = generation_obj._create_units(property_rec, property_data, images or [])
         return {
             "name": "Properties",
             "type": "ir.actions.act_window",
-            "domain": [("id", "in", created_ids)],
+            "domain": [("id", "in", properties.ids)],
             "view_mode": "list,form",
             'context': {'create': False},
             "res_model": "property.details",
@@ -190,7 +207,6 @@ class UnitCreation(models.TransientModel):
                                        unit_images, unit_connectivity):
         """Get property availability from project"""
         info_rec = {}
-        images = []
         nearby = []
         # Amenities
         if project_id.avail_amenity:
@@ -200,17 +216,9 @@ class UnitCreation(models.TransientModel):
         if project_id.avail_specification:
             info_rec['is_facilities'] = project_id.avail_specification
             info_rec['property_specification_ids'] = unit_specification
-        # Images
+        # Images, shared with the units by the unit generation
         if project_id.avail_image:
             info_rec['is_images'] = project_id.avail_image
-            for image in unit_images:
-                images.append((0, 0, {
-                    'title': image.title,
-                    'sequence': image.sequence,
-                    'image': image.image,
-                    'video_url': image.video_url,
-                }))
-            info_rec['property_images_ids'] = images
         # Connectivity
         if project_id.avail_nearby_connectivity:
             info_rec['nearby_connectivity'] = project_id.avail_nearby_connectivity
@@ -218,7 +226,6 @@ class UnitCreation(models.TransientModel):
                 nearby.append((0, 0, {
                     'connectivity_id': n.connectivity_id.id,
                     'name': n.name,
-                    'image': n.image,
                     'distance': n.distance
                 }))
             info_rec['connectivity_ids'] = nearby